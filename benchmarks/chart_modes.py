@@ -0,0 +1,76 @@
+"""Server CPU time and payload size per chart, PNG versus Vega-Lite mode
+
+PNG mode builds the matplotlib figure and rasterises it on the server;
+Vega-Lite mode builds a spec and serialises it to JSON, which is all the
+server does before the browser draws it. Times are process CPU time, so
+they are what a busy server pays per uncached chart.
+
+    python benchmarks/chart_modes.py --subjects 10 --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import synthetic_store
+from reportcard import generate_performance_analysis
+from reportcard.charts import potential_chart, radar_chart, render, subject_bar_chart
+from reportcard.vega import potential_spec, radar_spec, subject_bar_spec
+
+PASSING = 40
+
+
+def charts(student, analysis):
+    """``(chart, png_bytes, spec_json)`` callables for each Tab 1 chart"""
+    return [
+        ("subjects", lambda: render(subject_bar_chart(student, analysis, PASSING)),
+         lambda: json.dumps(subject_bar_spec(student, analysis, PASSING))),
+        ("radar", lambda: render(radar_chart(student, analysis)),
+         lambda: json.dumps(radar_spec(student, analysis))),
+        ("potential", lambda: render(potential_chart(student, analysis)),
+         lambda: json.dumps(potential_spec(student, analysis))),
+    ]
+
+
+def measure(produce, runs):
+    """``(median CPU seconds, payload bytes)`` of ``produce``"""
+    payload = produce()
+    times = []
+    for _ in range(runs):
+        started = time.process_time()
+        produce()
+        times.append(time.process_time() - started)
+    return statistics.median(times), len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    student = synthetic_store(1, args.subjects).get(0)
+    analysis = generate_performance_analysis(student)
+
+    print(f"{'chart':<12}{'mode':<10}{'cpu ms':>10}{'bytes':>12}")
+    totals = {"png": [0.0, 0], "vega": [0.0, 0]}
+    for chart, png, spec in charts(student, analysis):
+        for mode, produce in (("png", png), ("vega", spec)):
+            seconds, size = measure(produce, args.runs)
+            totals[mode][0] += seconds
+            totals[mode][1] += size
+            print(f"{chart:<12}{mode:<10}{seconds * 1000:>10.2f}{size:>12,}")
+    for mode, (seconds, size) in totals.items():
+        print(f"{'total':<12}{mode:<10}{seconds * 1000:>10.2f}{size:>12,}")
+    png_seconds, png_size = totals["png"]
+    vega_seconds, vega_size = totals["vega"]
+    print(f"\nVega-Lite: {png_seconds / vega_seconds:,.0f}x less server CPU, "
+          f"{png_size / vega_size:,.0f}x smaller payload")
+
+
+if __name__ == "__main__":
+    main()
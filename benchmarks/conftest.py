@@ -0,0 +1,67 @@
+"""Fixtures for the pytest-benchmark suite
+
+    pip install pytest pytest-benchmark
+    python -m pytest benchmarks --benchmark-only --bench-sizes 100,10000
+
+Every benchmark also records the tracemalloc peak of one extra call in
+``extra_info["peak_kib"]``; ``--benchmark-json`` keeps it alongside the
+timings so runs can be compared with ``pytest-benchmark compare``.
+"""
+import os
+import sys
+import tracemalloc
+from importlib.util import find_spec
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import synthetic_marks, synthetic_store
+
+# Without the plugin there is no ``benchmark`` fixture; skip the suite
+if find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+SIZES = "100,10000,100000"
+SUBJECT_COUNTS = (5, 10)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-sizes", default=SIZES,
+                     help=f"comma-separated class sizes to benchmark (default {SIZES})")
+
+
+def pytest_generate_tests(metafunc):
+    if "students" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("bench_sizes").split(",")]
+        metafunc.parametrize("students", sizes, ids=[f"{size}students" for size in sizes], scope="session")
+    if "subjects" in metafunc.fixturenames:
+        metafunc.parametrize("subjects", SUBJECT_COUNTS, ids=[f"{n}subjects" for n in SUBJECT_COUNTS],
+                             scope="session")
+
+
+@pytest.fixture(scope="session")
+def marks(students, subjects):
+    """``(subject_names, marks)`` for a synthetic class"""
+    return synthetic_marks(students, subjects)
+
+
+@pytest.fixture(scope="session")
+def store(students, subjects):
+    """A StudentStore holding the synthetic class"""
+    return synthetic_store(students, subjects)
+
+
+@pytest.fixture
+def measure(benchmark):
+    """``measure(fn, *args)``: time ``fn`` and record its tracemalloc peak"""
+    def run(fn, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            fn(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_kib"] = round(peak / 1024, 1)
+        return benchmark(fn, *args, **kwargs)
+    return run
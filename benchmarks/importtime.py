@@ -0,0 +1,68 @@
+"""Cold-start import report for the Streamlit app
+
+Runs ``python -X importtime main.py`` (Streamlit's bare mode, so the script
+executes once with no students) and lists the slowest top-level imports.
+Exits non-zero when a module that should be lazy was imported at start-up
+or when the total exceeds ``--budget-ms``.
+
+    python benchmarks/importtime.py --top 15 --budget-ms 1500
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed once a chart, DataFrame, import or export is requested
+LAZY_MODULES = ["pandas", "matplotlib", "pyarrow", "openpyxl"]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime(script="main.py"):
+    """``(module, self_us, cumulative_us, depth)`` for every import the script made"""
+    env = dict(os.environ, REPORTCARD_DB=":memory:", PYTHONWARNINGS="ignore")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            rows.append((module, int(own), int(cumulative), (len(indent) - 1) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="main.py")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rows = importtime(args.script)
+    total_ms = sum(own for _, own, _, _ in rows) / 1000
+    print(f"{len(rows)} modules imported in {total_ms:,.1f} ms\n")
+    print(f"{'module':<40}{'cumulative ms':>15}")
+    top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: row[2], reverse=True)
+    for module, _, cumulative, _ in top_level[:args.top]:
+        print(f"{module:<40}{cumulative / 1000:>15,.1f}")
+
+    imported = {module.split(".")[0] for module, _, _, _ in rows}
+    eager = [module for module in LAZY_MODULES if module in imported]
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at start-up: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nFAIL: {total_ms:,.1f} ms exceeds the {args.budget_ms:,.1f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Concurrent-session load test of one real Streamlit server
+
+Starts ``streamlit run main.py`` and connects every simulated teacher to it
+over its own websocket, speaking the same protobuf protocol as a browser,
+from one thread per session. All sessions therefore share the server's
+cache_resource state (School and its class locks, figure and memo caches,
+report DB, chart pool) and compete for its GIL, exactly as teachers do.
+
+A session fills the sidebar form and clicks "Generate Report" for each of
+its students (all into the same class, so appends contend for its write
+lock), then switches between students in the Individual Reports
+selectbox and drives a widget in the Trends and Rankings tabs. Streamlit
+executes every tab on every rerun, so each rerun renders all four tabs.
+A rerun's latency runs from sending its BackMsg to receiving the
+script_finished message; images are not fetched. ``--chart-mode`` is
+selected along with the first Generate, so each session's first rerun
+("load") always renders in the default PNG mode.
+
+Every concurrency level gets a fresh server and an empty report DB, which
+serves one unrecorded session first so imports stay out of the results;
+then all sessions start together. Marks and roll numbers are seeded, so
+runs are reproducible; only the latencies vary. RSS is the server
+process's (Linux only).
+
+    python benchmarks/load_test.py --sessions 1 2 4 8 --students 3 --json load.jsonl
+
+Exits non-zero if any session raised, saw an app exception or timed out.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_PATH = os.path.join(ROOT, "main.py")
+SUBJECTS = ["Math", "Physics", "Urdu", "English", "Computer"]
+CHART_MODES = {"png": "Server (PNG)", "vega": "Browser (Vega-Lite)"}
+PERCENTILES = (50, 95, 99)
+
+# Seconds a fresh server may take to start answering health checks
+STARTUP_TIMEOUT = 60
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def process_memory(pid):
+    """``(rss_bytes, peak_rss_bytes)`` of another process, or Nones off Linux"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(":", 1) for line in status if ":" in line)
+    except OSError:
+        return None, None
+    kib = lambda field: int(fields[field].split()[0]) * 1024 if field in fields else None
+    return kib("VmRSS"), kib("VmHWM")
+
+
+class AppServer:
+    """``streamlit run main.py`` on a free port, stopped on exit"""
+
+    def __init__(self, workdir, timeout=STARTUP_TIMEOUT):
+        self.port = free_port()
+        self.timeout = timeout
+        self.log_path = os.path.join(workdir, "server.log")
+        self.env = dict(os.environ, REPORTCARD_DB=os.path.join(workdir, "reports.db"))
+        self.process = None
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        with open(self.log_path, "w") as log:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "streamlit", "run", APP_PATH,
+                 "--server.headless", "true", "--server.port", str(self.port),
+                 "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+                cwd=ROOT, env=self.env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"server exited with {self.process.returncode}:\n{self.log_tail()}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError(f"server did not become healthy in {self.timeout:.0f}s:\n{self.log_tail()}")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def memory(self):
+        return process_memory(self.process.pid)
+
+    def log_tail(self, lines=20):
+        with open(self.log_path, errors="replace") as log:
+            return "".join(log.readlines()[-lines:])
+
+
+class RssSampler:
+    """Peak resident set size of a process, polled on a background thread"""
+
+    def __init__(self, pid, interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            self.peak = max(self.peak, process_memory(self.pid)[0] or 0)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def text_state(widget, value):
+    """WidgetState of a text input, radio or selectbox set to ``value``
+
+    Choice widgets take the option's label as shown, as the browser sends it.
+    """
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    return WidgetState(id=widget.id, string_value=value)
+
+
+def slider_state(widget, value):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    state = WidgetState(id=widget.id)
+    state.double_array_value.data[:] = [value]
+    return state
+
+
+def click_state(widget):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    return WidgetState(id=widget.id, trigger_value=True)
+
+
+class Session:
+    """One simulated teacher: a websocket client and the latency of every rerun
+
+    The app's deltas are parsed with AppTest's element tree to find widgets
+    and their options. Like a browser, every rerun sends the state of every
+    widget this session has set so far; a button click is sent once.
+    """
+
+    def __init__(self, number, students, chart_mode, seed, timeout):
+        self.number = number
+        self.students = students
+        self.chart_mode = chart_mode
+        self.timeout = timeout
+        self.rng = random.Random(seed * 1000 + number)
+        self.latencies = []
+        self.errors = []
+        self.tree = None
+        self._states = {}
+        self._socket = None
+
+    def run(self, action, *changed):
+        """Send a rerun carrying the ``changed`` WidgetStates and time it"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        triggers = [state for state in changed if state.WhichOneof("value") == "trigger_value"]
+        self._states.update((state.id, state) for state in changed if state not in triggers)
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.widget_states.widgets.extend(list(self._states.values()) + triggers)
+
+        messages = []
+        started = time.perf_counter()
+        self._socket.send(back.SerializeToString())
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self._socket.recv(timeout=self.timeout))
+            messages.append(message)
+            if (message.WhichOneof("type") == "script_finished"
+                    and message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN):
+                break
+        self.latencies.append((action, time.perf_counter() - started))
+
+        self.tree = parse_tree_from_messages(messages)
+        if self.tree.exception:
+            raise RuntimeError(f"{action}: {self.tree.exception[0].value}")
+
+    def choose(self, widget):
+        """State of ``widget`` (a selectbox) set to a random one of its options"""
+        return text_state(widget, widget.options[self.rng.randrange(len(widget.options))])
+
+    def generate(self, k):
+        tree = self.tree
+        changed = [
+            text_state(tree.text_input(key="name_input"), f"Teacher {self.number} Student {k}"),
+            text_state(tree.text_input(key="roll_input"), f"{self.number:03d}{k:03d}"),
+        ]
+        changed += [slider_state(tree.slider(key=f"{subject}_marks"), self.rng.randint(30, 100))
+                    for subject in SUBJECTS]
+        if k == 0:
+            changed.append(text_state(tree.radio(key="chart_mode"), CHART_MODES[self.chart_mode]))
+        changed.append(click_state(next(button for button in tree.button if button.label.startswith("✅"))))
+        self.run("generate", *changed)
+        if not any("generated successfully" in alert.value for alert in self.tree.success):
+            raise RuntimeError(f"student {k} was not generated")
+
+    def browse(self):
+        def student_select():
+            return next(box for box in self.tree.selectbox if box.label == "Select Student to View:")
+        for i in range(min(self.students, len(student_select().options))):
+            box = student_select()
+            self.run("select_student", text_state(box, box.options[i]))
+        self.run("trends", self.choose(self.tree.selectbox(key="trend_student")))
+        self.run("rankings", self.choose(self.tree.selectbox(key="ranked_subject")))
+        if len(self.tree.tabs) != 4:
+            raise RuntimeError(f"expected 4 tabs, rendered {len(self.tree.tabs)}")
+
+    def play(self, url, start=None):
+        """Connect, wait for ``start`` and make the whole scripted visit
+
+        Any failure is recorded, not raised.
+        """
+        from websockets.sync.client import connect
+
+        try:
+            with connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout) as self._socket:
+                if start is not None:
+                    start.wait(session_budget(self.timeout, self.students))
+                self.run("load")
+                for k in range(self.students):
+                    self.generate(k)
+                self.browse()
+        except Exception as exc:
+            self.errors.append(f"session {self.number}: {exc!r}")
+            if start is not None:
+                start.abort()
+
+
+def session_budget(timeout, students):
+    """Longest a whole scripted visit may take: every rerun at its timeout"""
+    return timeout * (2 * students + 8)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))]
+
+
+def run_level(sessions, students, chart_mode, seed, timeout, workdir):
+    """Run ``sessions`` concurrent sessions against a fresh server and summarise them as a dict"""
+    errors = []
+    with AppServer(workdir) as server:
+        # Imports and first-use costs stay out of the measured sessions
+        warm = Session(sessions, 1, chart_mode, seed, timeout)
+        warm.play(server.url)
+        errors += [f"warm-up {error}" for error in warm.errors]
+
+        start = threading.Barrier(sessions + 1)
+        players = [Session(number, students, chart_mode, seed, timeout) for number in range(sessions)]
+        threads = [threading.Thread(target=player.play, args=(server.url, start), name=f"session-{player.number}")
+                   for player in players]
+        for thread in threads:
+            thread.start()
+        with RssSampler(server.process.pid) as sampler:
+            try:
+                start.wait(session_budget(timeout, students))
+            except threading.BrokenBarrierError:
+                errors.append("a session failed before the start")
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join(session_budget(timeout, students))
+                if thread.is_alive():
+                    errors.append(f"{thread.name} did not finish")
+            seconds = time.perf_counter() - started
+        rss, peak = server.memory()
+        if errors or any(player.errors for player in players):
+            errors.append(f"server log:\n{server.log_tail()}")
+
+    latencies = sorted(latency for player in players for _, latency in player.latencies)
+    by_action = {}
+    for player in players:
+        errors = player.errors + errors
+        for action, latency in player.latencies:
+            by_action.setdefault(action, []).append(latency)
+    result = {
+        "sessions": sessions,
+        "students_per_session": students,
+        "chart_mode": chart_mode,
+        "reruns": len(latencies),
+        "errors": errors,
+        "seconds": seconds,
+        "reruns_per_second": len(latencies) / seconds if seconds else 0.0,
+    }
+    for q in PERCENTILES:
+        result[f"p{q}"] = percentile(latencies, q) if latencies else None
+    result["action_p50"] = {action: statistics.median(values) for action, values in by_action.items()}
+    result["action_p95"] = {action: percentile(sorted(values), 95) for action, values in by_action.items()}
+    result["rss_bytes"] = rss
+    result["peak_rss_bytes"] = max(sampler.peak, peak or 0) or None
+    return result
+
+
+def print_row(result, out=sys.stdout):
+    mib = lambda size: "-" if size is None else f"{size / (1024 * 1024):.0f}"
+    ms = lambda seconds: "-" if seconds is None else f"{seconds * 1000:.0f}"
+    print(f"{result['sessions']:>8}{result['reruns']:>8}"
+          f"{ms(result['p50']):>10}{ms(result['p95']):>10}{ms(result['p99']):>10}"
+          f"{result['reruns_per_second']:>10.2f}{mib(result['rss_bytes']):>9}"
+          f"{mib(result['peak_rss_bytes']):>9}{len(result['errors']):>8}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="concurrency levels to run, in order")
+    parser.add_argument("--students", type=int, default=3, help="reports each session generates")
+    parser.add_argument("--chart-mode", choices=sorted(CHART_MODES), default="png")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per rerun")
+    parser.add_argument("--json", default=None, help="append one JSON line per level to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'sessions':>8}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'reruns/s':>10}{'rss MiB':>9}{'peak MiB':>9}{'errors':>8}")
+        failed = False
+        for sessions in args.sessions:
+            level_dir = os.path.join(workdir, f"sessions-{sessions}")
+            os.makedirs(level_dir, exist_ok=True)
+            result = run_level(sessions, args.students, args.chart_mode, args.seed, args.timeout, level_dir)
+            print_row(result)
+            for error in result["errors"]:
+                print(f"  {error}", file=sys.stderr)
+            failed = failed or bool(result["errors"])
+            if args.json:
+                with open(args.json, "a") as log:
+                    log.write(json.dumps(result) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Reproducible synthetic classes for benchmarks and load tests"""
+import numpy as np
+
+from reportcard import StudentStore
+from reportcard.grading import DEFAULT_SCHEME
+
+SUBJECTS = [
+    "Math", "Physics", "Urdu", "English", "Computer",
+    "Chemistry", "Biology", "Islamiat", "Pakistan Studies", "Art",
+]
+
+
+def synthetic_marks(students, subjects=5, seed=0):
+    """``(subject_names, marks)`` with marks roughly N(65, 15) clipped to 0-100"""
+    rng = np.random.default_rng(seed)
+    # A per-student ability shift keeps subjects correlated, like real classes
+    ability = rng.normal(0, 10, size=(students, 1))
+    marks = np.clip(np.rint(rng.normal(65, 12, size=(students, subjects)) + ability), 0, 100)
+    return SUBJECTS[:subjects], marks.astype(np.int16)
+
+
+def synthetic_columns(marks, seed=0):
+    """Per-student columns for ``StudentStore.extend`` matching ``marks``"""
+    rng = np.random.default_rng(seed + 1)
+    count, subjects = marks.shape
+    total_marks = marks.sum(axis=1, dtype=np.int64)
+    percentage = (total_marks / (subjects * 100)) * 100
+    ids = [f"{i:06d}" for i in range(count)]
+    return {
+        "name": [f"Student {i}" for i in ids],
+        "roll_no": ids,
+        "teacher_remarks": [""] * count,
+        "total_marks": total_marks,
+        "max_possible": subjects * 100,
+        "percentage": percentage,
+        "grade": DEFAULT_SCHEME.grade.codes(percentage),
+        "attendance": rng.integers(50, 101, size=count),
+        "conduct": rng.integers(0, 5, size=count),
+        "assessment_date": np.datetime64("2024-01-01") + rng.integers(0, 365, size=count),
+        "timestamp": np.datetime64("2024-12-31T12:00:00"),
+    }
+
+
+def synthetic_store(students, subjects=5, seed=0):
+    """A StudentStore holding one synthetic report per student"""
+    names, marks = synthetic_marks(students, subjects, seed)
+    store = StudentStore(capacity=students)
+    store.extend(names, marks, synthetic_columns(marks, seed))
+    return store
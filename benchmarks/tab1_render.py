@@ -0,0 +1,111 @@
+"""Element count, payload size and render time of the Individual Reports body
+
+Compares the per-section st.markdown calls the tab used to make with the
+consolidated summary/breakdown fragments it makes now. Charts are left
+out: both versions send the same three images.
+
+    python benchmarks/tab1_render.py --subjects 10 --runs 20
+"""
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = """
+import sys
+sys.path.insert(0, {root!r})
+import streamlit as st
+from reportcard import analyze_batch
+from reportcard.cards import *
+
+subjects = [f"Subject {{i + 1}}" for i in range({subjects})]
+marks = dict(zip(subjects, [(37 * i + 41) % 101 for i in range({subjects})]))
+student = {{
+    "name": "Ayesha Khan", "roll_no": "2024001", "marks": marks,
+    "total_marks": sum(marks.values()), "max_possible": len(marks) * 100,
+    "percentage": sum(marks.values()) / len(marks), "grade": "B", "grade_color": "#f59e0b",
+    "assessment_date": "2024-03-01", "attendance": 85, "conduct": "Good",
+}}
+analysis = analyze_batch([list(marks.values())], subjects, [student["percentage"]]).student(0)
+"""
+
+# The tab before consolidation: one element per card, bar and list item
+SEPARATE = """
+st.markdown(header_html(student), unsafe_allow_html=True)
+for col, metric in zip(st.columns(5), metric_cards(student)):
+    col.markdown(metric_card_html(*metric), unsafe_allow_html=True)
+st.markdown("<br>", unsafe_allow_html=True)
+st.markdown(insight_html(analysis), unsafe_allow_html=True)
+if analysis["badges"]:
+    st.markdown("### 🏅 Achievement Badges")
+    st.markdown(badges_html(analysis), unsafe_allow_html=True)
+st.markdown("### 📈 Subject-wise Performance Breakdown")
+for subject, mark in student["marks"].items():
+    st.markdown(progress_bar_html(subject, mark), unsafe_allow_html=True)
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("### 💪 Strengths")
+    for subject, mark in analysis["strengths"].items():
+        st.markdown(strength_html(subject, mark), unsafe_allow_html=True)
+    if not analysis["strengths"]:
+        st.info("💡 Focus on building strengths by excelling in your best subjects.")
+    st.markdown("### ⚠️ Areas for Improvement")
+    for subject, mark in analysis["weaknesses"].items():
+        st.markdown(weakness_html(subject, mark), unsafe_allow_html=True)
+    if not analysis["weaknesses"]:
+        st.success("🎉 No significant weaknesses identified! Great job!")
+with col2:
+    st.markdown("### 📚 Personalized Recommendations")
+    for subject, recommendation in analysis["recommendations"].items():
+        st.markdown(recommendation_html(subject, recommendation), unsafe_allow_html=True)
+st.markdown("### 🚀 Predicted Improvement Potential")
+st.markdown("*Based on current performance and AI analysis*")
+"""
+
+CONSOLIDATED = """
+st.markdown(summary_html(student, analysis), unsafe_allow_html=True)
+st.markdown(breakdown_html(student, analysis), unsafe_allow_html=True)
+"""
+
+
+def payload(node):
+    """``(elements, protobuf bytes)`` under ``node`` of an AppTest tree"""
+    proto = getattr(node, "proto", None)
+    elements, size = (1, proto.ByteSize()) if proto is not None else (0, 0)
+    for child in getattr(node, "children", {}).values():
+        child_elements, child_size = payload(child)
+        elements += child_elements
+        size += child_size
+    return elements, size
+
+
+def measure(body, subjects, runs):
+    app = AppTest.from_string(SETUP.format(root=ROOT, subjects=subjects) + body)
+    app.run()
+    elements, size = payload(app._tree)
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - started)
+    return elements, size, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'layout':<14}{'elements':>10}{'bytes':>10}{'rerun ms':>10}")
+    for label, body in (("separate", SEPARATE), ("consolidated", CONSOLIDATED)):
+        elements, size, seconds = measure(body, args.subjects, args.runs)
+        print(f"{label:<14}{elements:>10}{size:>10,}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
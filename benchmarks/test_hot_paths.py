@@ -0,0 +1,76 @@
+"""Analysis, grading, chart rendering, JSON export and lookup at class scale"""
+import io
+import random
+
+import pytest
+
+from reportcard import analyze_batch, calculate_grade
+from reportcard.charts import potential_chart, radar_chart, render, subject_bar_chart
+from reportcard.export import export_students
+from reportcard.grading import DEFAULT_SCHEME
+from reportcard.search import search
+from synthetic import synthetic_marks, synthetic_store
+
+LOOKUPS = 1000
+
+
+def test_store_build(measure, students, subjects):
+    measure(synthetic_store, students, subjects)
+
+
+def test_analyze_batch(measure, marks):
+    subjects, matrix = marks
+    measure(analyze_batch, matrix, subjects)
+
+
+def test_analysis_dicts(measure, marks):
+    """generate_performance_analysis for every student"""
+    subjects, matrix = marks
+    measure(lambda: list(analyze_batch(matrix, subjects).students()))
+
+
+def test_grade_vectorized(measure, store):
+    percentages = store.column("percentage")
+    measure(DEFAULT_SCHEME.grade.codes, percentages)
+
+
+def test_grade_per_student(measure, store):
+    """calculate_grade called once per student"""
+    percentages = store.column("percentage").tolist()
+    measure(lambda: [calculate_grade(percentage) for percentage in percentages])
+
+
+def test_json_export(measure, store):
+    measure(lambda: export_students(store, io.BytesIO(), "ndjson"))
+
+
+def test_student_lookup(measure, store):
+    """find + get for random roll numbers"""
+    rolls = random.Random(0).choices(store.roll_numbers(), k=LOOKUPS)
+    measure(lambda: [store.get(store.find(roll)) for roll in rolls])
+
+
+@pytest.mark.parametrize("query", ["page", "grades", "weak", "range", "name"])
+def test_search(measure, store, query):
+    """One page of results from the search indexes"""
+    filters = {
+        "page": {"page": 3},
+        "grades": {"grades": ("D", "F")},
+        "weak": {"weak_in": (store.subjects[0],)},
+        "range": {"min_percentage": 40, "max_percentage": 60},
+        "name": {"text": "Student 00"},
+    }[query]
+    measure(search, store, **filters)
+
+
+@pytest.mark.parametrize("chart", ["subjects", "radar", "potential"])
+def test_chart_render(measure, subjects, chart):
+    names, matrix = synthetic_marks(1, subjects)
+    student = {"name": "Student 000000", "marks": dict(zip(names, matrix[0].tolist()))}
+    analysis = analyze_batch(matrix, names).student(0)
+    build = {
+        "subjects": lambda: subject_bar_chart(student, analysis, 40),
+        "radar": lambda: radar_chart(student, analysis),
+        "potential": lambda: potential_chart(student, analysis),
+    }[chart]
+    measure(lambda: render(build(), "png"))
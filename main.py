@@ -1,174 +1,162 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+from contextlib import ExitStack
 from datetime import datetime
-import json
+import os
+import tempfile
+
+# Charts are only ever rendered to bytes; pick the non-interactive backend
+# before anything can import matplotlib
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# pandas, matplotlib and the chart/card/import/export modules that pull them
+# in are imported where first needed, so the empty form starts without them
+from reportcard import CONDUCT_OPTIONS, build_report, generate_performance_analysis
+from reportcard.grading import format_grade_scale, grading_scheme, parse_grade_scale
+from reportcard.memo import MemoCache, content_key
+from reportcard.persistence import ReportDB
+from reportcard.profiling import Profiler, append_json_log, write_prometheus
+from reportcard.rankings import ALL_BADGES
+from reportcard.school import DEFAULT_CLASS, School
+from reportcard.search import PAGE_SIZE, page_count, search
+from reportcard.trends import moving_average
 
 # Set Page Configuration
 st.set_page_config(page_title="Advanced Student Report Card System", layout="wide", initial_sidebar_state="expanded")
 
-# Custom Styling for UI
-with open("style.css") as css:
-    st.markdown(f"<style>{css.read()}</style>", unsafe_allow_html=True)
-
-# Initialize Session State
-if "students" not in st.session_state:
-    st.session_state.students = []
-if "class_settings" not in st.session_state:
-    st.session_state.class_settings = {
-        "passing_percentage": 40,
-        "excellence_threshold": 85,
-        "class_name": "Class 10-A"
-    }
-
-# Advanced AI Analysis Function with Predictive Features
-def generate_performance_analysis(student_data):
-    """Generate intelligent insights and recommendations based on student performance"""
-    marks = student_data['marks']
-    percentage = student_data['percentage']
-    
-    # Calculate statistics
-    marks_list = list(marks.values())
-    avg_marks = np.mean(marks_list)
-    std_dev = np.std(marks_list)
-    max_mark = max(marks_list)
-    min_mark = min(marks_list)
-    
-    # Identify strengths and weaknesses
-    strengths = {subject: mark for subject, mark in marks.items() if mark >= avg_marks + std_dev/2}
-    weaknesses = {subject: mark for subject, mark in marks.items() if mark < avg_marks - std_dev/2}
-    consistent = {subject: mark for subject, mark in marks.items() 
-                  if subject not in strengths and subject not in weaknesses}
-    
-    # Generate performance category
-    if percentage >= 85:
-        performance_category = "🏆 Exceptional"
-        overall_comment = "Outstanding performance! You're among the top performers."
-        emoji = "🌟"
-    elif percentage >= 75:
-        performance_category = "⭐ Excellent"
-        overall_comment = "Excellent work! Keep maintaining this momentum."
-        emoji = "🎯"
-    elif percentage >= 60:
-        performance_category = "👍 Good"
-        overall_comment = "Good performance. Focus on consistency for even better results."
-        emoji = "📈"
-    elif percentage >= 50:
-        performance_category = "📚 Satisfactory"
-        overall_comment = "Satisfactory results. More dedication needed for improvement."
-        emoji = "💪"
-    elif percentage >= 40:
-        performance_category = "⚠️ Needs Improvement"
-        overall_comment = "Requires focused effort. Don't lose hope, improvement is possible!"
-        emoji = "📖"
-    else:
-        performance_category = "🚨 Critical"
-        overall_comment = "Immediate intervention required. Let's work together on a recovery plan."
-        emoji = "🆘"
-    
-    # Achievement badges
-    badges = []
-    if percentage >= 90:
-        badges.append("🥇 Gold Medalist")
-    elif percentage >= 80:
-        badges.append("🥈 Silver Achiever")
-    elif percentage >= 70:
-        badges.append("🥉 Bronze Performer")
-    
-    if std_dev < 8:
-        badges.append("⚖️ Consistency Champion")
-    
-    if max_mark == 100:
-        badges.append("💯 Perfect Score")
-    
-    if all(mark >= 75 for mark in marks_list):
-        badges.append("🌟 All-Rounder")
-    
-    # Subject-specific recommendations
-    recommendations = {}
-    for subject, mark in marks.items():
-        if mark >= 90:
-            recommendations[subject] = "🎓 Outstanding! Consider advanced topics or mentoring peers."
-        elif mark >= 80:
-            recommendations[subject] = "📚 Excellent! Aim for perfection with targeted practice."
-        elif mark >= 70:
-            recommendations[subject] = "✍️ Good work! Focus on mastering complex concepts."
-        elif mark >= 60:
-            recommendations[subject] = "📖 Decent foundation. Practice 45 mins daily for improvement."
-        elif mark >= 50:
-            recommendations[subject] = "⚠️ Needs attention. Consider group study or tutoring."
-        elif mark >= 40:
-            recommendations[subject] = "🚨 Critical! Immediate focus required with teacher support."
-        else:
-            recommendations[subject] = "🆘 Urgent intervention needed. One-on-one coaching recommended."
-    
-    # Consistency analysis
-    if std_dev < 8:
-        consistency_note = "Highly consistent across all subjects"
-        consistency_color = "#22c55e"
-    elif std_dev < 15:
-        consistency_note = "Moderate variation in performance"
-        consistency_color = "#f59e0b"
-    else:
-        consistency_note = "High variation - balance needed"
-        consistency_color = "#ef4444"
-    
-    # Predicted improvement
-    improvement_potential = calculate_improvement_potential(marks, avg_marks)
-    
-    return {
-        "performance_category": performance_category,
-        "overall_comment": overall_comment,
-        "emoji": emoji,
-        "strengths": strengths,
-        "weaknesses": weaknesses,
-        "consistent": consistent,
-        "recommendations": recommendations,
-        "consistency_note": consistency_note,
-        "consistency_color": consistency_color,
-        "avg_marks": avg_marks,
-        "std_dev": std_dev,
-        "max_mark": max_mark,
-        "min_mark": min_mark,
-        "badges": badges,
-        "improvement_potential": improvement_potential
-    }
-
-def calculate_improvement_potential(marks, avg_marks):
-    """Calculate potential for improvement in next assessment"""
-    potential = {}
-    for subject, mark in marks.items():
-        if mark < 50:
-            potential[subject] = min(mark + 20, 75)
-        elif mark < 70:
-            potential[subject] = min(mark + 15, 85)
-        elif mark < 85:
-            potential[subject] = min(mark + 10, 95)
-        else:
-            potential[subject] = min(mark + 5, 100)
-    return potential
-
-def calculate_grade(percentage):
-    """Calculate letter grade based on percentage"""
-    if percentage >= 90:
-        return "A+", "#22c55e"
-    elif percentage >= 80:
-        return "A", "#84cc16"
-    elif percentage >= 70:
-        return "B+", "#eab308"
-    elif percentage >= 60:
-        return "B", "#f59e0b"
-    elif percentage >= 50:
-        return "C", "#f97316"
-    elif percentage >= 40:
-        return "D", "#ef4444"
-    else:
-        return "F", "#991b1b"
-
-def export_report_data(student):
-    """Export student report as JSON"""
-    return json.dumps(student, indent=2)
+# Custom Styling for UI, read from disk once per process
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css")
+
+@st.cache_resource
+def load_css():
+    with open(CSS_PATH) as css:
+        return css.read()
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+# Rendered chart bytes shared by every session in this process, within a
+# byte budget set in MiB by REPORTCARD_FIGURE_CACHE_MB (default 64)
+FIGURE_CACHE_BYTES = int(float(os.environ.get("REPORTCARD_FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+
+@st.cache_resource
+def get_figure_cache():
+    from reportcard.charts import FigureCache
+    return FigureCache(max_bytes=FIGURE_CACHE_BYTES)
+
+def figure_cache_for_run():
+    """The shared FigureCache, resized if the configured budget changed"""
+    figure_cache = get_figure_cache()
+    if figure_cache.max_bytes != FIGURE_CACHE_BYTES:
+        figure_cache.resize(FIGURE_CACHE_BYTES)
+    return figure_cache
+
+# Bounded pool shared by every session for rendering uncached charts
+CHART_WORKERS = min(4, os.cpu_count() or 1)
+
+@st.cache_resource
+def get_chart_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart")
+
+# Per-student analysis and HTML fragments, shared the same way
+@st.cache_resource
+def get_memo_cache():
+    return MemoCache()
+
+memo_cache = get_memo_cache()
+
+# Opt-in instrumentation: stage timings for this session's reruns, shown in
+# the Debug expander and optionally logged for offline analysis
+PROFILE_LOG_PATH = os.environ.get("REPORTCARD_PROFILE_LOG")
+PROFILE_PROM_PATH = os.environ.get("REPORTCARD_PROFILE_PROM")
+
+if "profiler" not in st.session_state:
+    st.session_state.profiler = Profiler()
+    st.session_state.profiler.watch("memo", memo_cache)
+profiler = st.session_state.profiler
+profiler.start_run(st.session_state.get("profiling", os.environ.get("REPORTCARD_PROFILE") == "1"))
+
+# Saved report history shared by every session in this process
+REPORT_DB_PATH = os.environ.get("REPORTCARD_DB", "reports.db")
+HISTORY_PAGE_SIZE = 5000
+
+@st.cache_resource
+def get_report_db():
+    return ReportDB(REPORT_DB_PATH, default_class=DEFAULT_CLASS)
+
+report_db = get_report_db()
+
+def mark_seen(section):
+    """Record a write this session made to a class
+
+    The update toast then only announces other sessions' writes. Call with
+    ``section.lock`` held for writing, right after the write.
+    """
+    st.session_state.setdefault("seen_versions", {})[section.name] = section.store.version
+
+def load_saved_reports(section, pages=1):
+    """Append the next page(s) of one class's saved history to its store
+
+    Call with ``section.lock`` held for writing.
+    """
+    for page_no, (cursor, page) in enumerate(
+        report_db.iter_pages(section.history_cursor, HISTORY_PAGE_SIZE, section.name)
+    ):
+        # One columnar extend per run of reports sharing a subject layout
+        section.store.extend_reports(report for report_id, report in page if report_id not in section.saved_ids)
+        section.history_cursor = cursor
+        if pages is not None and page_no + 1 >= pages:
+            break
+    section.loaded = True
+    mark_seen(section)
+
+def reset_section(section, cursor=0):
+    """Empty a class's store; history after ``cursor`` can be loaded again
+
+    Call with ``section.lock`` held for writing.
+    """
+    section.store.clear()
+    section.saved_ids = set()
+    section.history_cursor = cursor
+    mark_seen(section)
+
+def load_class(section):
+    """Read a class's first page of history, once per process"""
+    with section.lock.write():
+        if not section.loaded:
+            load_saved_reports(section)
+
+# Every session shares one School, so a class's reports are held in memory
+# once per process and each teacher sees the others' reports. Every class
+# with saved reports is listed, but its history is only read from disk
+# once someone selects it.
+@st.cache_resource
+def get_school():
+    school = School()
+    for saved_class in report_db.class_names() or [DEFAULT_CLASS]:
+        school.section(saved_class)
+    return school
+
+school = get_school()
+
+def current_scheme():
+    """Grading tables for the class's grading scale and passing mark (memoized)"""
+    settings = st.session_state.class_settings
+    return grading_scheme(settings["grading_scale"], settings["passing_percentage"])
+
+def ranking_table(store, ranking, top_n, dense, score_label):
+    """Top-N rows of a ranking index as a display DataFrame"""
+    import pandas as pd
+    names = store.column("name")
+    rows = [
+        {
+            "Rank": dense_rank if dense else competition_rank,
+            "Name": names[store.find(roll_no)],
+            "Roll No": roll_no,
+            score_label: score
+        }
+        for competition_rank, dense_rank, roll_no, score in ranking.top(top_n)
+    ]
+    return pd.DataFrame(rows, columns=["Rank", "Name", "Roll No", score_label])
 
 # Header with animated title
 st.markdown("""
@@ -184,12 +172,40 @@ st.markdown("""
 # Sidebar Configuration
 st.sidebar.header("⚙️ System Configuration")
 
+# Class / Section selector; the rest of the app works on the selected class
+def add_class():
+    new_class = st.session_state.new_class_name.strip()
+    if new_class:
+        school.section(new_class)
+        st.session_state.class_name = new_class
+        st.session_state.new_class_name = ""
+
+selected_class = st.sidebar.selectbox("🏫 Class / Section", school.names(), key="class_name")
+with st.sidebar.expander("➕ Add Class / Section", expanded=False):
+    st.text_input("New Class Name", key="new_class_name", placeholder="e.g., Class 10-B")
+    st.button("➕ Add Class", on_click=add_class, width="stretch")
+
+section = school.section(selected_class)
+if not section.loaded:
+    load_class(section)
+st.session_state.students = section.store
+st.session_state.class_settings = section.settings
+
+def derived_view(name, compute, *inputs):
+    """This session's copy of a view of the selected class
+
+    Recomputed only when the shared store's version, the class or one of
+    ``inputs`` changes, so reruns skip rebuilding unchanged tables.
+    """
+    views = st.session_state.setdefault("derived_views", {})
+    key = (section.name, section.store.version, *inputs)
+    cached_view = views.get(name)
+    if cached_view is None or cached_view[0] != key:
+        cached_view = views[name] = (key, compute())
+    return cached_view[1]
+
 # Class Settings Expander
 with st.sidebar.expander("🏫 Class Settings", expanded=False):
-    st.session_state.class_settings["class_name"] = st.text_input(
-        "Class Name", 
-        value=st.session_state.class_settings["class_name"]
-    )
     st.session_state.class_settings["passing_percentage"] = st.slider(
         "Passing Percentage", 
         0, 100, 
@@ -200,6 +216,25 @@ with st.sidebar.expander("🏫 Class Settings", expanded=False):
         0, 100, 
         st.session_state.class_settings["excellence_threshold"]
     )
+    grading_scale_text = st.text_input(
+        "Grading Scale",
+        value=format_grade_scale(st.session_state.class_settings["grading_scale"]),
+        help="Grade:minimum percentage pairs, best grade first. The last grade covers everything below."
+    )
+    try:
+        st.session_state.class_settings["grading_scale"] = parse_grade_scale(grading_scale_text)
+    except ValueError as exc:
+        st.error(f"⚠️ {exc}")
+
+# Chart backend: PNGs rasterised here, or Vega-Lite specs drawn by the browser
+CHART_MODES = ("Server (PNG)", "Browser (Vega-Lite)")
+chart_mode = st.sidebar.radio(
+    "📈 Chart Rendering",
+    CHART_MODES,
+    key="chart_mode",
+    help="Browser mode sends a small JSON spec per chart instead of an image, "
+         "so the server does no rendering and the charts are interactive."
+)
 
 st.sidebar.markdown("---")
 st.sidebar.header("📝 Enter Student Details")
@@ -236,7 +271,7 @@ attendance_percentage = st.sidebar.slider("📊 Attendance %:", 0, 100, 85)
 # Conduct rating
 conduct = st.sidebar.select_slider(
     "🎭 Conduct Rating:",
-    options=["Poor", "Fair", "Good", "Very Good", "Excellent"],
+    options=CONDUCT_OPTIONS,
     value="Good"
 )
 
@@ -250,49 +285,164 @@ teacher_remarks = st.sidebar.text_area(
 col_btn1, col_btn2 = st.sidebar.columns(2)
 
 with col_btn1:
-    generate_btn = st.button("✅ Generate Report", use_container_width=True)
+    generate_btn = st.button("✅ Generate Report", width="stretch")
 
 with col_btn2:
-    clear_btn = st.button("🗑️ Clear All", use_container_width=True)
+    clear_btn = st.button("🗑️ Clear All", width="stretch",
+                          help="Clears this class for every session; saved reports stay on disk")
 
 # Generate Report Card Logic
 if generate_btn:
     if name and roll_no:
-        total_marks = sum(marks.values())
-        max_possible = len(subjects) * 100
-        percentage = (total_marks / max_possible) * 100
-        grade, grade_color = calculate_grade(percentage)
-
         # Store student data
-        student_data = {
-            "name": name,
-            "roll_no": roll_no,
-            "marks": marks,
-            "total_marks": total_marks,
-            "max_possible": max_possible,
-            "percentage": percentage,
-            "grade": grade,
-            "grade_color": grade_color,
-            "assessment_date": str(assessment_date),
-            "attendance": attendance_percentage,
-            "conduct": conduct,
-            "teacher_remarks": teacher_remarks,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-        st.session_state.students.append(student_data)
+        student_data = build_report(
+            name, roll_no, marks, assessment_date,
+            attendance=attendance_percentage,
+            conduct=conduct,
+            teacher_remarks=teacher_remarks,
+            max_possible=len(subjects) * 100,
+            scheme=current_scheme()
+        )
+
+        with section.lock.write():
+            st.session_state.students.append(student_data)
+            section.saved_ids.add(report_db.save(student_data, section.name))
+            mark_seen(section)
         st.sidebar.success(f"✅ Report for {name} generated successfully!")
     else:
         st.sidebar.error("⚠️ Please enter both name and roll number!")
 
 # Clear All Logic
 if clear_btn:
-    st.session_state.students = []
+    with section.lock.write():
+        reset_section(section, report_db.last_id(section.name))
     st.sidebar.success("🗑️ All reports cleared!")
     st.rerun()
 
-# Main Content Area
+# Bulk Import
+with st.sidebar.expander("📥 Bulk Import", expanded=False):
+    st.caption("CSV, Excel or Parquet with `name`, `roll_no` and one column per subject. "
+               "Optional: `assessment_date`, `attendance`, `conduct`, `teacher_remarks`.")
+    upload = st.file_uploader("Marks file", type=["csv", "xlsx", "parquet"], key="bulk_upload")
+    if upload is not None and st.button("📥 Import Students", width="stretch"):
+        import pandas as pd
+        from reportcard.ingest import detect_format, import_students
+        def save_rows(new_rows):
+            section.saved_ids.update(
+                report_db.save_many((st.session_state.students.get(i) for i in new_rows), section.name)
+            )
+            mark_seen(section)
+        try:
+            report = import_students(upload, st.session_state.students, fmt=detect_format(upload.name),
+                                     scheme=current_scheme(), lock=section.lock, on_extend=save_rows)
+        except (ValueError, ImportError) as exc:
+            st.error(f"⚠️ {exc}")
+        else:
+            st.success(f"✅ Imported {report.rows_imported} of {report.rows_read} rows "
+                       f"({report.rows_per_second:,.0f} rows/sec)")
+            if report.rejected_count:
+                st.warning(f"⚠️ {report.rejected_count} rows rejected")
+                st.dataframe(pd.DataFrame(report.rejected, columns=["Row", "Reason"]), hide_index=True)
+
+# Saved History
+with st.sidebar.expander("💾 Saved Reports", expanded=False):
+    saved_total = report_db.count(section.name)
+    st.caption(f"{len(st.session_state.students):,} reports in view, {saved_total:,} saved on disk for {section.name}")
+    if section.history_cursor < report_db.last_id(section.name):
+        col_load1, col_load2 = st.columns(2)
+        if col_load1.button("Load next page", width="stretch"):
+            with section.lock.write():
+                load_saved_reports(section)
+            st.rerun()
+        if col_load2.button("Load all", width="stretch"):
+            with section.lock.write():
+                load_saved_reports(section, pages=None)
+            st.rerun()
+    if st.button("↻ Reload from disk", width="stretch"):
+        with section.lock.write():
+            reset_section(section)
+            load_saved_reports(section)
+        st.rerun()
+
+# Batch Report Cards
+with st.sidebar.expander("🖨️ Batch Report Cards", expanded=False):
+    card_format = st.radio("Format", ["HTML", "PDF"], horizontal=True, key="card_format")
+    card_workers = st.number_input("Worker Processes", min_value=1, max_value=64, value=os.cpu_count() or 1, key="card_workers")
+    if st.button("🖨️ Export All Report Cards", width="stretch", disabled=len(st.session_state.students) == 0):
+        store = st.session_state.students
+        progress_bar = st.progress(0.0, text="Rendering report cards...")
+        archive_path = os.path.join(tempfile.gettempdir(), f"report_cards_{os.getpid()}_{id(st.session_state)}.zip")
+        from reportcard.cards import export_cards
+        # Render from a copy so the class stays writable while the cards are made
+        with section.lock.read():
+            snapshot = store.snapshot()
+        current = snapshot.current_rows()
+        exported = export_cards(
+            snapshot.reports(current),
+            archive_path,
+            dict(st.session_state.class_settings),
+            fmt=card_format.lower(),
+            css=load_css(),
+            max_workers=card_workers,
+            progress=lambda done, total: progress_bar.progress(done / total, text=f"{done:,} / {total:,} cards"),
+            total=len(current)
+        )
+        progress_bar.empty()
+        st.session_state.card_archive = archive_path
+        st.success(f"✅ Rendered {exported:,} report cards")
+    if st.session_state.get("card_archive") and os.path.exists(st.session_state.card_archive):
+        with open(st.session_state.card_archive, "rb") as archive:
+            st.download_button("⬇️ Download ZIP", archive, file_name="report_cards.zip",
+                               mime="application/zip", width="stretch")
+
+# Bulk Data Export
+with st.sidebar.expander("📤 Data Export", expanded=False):
+    export_format = st.selectbox("Format", ["NDJSON", "CSV", "Parquet"], key="export_format")
+    export_compression = st.selectbox("Compression", ["None", "gzip", "zstd"], key="export_compression",
+                                      disabled=export_format == "Parquet")
+    store = st.session_state.students
+    with section.lock.read():
+        grade_names = list(store.aggregates.grade_distribution(store.grades, current_scheme().grade_names()))
+    export_grades = st.multiselect("Grades", grade_names, key="export_grades",
+                                   placeholder="All grades")
+    export_range = st.slider("Percentage Range", 0, 100, (0, 100), key="export_range")
+    if st.button("📤 Export Students", width="stretch", disabled=len(st.session_state.students) == 0):
+        from reportcard.export import export_filename, export_students, filter_rows
+        fmt = export_format.lower()
+        compression = None if export_compression == "None" or fmt == "parquet" else export_compression
+        export_name = export_filename(fmt, compression)
+        export_path = os.path.join(tempfile.gettempdir(), f"{os.getpid()}_{id(st.session_state)}_{export_name}")
+        try:
+            with section.lock.read():
+                snapshot = st.session_state.students.snapshot()
+            rows = filter_rows(snapshot, grades=export_grades,
+                               min_percentage=export_range[0], max_percentage=export_range[1])
+            exported = export_students(snapshot, export_path, fmt, rows=rows, compression=compression)
+        except ImportError as exc:
+            st.error(f"⚠️ {exc}")
+        else:
+            st.session_state.data_export = (export_path, export_name)
+            st.success(f"✅ Exported {exported:,} students")
+    if st.session_state.get("data_export") and os.path.exists(st.session_state.data_export[0]):
+        export_path, export_name = st.session_state.data_export
+        with open(export_path, "rb") as exported_file:
+            st.download_button("⬇️ Download Export", exported_file, file_name=export_name,
+                               width="stretch")
+
+# Reports other sessions added to (or cleared from) this class since this
+# session last looked
+seen_versions = st.session_state.setdefault("seen_versions", {})
+if seen_versions.get(section.name, section.store.version) != section.store.version:
+    st.toast(f"🔄 {section.name} was updated in another session")
+seen_versions[section.name] = section.store.version
+
+# Main Content Area; each tab reads the shared store under its read lock
 if len(st.session_state.students) > 0:
+    import pandas as pd
+    from reportcard.cards import breakdown_html, summary_html
+    from reportcard.charts import ChartJobs, potential_chart, radar_chart, student_key, subject_bar_chart
+    from reportcard.vega import potential_spec, radar_spec, subject_bar_spec
+
     # Tabs for different views
     tab1, tab2, tab3, tab4 = st.tabs([
         "📄 Individual Reports", 
@@ -302,286 +452,292 @@ if len(st.session_state.students) > 0:
     ])
     
     # TAB 1: Individual Reports
-    with tab1:
+    with tab1, profiler.stage("tab:reports"), ExitStack() as cleanup, ExitStack() as reading:
+        reading.enter_context(section.lock.read())
         st.markdown("<h2 style='text-align:center; color:#444;'>📄 Detailed Student Reports</h2>", unsafe_allow_html=True)
         
-        # Student selector
-        student_names = [s['name'] for s in st.session_state.students]
-        selected_student = st.selectbox("Select Student to View:", student_names)
+        # Student search: the search indexes narrow the class down and only
+        # one page of matches is ever sent to the browser
+        store = st.session_state.students
+        with st.expander("🔎 Search & Filter", expanded=False):
+            search_text = st.text_input("Name or Roll Number", key="search_text",
+                                        placeholder="Start of a name, or an exact roll number")
+            col_f1, col_f2 = st.columns(2)
+            grade_options = current_scheme().grade_names()
+            grade_options += [grade for grade, rolls in store.search.grades.items()
+                              if rolls and grade not in grade_options]
+            search_grades = col_f1.multiselect("Grade", grade_options, key="search_grades")
+            search_categories = col_f2.multiselect(
+                "Performance", [label for label, _, _ in reversed(current_scheme().category.labels)],
+                key="search_categories"
+            )
+            col_f3, col_f4 = st.columns(2)
+            search_badges = col_f3.multiselect("Badge", ALL_BADGES, key="search_badges")
+            search_weak = col_f4.multiselect("Weak In", store.subjects, key="search_weak")
+            search_range = st.slider("Percentage Range", 0, 100, (0, 100), key="search_range")
         
-        # Find selected student
-        student = next(s for s in st.session_state.students if s['name'] == selected_student)
+        def find_students(page):
+            return search(store, search_text, search_grades, search_categories, search_badges, search_weak,
+                          min_percentage=search_range[0], max_percentage=search_range[1], page=page)
+        total, page_rolls = find_students(st.session_state.get("search_page", 1) - 1)
+        pages = page_count(total, PAGE_SIZE)
+        if st.session_state.get("search_page", 1) > pages:
+            st.session_state.search_page = pages
+            total, page_rolls = find_students(pages - 1)
         
-        # Display Report Card Header
-        st.markdown(f"""
-            <div class="report-card">
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
-                    <div>
-                        <h2 style='margin: 0; color: #667eea;'>👤 {student['name']}</h2>
-                        <p style='margin: 5px 0; color: #666;'>🎟️ Roll No: {student['roll_no']} | 📅 {student['assessment_date']}</p>
-                    </div>
-                    <div style='text-align: right;'>
-                        <h1 style='margin: 0; color: {student['grade_color']}; font-size: 3em;'>{student['grade']}</h1>
-                        <p style='margin: 0; color: #666;'>Grade</p>
-                    </div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Key Metrics Row
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        with col1:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style='color: #667eea; margin: 0;'>{student['total_marks']}</h3>
-                    <p style='color: #666; margin: 5px 0;'>Total Marks</p>
-                    <small style='color: #999;'>out of {student['max_possible']}</small>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style='color: #22c55e; margin: 0;'>{student['percentage']:.2f}%</h3>
-                    <p style='color: #666; margin: 5px 0;'>Percentage</p>
-                    <small style='color: #999;'>Overall Score</small>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style='color: #f59e0b; margin: 0;'>{student['attendance']}%</h3>
-                    <p style='color: #666; margin: 5px 0;'>Attendance</p>
-                    <small style='color: #999;'>Class Presence</small>
-                </div>
-            """, unsafe_allow_html=True)
+        if not total:
+            st.info("🔎 No students match these filters.")
+        else:
+            col_sel1, col_sel2 = st.columns([4, 1])
+            with col_sel2:
+                st.number_input("Page", min_value=1, max_value=pages, key="search_page",
+                                       help=f"{total:,} matching students, {PAGE_SIZE} per page")
+            with col_sel1:
+                selected_roll = st.selectbox(
+                    "Select Student to View:",
+                    page_rolls,
+                    format_func=lambda roll: f"{store.column('name')[store.find(roll)]} ({roll})"
+                )
+            
+            # Find selected student
+            student = store.get(store.find(selected_roll))
+
+            # Everything below is derived from the report and the class settings,
+            # so it is computed once per distinct content and reused on reruns.
+            # Each section is a single HTML fragment, i.e. one element per rerun
+            # however many subjects, strengths or recommendations there are.
+            content = content_key(student, st.session_state.class_settings)
+            def cached(part, compute):
+                return memo_cache.get_or_compute(content, part, compute)
+
+            with profiler.stage("analysis"):
+                analysis = cached("analysis", lambda: generate_performance_analysis(student))
+
+            # Header, Key Metrics, AI Insights and Achievement Badges
+            with profiler.stage("html:summary"):
+                summary = cached("summary", lambda: summary_html(student, analysis))
+            st.markdown(summary, unsafe_allow_html=True)
         
-        with col4:
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style='color: #8b5cf6; margin: 0;'>{student['conduct']}</h3>
-                    <p style='color: #666; margin: 5px 0;'>Conduct</p>
-                    <small style='color: #999;'>Behavior Rating</small>
-                </div>
-            """, unsafe_allow_html=True)
+            # Visualizations Row. Uncached charts render on the shared pool into
+            # placeholders, so the text sections below are sent right away and
+            # each chart appears as soon as it is drawn.
+            figure_cache = figure_cache_for_run()
+            profiler.watch("figure", figure_cache)
+            chart_key = student_key(student, st.session_state.class_settings)
+            chart_jobs = ChartJobs(figure_cache, get_chart_executor())
+            # A rerun can interrupt the script before ``wait``; drop this
+            # student's queued charts then too
+            cleanup.callback(chart_jobs.cancel)
+            def chart_slot(chart, build, spec):
+                if chart_mode == CHART_MODES[1]:
+                    with profiler.stage(f"vega:{chart}"):
+                        chart_spec = cached(f"vega:{chart}", spec)
+                    st.vega_lite_chart(chart_spec, width="stretch")
+                    return
+                slot = st.empty()
+                if not chart_jobs.submit(f"chart:{chart}", (chart_key, chart), build, slot).done():
+                    slot.caption("⏳ Rendering chart...")
+            passing = st.session_state.class_settings["passing_percentage"]
+            col_viz1, col_viz2 = st.columns(2)
         
-        with col5:
-            avg_mark = sum(student['marks'].values()) / len(student['marks'])
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style='color: #ec4899; margin: 0;'>{avg_mark:.1f}</h3>
-                    <p style='color: #666; margin: 5px 0;'>Average</p>
-                    <small style='color: #999;'>Per Subject</small>
-                </div>
-            """, unsafe_allow_html=True)
+            with col_viz1:
+                st.markdown("### 📊 Subject-wise Performance")
+                chart_slot("subjects", lambda: subject_bar_chart(student, analysis, passing),
+                           lambda: subject_bar_spec(student, analysis, passing))
         
-        st.markdown("<br>", unsafe_allow_html=True)
+            with col_viz2:
+                st.markdown("### 🎯 Performance Radar")
+                chart_slot("radar", lambda: radar_chart(student, analysis), lambda: radar_spec(student, analysis))
         
-        # Generate AI Analysis
-        analysis = generate_performance_analysis(student)
+            # Progress Bars, Strengths, Weaknesses, Recommendations and Improvement Potential
+            with profiler.stage("html:breakdown"):
+                breakdown = cached("breakdown", lambda: breakdown_html(student, analysis))
+            st.markdown(breakdown, unsafe_allow_html=True)
         
-        # AI Insights Box
-        st.markdown(f"""
-            <div class="insight-box">
-                <h2 style='margin-top: 0;'>🤖 AI Performance Analysis</h2>
-                <h3>{analysis['emoji']} Performance Level: {analysis['performance_category']}</h3>
-                <p style='font-size: 1.1em;'>{analysis['overall_comment']}</p>
-                <div style='margin-top: 15px;'>
-                    <strong>📊 Statistics:</strong> 
-                    Average: {analysis['avg_marks']:.1f} | 
-                    Highest: {analysis['max_mark']} | 
-                    Lowest: {analysis['min_mark']} | 
-                    Std Dev: {analysis['std_dev']:.2f}
-                </div>
-                <div style='margin-top: 10px;'>
-                    <strong>⚖️ Consistency:</strong> 
-                    <span style='color: {analysis['consistency_color']}; font-weight: bold;'>
-                        {analysis['consistency_note']}
-                    </span>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+            chart_slot("potential", lambda: potential_chart(student, analysis), lambda: potential_spec(student, analysis))
+            # The charts only need this student's report, so other sessions
+            # may write to the class while they finish rendering
+            reading.close()
+            with profiler.stage("charts:display"):
+                chart_jobs.wait(lambda slot, png: slot.image(png, width="stretch"))
+            for chart, seconds in chart_jobs.seconds.items():
+                profiler.record(chart, seconds)
+    # TAB 2: Class Analytics
+    with tab2, profiler.stage("tab:analytics"):
+        with section.lock.read():
+            st.markdown("<h2 style='text-align:center; color:#444;'>📊 Class-wide Analytics</h2>", unsafe_allow_html=True)
         
-        # Achievement Badges
-        if analysis['badges']:
-            st.markdown("### 🏅 Achievement Badges")
-            badges_html = "".join([f'<span class="achievement-badge">{badge}</span>' for badge in analysis['badges']])
-            st.markdown(f'<div style="text-align: center; margin: 20px 0;">{badges_html}</div>', unsafe_allow_html=True)
+            settings = st.session_state.class_settings
+            aggregates = st.session_state.students.aggregates
+            overall = aggregates.overall_summary(settings["passing_percentage"], settings["excellence_threshold"])
         
-        # Visualizations Row
-        col_viz1, col_viz2 = st.columns(2)
+            st.markdown(f"<h4 style='text-align:center; color:#667eea;'>🏫 {settings['class_name']}</h4>", unsafe_allow_html=True)
+            col_c1, col_c2, col_c3, col_c4 = st.columns(4)
+            col_c1.metric("Students", f"{overall['Students']:,}")
+            col_c2.metric("Class Average", f"{overall['Mean']:.2f}%")
+            col_c3.metric("Pass Rate", f"{overall['Pass Rate %']:.1f}%", help=f"Percentage ≥ {settings['passing_percentage']}")
+            col_c4.metric("Excellence Rate", f"{overall['Excellence Rate %']:.1f}%", help=f"Percentage ≥ {settings['excellence_threshold']}")
         
-        with col_viz1:
-            st.markdown("### 📊 Subject-wise Performance")
-            df = pd.DataFrame(list(student["marks"].items()), columns=["Subject", "Marks"])
-            
-            fig, ax = plt.subplots(figsize=(10, 6))
-            colors = ['#22c55e' if mark >= analysis['avg_marks'] else '#ef4444' for mark in df["Marks"]]
-            bars = ax.bar(df["Subject"], df["Marks"], color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
-            
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}',
-                       ha='center', va='bottom', fontweight='bold', fontsize=10)
-            
-            ax.axhline(y=analysis['avg_marks'], color='#3b82f6', linestyle='--', linewidth=2,
-                      label=f'Average: {analysis["avg_marks"]:.1f}')
-            ax.axhline(y=st.session_state.class_settings["passing_percentage"], 
-                      color='#f59e0b', linestyle=':', linewidth=2,
-                      label=f'Passing: {st.session_state.class_settings["passing_percentage"]}')
-            
-            plt.xlabel("Subjects", fontsize=12, fontweight='bold')
-            plt.ylabel("Marks", fontsize=12, fontweight='bold')
-            plt.title(f"{student['name']}'s Marks Distribution", fontsize=14, fontweight='bold')
-            plt.legend(loc='upper right')
-            plt.grid(axis="y", linestyle="--", alpha=0.3)
-            plt.ylim(0, 110)
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.markdown("### 📚 Subject Statistics")
+            st.caption(f"Pass and excellence rates use marks ≥ {settings['passing_percentage']} and ≥ {settings['excellence_threshold']}")
+            subject_stats = derived_view("subject_stats", lambda: pd.DataFrame(
+                aggregates.subject_summary(settings["passing_percentage"], settings["excellence_threshold"])
+            ), settings["passing_percentage"], settings["excellence_threshold"])
+            st.dataframe(subject_stats.style.format(precision=2), hide_index=True, width="stretch")
         
-        with col_viz2:
-            st.markdown("### 🎯 Performance Radar")
-            fig, ax = plt.subplots(figsize=(10, 6), subplot_kw=dict(projection='polar'))
-            
-            subjects_list = list(student['marks'].keys())
-            angles = np.linspace(0, 2 * np.pi, len(subjects_list), endpoint=False).tolist()
-            marks_values = [student['marks'][subject] for subject in subjects_list]
-            marks_values += marks_values[:1]
-            angles += angles[:1]
-            
-            ax.plot(angles, marks_values, 'o-', linewidth=3, color='#667eea', markersize=8)
-            ax.fill(angles, marks_values, alpha=0.3, color='#764ba2')
-            ax.set_xticks(angles[:-1])
-            ax.set_xticklabels(subjects_list, fontsize=10, fontweight='bold')
-            ax.set_ylim(0, 100)
-            ax.set_title(f"{student['name']}'s Performance Radar", 
-                       fontsize=14, fontweight='bold', pad=20)
-            ax.grid(True, linestyle='--', alpha=0.7)
-            
-            # Add average circle
-            avg_circle = [analysis['avg_marks']] * (len(angles))
-            ax.plot(angles, avg_circle, linestyle='--', color='#3b82f6', linewidth=2, label='Average')
-            ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            col_dist1, col_dist2 = st.columns(2)
+            with col_dist1:
+                st.markdown("### 🎓 Grade Distribution")
+                grades = derived_view("grade_distribution", lambda: pd.DataFrame(
+                    list(aggregates.grade_distribution(st.session_state.students.grades,
+                                                       current_scheme().grade_names()).items()),
+                    columns=["Grade", "Students"]
+                ).set_index("Grade"), settings["grading_scale"])
+                st.bar_chart(grades, color="#667eea")
+            with col_dist2:
+                st.markdown("### 📈 Overall Percentage Spread")
+                spread = {label: overall[label] for label in ("P25", "Median", "P75", "P90")}
+                st.bar_chart(pd.DataFrame({"Percentage": spread}), color="#764ba2")
         
-        # Subject-wise Progress Bars
-        st.markdown("### 📈 Subject-wise Performance Breakdown")
-        for subject, mark in student['marks'].items():
-            percentage_val = mark
-            if percentage_val >= 85:
-                color = "#22c55e"
-            elif percentage_val >= 70:
-                color = "#84cc16"
-            elif percentage_val >= 60:
-                color = "#f59e0b"
-            elif percentage_val >= 50:
-                color = "#f97316"
-            else:
-                color = "#ef4444"
-            
-            st.markdown(f"""
-                <div style="margin: 15px 0;">
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                        <strong>{subject}</strong>
-                        <strong>{mark}/100</strong>
-                    </div>
-                    <div class="progress-bar-container">
-                        <div class="progress-bar" style="width: {percentage_val}%; background: {color};">
-                            {percentage_val}%
-                        </div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+        # Cross-class rollup, merged from each loaded class's running aggregates.
+        # This class's read lock is released first: section locks are never
+        # nested, so loading or reading another class cannot deadlock.
+        if len(school) > 1:
+            st.markdown("### 🏫 All Classes")
+            unloaded = [other for other in school.sections.values() if not other.loaded]
+            if unloaded:
+                col_all1, col_all2 = st.columns([3, 1])
+                col_all1.caption(f"{len(school) - len(unloaded)} of {len(school)} classes loaded; "
+                                 "unloaded classes are not included below.")
+                if col_all2.button("Load all classes", width="stretch"):
+                    for other in unloaded:
+                        load_class(other)
+                    st.rerun()
+            class_rows, combined, combined_grades = school.rollup(settings["passing_percentage"],
+                                                                  settings["excellence_threshold"])
+            st.caption(f"Pass and excellence rates use {settings['class_name']}'s thresholds")
+            school_rows = class_rows + [{"Class": "All classes", **combined.overall_summary(
+                settings["passing_percentage"], settings["excellence_threshold"])}]
+            st.dataframe(pd.DataFrame(school_rows).style.format(precision=2), hide_index=True,
+                         width="stretch")
+            school_distribution = combined.grade_distribution(combined_grades, current_scheme().grade_names())
+            st.bar_chart(pd.DataFrame(list(school_distribution.items()), columns=["Grade", "Students"]).set_index("Grade"),
+                         color="#667eea")
+    
+    # TAB 3: Performance Trends
+    with tab3, profiler.stage("tab:trends"), section.lock.read():
+        st.markdown("<h2 style='text-align:center; color:#444;'>📈 Performance Trends</h2>", unsafe_allow_html=True)
         
-        # Strengths, Weaknesses & Recommendations
-        col_analysis1, col_analysis2 = st.columns(2)
+        store = st.session_state.students
+        trends = store.trends
+        window = st.slider("Moving Average Window (assessments / months)", 1, 6, 3, key="trend_window")
         
-        with col_analysis1:
-            st.markdown("### 💪 Strengths")
-            if analysis['strengths']:
-                for subject, mark in analysis['strengths'].items():
-                    st.markdown(f"""
-                        <div class="strength">
-                            <strong>✨ {subject}:</strong> {mark}/100
-                            <p style='margin: 5px 0 0 0; color: #666;'>Excellent performance! Keep it up.</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("💡 Focus on building strengths by excelling in your best subjects.")
-            
-            st.markdown("### ⚠️ Areas for Improvement")
-            if analysis['weaknesses']:
-                for subject, mark in analysis['weaknesses'].items():
-                    st.markdown(f"""
-                        <div class="weakness">
-                            <strong>📌 {subject}:</strong> {mark}/100
-                            <p style='margin: 5px 0 0 0; color: #666;'>Needs focused attention and practice.</p>
-                        </div>
-                    """, unsafe_allow_html=True)
+        # Students come from the Individual Reports search page rather than
+        # the whole class, so this list stays one page long however big the
+        # class gets; it follows the student selected there.
+        st.markdown("### 👤 Student Progress")
+        if not page_rolls:
+            st.info("🔎 No students match the Individual Reports search filters.")
+        else:
+            if st.session_state.get("trend_follows") != selected_roll:
+                st.session_state.trend_follows = selected_roll
+                st.session_state.trend_student = selected_roll
+            trend_roll = st.selectbox(
+                "Student",
+                page_rolls,
+                format_func=lambda roll: f"{store.column('name')[store.find(roll)]} ({roll})",
+                key="trend_student",
+                help="Students on the current page of the Individual Reports search"
+            )
+            history = pd.DataFrame([
+                {"Date": report["assessment_date"], "Percentage": report["percentage"], "Grade": report["grade"], **report["marks"]}
+                for report in (store.get(row) for row in trends.student_rows(trend_roll))
+            ])
+            if len(history) < 2:
+                st.info("📅 Only one assessment on record for this student. Trends appear after the next assessment.")
             else:
-                st.success("🎉 No significant weaknesses identified! Great job!")
+                history["Moving Avg %"] = moving_average(history["Percentage"], window)
+                st.line_chart(history.set_index("Date")[["Percentage", "Moving Avg %"]], color=["#667eea", "#f59e0b"])
+            st.dataframe(history.style.format({"Percentage": "{:.2f}%", "Moving Avg %": "{:.2f}%"}),
+                         hide_index=True, width="stretch")
         
-        with col_analysis2:
-            st.markdown("### 📚 Personalized Recommendations")
-            for subject, recommendation in analysis['recommendations'].items():
-                st.markdown(f"""
-                    <div class="recommendation">
-                        <strong>{subject}</strong>
-                        <p style='margin: 5px 0 0 0; color: #444;'>{recommendation}</p>
-                    </div>
-                """, unsafe_allow_html=True)
+        st.markdown("### 🏫 Class Monthly Averages")
+        monthly = trends.monthly_means()
+        if len(monthly) < 2:
+            st.info("📅 Class trends appear once assessments span at least two months.")
+        else:
+            monthly["Moving Avg %"] = moving_average(monthly["Overall %"], window)
+            st.line_chart(monthly)
+        st.dataframe(monthly.rename_axis("Month").reset_index().style.format(precision=2, subset=list(monthly.columns)),
+                     hide_index=True, width="stretch")
+    
+    # TAB 4: Rankings & Achievements
+    with tab4, profiler.stage("tab:rankings"), section.lock.read():
+        st.markdown("<h2 style='text-align:center; color:#444;'>🏆 Rankings & Achievements</h2>", unsafe_allow_html=True)
         
-        # Improvement Potential
-        st.markdown("### 🚀 Predicted Improvement Potential")
-        st.markdown("*Based on current performance and AI analysis*")
+        store = st.session_state.students
+        rankings = store.rankings
+        col_rank1, col_rank2 = st.columns(2)
+        with col_rank1:
+            top_n = st.slider("Show Top", 3, 50, 10, key="top_n")
+        with col_rank2:
+            rank_method = st.radio("Tie Handling", ["Competition (1, 2, 2, 4)", "Dense (1, 2, 2, 3)"],
+                                   horizontal=True, key="rank_method")
+        dense = rank_method.startswith("Dense")
         
-        potential_df = pd.DataFrame([
-            {
-                'Subject': subject,
-                'Current': student['marks'][subject],
-                'Potential': analysis['improvement_potential'][subject],
-                'Gain': analysis['improvement_potential'][subject] - student['marks'][subject]
-            }
-            for subject in student['marks'].keys()
-        ])
+        st.markdown("### 🥇 Overall Leaderboard")
+        def leaderboard():
+            board = ranking_table(store, rankings.overall, top_n, dense, "Percentage")
+            board["Grade"] = [store.get(store.find(roll))["grade"] for roll in board["Roll No"]]
+            return board
+        overall_board = derived_view("overall_board", leaderboard, top_n, dense)
+        st.dataframe(overall_board.style.format({"Percentage": "{:.2f}%"}), hide_index=True, width="stretch")
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        x = np.arange(len(potential_df))
-        width = 0.35
+        col_top1, col_top2 = st.columns(2)
+        with col_top1:
+            st.markdown("### 📚 Subject Toppers")
+            ranked_subject = st.selectbox("Subject", list(rankings.subjects), key="ranked_subject")
+            st.dataframe(ranking_table(store, rankings.subjects[ranked_subject], top_n, dense, "Marks"),
+                         hide_index=True, width="stretch")
         
-        bars1 = ax.bar(x - width/2, potential_df['Current'], width, label='Current Marks', 
-                      color='#3b82f6', alpha=0.8, edgecolor='black', linewidth=1.5)
-        bars2 = ax.bar(x + width/2, potential_df['Potential'], width, label='Predicted Potential',
-                       
-                      color='#10b981', alpha=0.8, edgecolor='black', linewidth=1.5)
-        
-        # Add value labels on bars
-        for bar in bars1 + bars2:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom', fontweight='bold', fontsize=10)
-            
-        ax.set_xticks(x)
-        ax.set_xticklabels(potential_df['Subject'], fontsize=10, fontweight='bold')
-        ax.set_ylabel("Marks", fontsize=12, fontweight='bold')
-        ax.set_title(f"{student['name']}'s Improvement Potential", fontsize=14, fontweight='bold')
-        ax.legend(loc='upper right')
-        ax.grid(axis="y", linestyle="--", alpha=0.3)
-        ax.set_ylim(0, 110)
-        plt.tight_layout()
-        st.pyplot(fig)
-    # TAB 2: Class Analytics
-    with tab2:  
-        st.markdown("<h2 style='text-align:center; color:#444;'>📊 Class-wide Analytics</h2>", unsafe_allow_html=True)
-        st.info("This section is under development. Stay tuned for upcoming features!")
+        with col_top2:
+            st.markdown("### 🏅 Badge Leaderboard")
+            badge_board = pd.DataFrame(list(rankings.badge_summary().items()), columns=["Badge", "Holders"])
+            st.dataframe(badge_board, hide_index=True, width="stretch")
+            st.markdown("**Most Decorated**")
+            st.dataframe(ranking_table(store, rankings.badge_counts, top_n, dense, "Badges"),
+                         hide_index=True, width="stretch")
         
+        st.markdown("### 🎖️ Badge Holders")
+        chosen_badge = st.selectbox("Badge", list(rankings.badge_holders), key="chosen_badge")
+        holders = ranking_table(store, rankings.badge_holders[chosen_badge], top_n, dense, "Percentage")
+        if holders.empty:
+            st.info(f"No student holds {chosen_badge} yet.")
+        else:
+            st.dataframe(holders.style.format({"Percentage": "{:.2f}%"}), hide_index=True, width="stretch")
+
+# Debug / Profiling, last so it sees every stage of this rerun
+with st.sidebar.expander("🐞 Debug / Profiling", expanded=False):
+    st.checkbox("Enable profiling", value=profiler.enabled, key="profiling",
+                help="Time each stage of every rerun; applies from the next rerun")
+    if profiler.enabled:
+        snapshot = profiler.snapshot()
+        st.caption(f"Rerun: {snapshot['total_seconds'] * 1000:,.1f} ms"
+                   + (f" · RSS: {snapshot['rss_bytes'] / 2**20:,.0f} MiB" if snapshot["rss_bytes"] else "")
+                   + (f" (peak {snapshot['peak_rss_bytes'] / 2**20:,.0f} MiB)" if snapshot["peak_rss_bytes"] else ""))
+        st.markdown("| Stage | ms |\n|---|---:|\n" + "\n".join(
+            f"| {stage} | {seconds * 1000:,.2f} |" for stage, seconds in snapshot["stages"].items()
+        ))
+        st.markdown("| Cache | Entries | Hits | Misses | This rerun |\n|---|---:|---:|---:|---|\n" + "\n".join(
+            f"| {name} | {stats['entries']:,} | {stats['hits']:,} | {stats['misses']:,} "
+            f"| {stats['run_hits']} hit / {stats['run_misses']} miss |"
+            for name, stats in snapshot["caches"].items()
+        ))
+        if PROFILE_LOG_PATH:
+            append_json_log(PROFILE_LOG_PATH, snapshot)
+        if PROFILE_PROM_PATH:
+            write_prometheus(PROFILE_PROM_PATH, snapshot)
+
 
 
 
@@ -0,0 +1,26 @@
+"""Core (Streamlit-free) building blocks for the report card system"""
+from reportcard.analysis import BatchAnalysis, analyze_batch, improvement_potential
+from reportcard.grading import GradingScheme, grading_scheme
+from reportcard.report import (
+    build_report,
+    calculate_grade,
+    calculate_improvement_potential,
+    export_report_data,
+    generate_performance_analysis,
+)
+from reportcard.store import CONDUCT_OPTIONS, StudentStore
+
+__all__ = [
+    "BatchAnalysis",
+    "CONDUCT_OPTIONS",
+    "GradingScheme",
+    "StudentStore",
+    "analyze_batch",
+    "build_report",
+    "calculate_grade",
+    "calculate_improvement_potential",
+    "export_report_data",
+    "generate_performance_analysis",
+    "grading_scheme",
+    "improvement_potential",
+]
@@ -0,0 +1,7 @@
+"""``python -m reportcard``: command-line batch grading"""
+import sys
+
+from reportcard.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Incrementally maintained class-wide statistics"""
+import numpy as np
+
+from reportcard.grading import GRADES
+
+# Marks are whole numbers 0-100, so a 101-bin histogram answers median,
+# percentiles and threshold rates exactly in O(101).
+BINS = 101
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class RunningStats:
+    """Welford running mean/variance that also supports removal"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    def add_many(self, values):
+        """Merge a whole array in one step (Chan et al. parallel update)"""
+        values = np.asarray(values, dtype=np.float64)
+        n_b = values.size
+        if n_b == 0:
+            return
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+
+    def merge(self, other):
+        """Fold in another RunningStats (same Chan et al. update)"""
+        if other.count == 0:
+            return
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += other.m2 + delta * delta * n_a * n_b / n
+        self.count = n
+
+    @property
+    def std(self):
+        """Population standard deviation, like np.std"""
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+def histogram_quantile(hist, q):
+    """Linear-interpolated quantile (np.percentile's default) from a histogram"""
+    cumulative = np.cumsum(hist)
+    n = cumulative[-1]
+    if n == 0:
+        return float("nan")
+    position = (n - 1) * q
+    lo = int(np.floor(position))
+    hi = int(np.ceil(position))
+    v_lo = np.searchsorted(cumulative, lo, side="right")
+    v_hi = np.searchsorted(cumulative, hi, side="right")
+    return float(v_lo + (v_hi - v_lo) * (position - lo))
+
+
+def _rate_at_least(hist, threshold):
+    n = hist.sum()
+    if n == 0:
+        return 0.0
+    threshold = min(max(int(np.ceil(threshold)), 0), BINS)
+    return float(hist[threshold:].sum() / n * 100)
+
+
+class _Series:
+    """Running stats plus a 0-100 histogram for one column of values"""
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.hist = np.zeros(BINS, dtype=np.int64)
+
+    def add(self, value, bucket):
+        self.stats.add(value)
+        self.hist[bucket] += 1
+
+    def remove(self, value, bucket):
+        self.stats.remove(value)
+        self.hist[bucket] -= 1
+
+    def add_many(self, values, buckets):
+        self.stats.add_many(values)
+        self.hist += np.bincount(buckets, minlength=BINS)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.hist += other.hist
+
+    def summary(self, passing, excellence):
+        row = {
+            "Students": self.stats.count,
+            "Mean": self.stats.mean,
+            "Std Dev": self.stats.std,
+        }
+        for p in PERCENTILES:
+            label = "Median" if p == 50 else f"P{p}"
+            row[label] = histogram_quantile(self.hist, p / 100)
+        row["Pass Rate %"] = _rate_at_least(self.hist, passing)
+        row["Excellence Rate %"] = _rate_at_least(self.hist, excellence)
+        return row
+
+
+def _bucket(percentage):
+    return np.clip(np.floor(percentage), 0, BINS - 1).astype(np.int64)
+
+
+class ClassAggregates:
+    """Per-subject and overall statistics kept up to date on every change
+
+    Each student contributes their subject marks, overall percentage and
+    grade. ``add``/``remove`` are O(subjects); ``summary`` is
+    O(subjects x 101) no matter how many students are in the class.
+    Percentages are histogrammed by whole percent, so overall percentiles
+    are exact to the percent while mean, std and threshold rates are exact.
+    """
+
+    def __init__(self):
+        self.subjects = {}
+        self.overall = _Series()
+        self.grades = np.zeros(len(GRADES), dtype=np.int64)
+
+    def __len__(self):
+        return self.overall.stats.count
+
+    def _subject(self, subject):
+        series = self.subjects.get(subject)
+        if series is None:
+            series = self.subjects[subject] = _Series()
+        return series
+
+    def add(self, subjects, marks, percentage, grade):
+        """Count one student (``grade`` is a code into the store's grades)"""
+        for subject, mark in zip(subjects, marks):
+            self._subject(subject).add(mark, mark)
+        self.overall.add(percentage, _bucket(percentage))
+        self._grow_grades(grade + 1)
+        self.grades[grade] += 1
+
+    def remove(self, subjects, marks, percentage, grade):
+        """Un-count a student previously passed to ``add``"""
+        for subject, mark in zip(subjects, marks):
+            self.subjects[subject].remove(mark, mark)
+        self.overall.remove(percentage, _bucket(percentage))
+        self.grades[grade] -= 1
+
+    def add_batch(self, subjects, marks, percentages, grades):
+        """Count many students that share one subject layout"""
+        marks = np.asarray(marks)
+        if marks.shape[0] == 0:
+            return
+        for j, subject in enumerate(subjects):
+            self._subject(subject).add_many(marks[:, j], marks[:, j].astype(np.int64))
+        self.overall.add_many(percentages, _bucket(percentages))
+        counts = np.bincount(np.asarray(grades, dtype=np.int64), minlength=len(self.grades))
+        self._grow_grades(len(counts))
+        self.grades += counts
+
+    def merge(self, other, codes=None):
+        """Fold another class's statistics into these in O(subjects x 101)
+
+        ``codes`` maps ``other``'s grade codes to codes into this instance's
+        grades, for classes whose stores interned grades differently; by
+        default the codes are taken to agree.
+        """
+        for subject, series in other.subjects.items():
+            self._subject(subject).merge(series)
+        self.overall.merge(other.overall)
+        codes = np.arange(len(other.grades)) if codes is None else np.asarray(codes, dtype=np.int64)[:len(other.grades)]
+        if len(codes):
+            self._grow_grades(int(codes.max()) + 1)
+            np.add.at(self.grades, codes, other.grades[:len(codes)])
+
+    def _grow_grades(self, size):
+        if size > len(self.grades):
+            self.grades = np.concatenate([self.grades, np.zeros(size - len(self.grades), dtype=np.int64)])
+
+    def subject_summary(self, passing, excellence):
+        """One summary row per subject, in first-seen order"""
+        return [
+            {"Subject": subject, **series.summary(passing, excellence)}
+            for subject, series in self.subjects.items()
+            if series.stats.count
+        ]
+
+    def overall_summary(self, passing, excellence):
+        """Summary row over the students' overall percentages"""
+        return self.overall.summary(passing, excellence)
+
+    def grade_distribution(self, grades=GRADES, order=None):
+        """Student count per letter grade
+
+        ``grades`` are the ``(grade, colour)`` pairs the codes refer to.
+        Grades named in ``order`` come first, in that order, even when no
+        student has them; any other grade in use follows. By default the
+        order is ``grades`` best first.
+        """
+        counts = {}
+        for (grade, _), count in zip(grades, self.grades.tolist()):
+            counts[grade] = counts.get(grade, 0) + count
+        if order is None:
+            order = [grade for grade, _ in reversed(grades)]
+        distribution = {grade: counts.pop(grade, 0) for grade in order}
+        distribution.update((grade, count) for grade, count in counts.items() if count)
+        return distribution
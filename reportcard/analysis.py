@@ -0,0 +1,125 @@
+"""Vectorized performance analysis over a whole class at once"""
+import numpy as np
+
+from reportcard.grading import DEFAULT_SCHEME
+
+CONSISTENCY_BADGE = "⚖️ Consistency Champion"
+PERFECT_BADGE = "💯 Perfect Score"
+ALL_ROUNDER_BADGE = "🌟 All-Rounder"
+CONSISTENCY_CHAMPION_STD = 8
+ALL_ROUNDER_MARK = 75
+
+
+def improvement_potential(marks, scheme=DEFAULT_SCHEME):
+    """Predicted next-assessment marks for every cell of a marks matrix"""
+    return scheme.improvement_potential(marks)
+
+
+def analyze_batch(marks, subjects, percentages=None, scheme=DEFAULT_SCHEME):
+    """Analyse a (students x subjects) marks matrix in one vectorized pass"""
+    marks = np.asarray(marks)
+    if marks.ndim == 1:
+        marks = marks.reshape(1, -1)
+    subjects = tuple(subjects)
+    if marks.shape[1] != len(subjects):
+        raise ValueError(f"marks has {marks.shape[1]} columns but {len(subjects)} subjects were given")
+
+    if percentages is None:
+        max_possible = len(subjects) * 100
+        percentages = (marks.sum(axis=1) / max_possible) * 100
+    else:
+        percentages = np.asarray(percentages, dtype=np.float64).reshape(-1)
+
+    return BatchAnalysis(marks, subjects, percentages, scheme)
+
+
+class BatchAnalysis:
+    """Analysis results for a whole class, stored column-wise
+
+    Every attribute is an array with one row per student, so aggregate
+    questions ("how many Gold Medalists?") never touch Python dicts.
+    Use ``student(i)`` to get the classic per-student analysis dict.
+    """
+
+    def __init__(self, marks, subjects, percentages, scheme=DEFAULT_SCHEME):
+        self.marks = marks
+        self.subjects = subjects
+        self.percentages = percentages
+        self.scheme = scheme
+
+        # Calculate statistics
+        self.avg_marks = marks.mean(axis=1)
+        self.std_dev = marks.std(axis=1)
+        self.max_mark = marks.max(axis=1)
+        self.min_mark = marks.min(axis=1)
+
+        # Identify strengths and weaknesses
+        avg = self.avg_marks[:, None]
+        half_std = self.std_dev[:, None] / 2
+        self.strengths = marks >= avg + half_std
+        self.weaknesses = marks < avg - half_std
+        self.consistent = ~(self.strengths | self.weaknesses)
+
+        # Band indexes into the threshold tables
+        self.category = scheme.category.codes(percentages)
+        self.medal = scheme.medal.codes(percentages)
+        self.consistency = scheme.consistency.codes(self.std_dev)
+        self.recommendation = scheme.recommendation.codes(marks)
+
+        # Achievement badges (medal is tracked separately above)
+        self.consistency_champion = self.std_dev < CONSISTENCY_CHAMPION_STD
+        self.perfect_score = self.max_mark == 100
+        self.all_rounder = (marks >= ALL_ROUNDER_MARK).all(axis=1)
+
+        # Predicted improvement
+        self.improvement_potential = scheme.improvement_potential(marks)
+
+    def __len__(self):
+        return self.marks.shape[0]
+
+    def badges(self, i):
+        """Badge list for student ``i`` in display order"""
+        badges = []
+        medal = self.scheme.medal.labels[self.medal[i]]
+        if medal:
+            badges.append(medal)
+        if self.consistency_champion[i]:
+            badges.append(CONSISTENCY_BADGE)
+        if self.perfect_score[i]:
+            badges.append(PERFECT_BADGE)
+        if self.all_rounder[i]:
+            badges.append(ALL_ROUNDER_BADGE)
+        return badges
+
+    def student(self, i):
+        """Per-student analysis dict, identical to generate_performance_analysis"""
+        subjects = self.subjects
+        recommendations = self.scheme.recommendation.labels
+        row = self.marks[i].tolist()
+        strong = self.strengths[i].tolist()
+        weak = self.weaknesses[i].tolist()
+        category, comment, emoji = self.scheme.category.labels[self.category[i]]
+        consistency_note, consistency_color = self.scheme.consistency.labels[self.consistency[i]]
+
+        return {
+            "performance_category": category,
+            "overall_comment": comment,
+            "emoji": emoji,
+            "strengths": {s: m for s, m, f in zip(subjects, row, strong) if f},
+            "weaknesses": {s: m for s, m, f in zip(subjects, row, weak) if f},
+            "consistent": {s: m for s, m, a, b in zip(subjects, row, strong, weak) if not (a or b)},
+            "recommendations": {s: recommendations[r] for s, r in zip(subjects, self.recommendation[i].tolist())},
+            "consistency_note": consistency_note,
+            "consistency_color": consistency_color,
+            "avg_marks": self.avg_marks[i],
+            "std_dev": self.std_dev[i],
+            "max_mark": self.max_mark[i].item(),
+            "min_mark": self.min_mark[i].item(),
+            "badges": self.badges(i),
+            "improvement_potential": dict(zip(subjects, self.improvement_potential[i].tolist())),
+        }
+
+    def students(self):
+        """Iterate over every per-student analysis dict"""
+        for i in range(len(self)):
+            yield self.student(i)
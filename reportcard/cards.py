@@ -0,0 +1,373 @@
+"""Standalone report cards (static HTML or PDF) and parallel batch export"""
+import base64
+import io
+import multiprocessing
+import os
+import re
+import textwrap
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from reportcard.charts import potential_chart, radar_chart, render, subject_bar_chart
+from reportcard.grading import DEFAULT_SCHEME
+
+# Exported charts are smaller than the on-screen ones
+EXPORT_DPI = 100
+
+FORMATS = ("html", "pdf")
+
+
+# ---- HTML ---------------------------------------------------------------
+
+def progress_color(mark):
+    """Colour of a subject progress bar"""
+    return DEFAULT_SCHEME.progress_color(mark)
+
+
+def header_html(student):
+    return f"""
+        <div class="report-card">
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div>
+                    <h2 style='margin: 0; color: #667eea;'>👤 {student['name']}</h2>
+                    <p style='margin: 5px 0; color: #666;'>🎟️ Roll No: {student['roll_no']} | 📅 {student['assessment_date']}</p>
+                </div>
+                <div style='text-align: right;'>
+                    <h1 style='margin: 0; color: {student['grade_color']}; font-size: 3em;'>{student['grade']}</h1>
+                    <p style='margin: 0; color: #666;'>Grade</p>
+                </div>
+            </div>
+        </div>
+    """
+
+
+def metric_cards(student):
+    """``(value, label, caption, colour)`` for the five key metrics"""
+    avg_mark = sum(student['marks'].values()) / len(student['marks'])
+    return [
+        (student['total_marks'], "Total Marks", f"out of {student['max_possible']}", "#667eea"),
+        (f"{student['percentage']:.2f}%", "Percentage", "Overall Score", "#22c55e"),
+        (f"{student['attendance']}%", "Attendance", "Class Presence", "#f59e0b"),
+        (student['conduct'], "Conduct", "Behavior Rating", "#8b5cf6"),
+        (f"{avg_mark:.1f}", "Average", "Per Subject", "#ec4899"),
+    ]
+
+
+def metric_card_html(value, label, caption, color):
+    return f"""
+        <div class="metric-card">
+            <h3 style='color: {color}; margin: 0;'>{value}</h3>
+            <p style='color: #666; margin: 5px 0;'>{label}</p>
+            <small style='color: #999;'>{caption}</small>
+        </div>
+    """
+
+
+def insight_html(analysis):
+    return f"""
+        <div class="insight-box">
+            <h2 style='margin-top: 0;'>🤖 AI Performance Analysis</h2>
+            <h3>{analysis['emoji']} Performance Level: {analysis['performance_category']}</h3>
+            <p style='font-size: 1.1em;'>{analysis['overall_comment']}</p>
+            <div style='margin-top: 15px;'>
+                <strong>📊 Statistics:</strong>
+                Average: {analysis['avg_marks']:.1f} |
+                Highest: {analysis['max_mark']} |
+                Lowest: {analysis['min_mark']} |
+                Std Dev: {analysis['std_dev']:.2f}
+            </div>
+            <div style='margin-top: 10px;'>
+                <strong>⚖️ Consistency:</strong>
+                <span style='color: {analysis['consistency_color']}; font-weight: bold;'>
+                    {analysis['consistency_note']}
+                </span>
+            </div>
+        </div>
+    """
+
+
+def badges_html(analysis):
+    badges = "".join([f'<span class="achievement-badge">{badge}</span>' for badge in analysis['badges']])
+    return f'<div style="text-align: center; margin: 20px 0;">{badges}</div>'
+
+
+def progress_bar_html(subject, mark):
+    return f"""
+        <div style="margin: 15px 0;">
+            <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                <strong>{subject}</strong>
+                <strong>{mark}/100</strong>
+            </div>
+            <div class="progress-bar-container">
+                <div class="progress-bar" style="width: {mark}%; background: {progress_color(mark)};">
+                    {mark}%
+                </div>
+            </div>
+        </div>
+    """
+
+
+def strength_html(subject, mark):
+    return f"""
+        <div class="strength">
+            <strong>✨ {subject}:</strong> {mark}/100
+            <p style='margin: 5px 0 0 0; color: #666;'>Excellent performance! Keep it up.</p>
+        </div>
+    """
+
+
+def weakness_html(subject, mark):
+    return f"""
+        <div class="weakness">
+            <strong>📌 {subject}:</strong> {mark}/100
+            <p style='margin: 5px 0 0 0; color: #666;'>Needs focused attention and practice.</p>
+        </div>
+    """
+
+
+def recommendation_html(subject, recommendation):
+    return f"""
+        <div class="recommendation">
+            <strong>{subject}</strong>
+            <p style='margin: 5px 0 0 0; color: #444;'>{recommendation}</p>
+        </div>
+    """
+
+
+_NOTICE_COLORS = {
+    "info": ("rgba(28, 131, 225, 0.1)", "#004280"),
+    "success": ("rgba(33, 195, 84, 0.1)", "#177233"),
+}
+
+
+def notice_html(message, kind="info"):
+    """Static stand-in for st.info / st.success"""
+    background, color = _NOTICE_COLORS[kind]
+    return f"<div style='background: {background}; color: {color}; padding: 16px; border-radius: 8px;'>{message}</div>"
+
+
+def row_html(*columns):
+    """Equal-width columns, like st.columns"""
+    cells = "".join(f"<div style='flex: 1; min-width: 0;'>{column}</div>" for column in columns)
+    return f"<div style='display: flex; gap: 16px;'>{cells}</div>"
+
+
+def compact_html(html):
+    """Strip indentation and blank lines
+
+    Markdown ends a raw HTML block at the first blank line, so a fragment
+    must not contain one to reach the browser as a single block.
+    """
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+def summary_html(student, analysis):
+    """Header, metric cards, insight box and badges as one fragment"""
+    badges = f"<h3>🏅 Achievement Badges</h3>{badges_html(analysis)}" if analysis['badges'] else ""
+    return compact_html(
+        header_html(student)
+        + row_html(*(metric_card_html(*metric) for metric in metric_cards(student)))
+        + "<br>"
+        + insight_html(analysis)
+        + badges
+    )
+
+
+def breakdown_html(student, analysis):
+    """Progress bars, strengths, weaknesses and recommendations as one fragment"""
+    strengths = "".join(strength_html(s, m) for s, m in analysis['strengths'].items()) or \
+        notice_html("💡 Focus on building strengths by excelling in your best subjects.")
+    weaknesses = "".join(weakness_html(s, m) for s, m in analysis['weaknesses'].items()) or \
+        notice_html("🎉 No significant weaknesses identified! Great job!", "success")
+    recommendations = "".join(recommendation_html(s, r) for s, r in analysis['recommendations'].items())
+    return compact_html(
+        "<h3>📈 Subject-wise Performance Breakdown</h3>"
+        + "".join(progress_bar_html(s, m) for s, m in student['marks'].items())
+        + row_html(
+            f"<h3>💪 Strengths</h3>{strengths}<h3>⚠️ Areas for Improvement</h3>{weaknesses}",
+            f"<h3>📚 Personalized Recommendations</h3>{recommendations}",
+        )
+        + "<h3>🚀 Predicted Improvement Potential</h3>"
+        + "<p><em>Based on current performance and AI analysis</em></p>"
+    )
+
+
+def _image_html(png, alt):
+    data = base64.b64encode(png).decode("ascii")
+    return f'<img alt="{alt}" style="width: 100%;" src="data:image/png;base64,{data}">'
+
+
+def card_document(student, analysis, settings, css=""):
+    """Self-contained HTML page with the same sections as the Individual Reports tab"""
+    charts = {
+        name: _image_html(render(build(), "png", dpi=EXPORT_DPI), name)
+        for name, build in (
+            ("Subject-wise Performance", lambda: subject_bar_chart(student, analysis, settings["passing_percentage"])),
+            ("Performance Radar", lambda: radar_chart(student, analysis)),
+            ("Improvement Potential", lambda: potential_chart(student, analysis)),
+        )
+    }
+    chart_row = row_html(
+        f"<h3>📊 Subject-wise Performance</h3>{charts['Subject-wise Performance']}",
+        f"<h3>🎯 Performance Radar</h3>{charts['Performance Radar']}",
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Report Card - {student['name']} ({student['roll_no']})</title>
+<style>{css}
+body {{ background: #f5f7fa; max-width: 1100px; margin: 0 auto; padding: 20px; }}
+</style>
+</head>
+<body>
+<h1 style='text-align:center; color:#444;'>🎓 {settings.get('class_name', '')} Report Card</h1>
+{summary_html(student, analysis)}
+{chart_row}
+{breakdown_html(student, analysis)}
+{charts['Improvement Potential']}
+</body>
+</html>
+"""
+
+
+# ---- PDF ----------------------------------------------------------------
+
+# The default matplotlib font has no emoji glyphs
+_NON_TEXT = re.compile("[\u2000-\U0010ffff]")
+
+
+def _plain(text):
+    return _NON_TEXT.sub("", str(text)).strip()
+
+
+def card_pdf(student, analysis, settings):
+    """Multi-page PDF: the summary, on as many pages as it needs, then the three charts"""
+    lines = [
+        (f"{_plain(settings.get('class_name', ''))} Report Card", 18, "bold"),
+        (f"{student['name']}   |   Roll No: {student['roll_no']}   |   {student['assessment_date']}", 12, "normal"),
+        (f"Grade {student['grade']}   |   {student['percentage']:.2f}%   |   "
+         f"Total {student['total_marks']}/{student['max_possible']}", 14, "bold"),
+        (f"Attendance {student['attendance']}%   |   Conduct: {student['conduct']}", 11, "normal"),
+        ("", 8, "normal"),
+        (f"Performance Level: {_plain(analysis['performance_category'])}", 13, "bold"),
+        (_plain(analysis['overall_comment']), 11, "normal"),
+        (f"Average {analysis['avg_marks']:.1f} | Highest {analysis['max_mark']} | "
+         f"Lowest {analysis['min_mark']} | Std Dev {analysis['std_dev']:.2f}", 11, "normal"),
+        (f"Consistency: {analysis['consistency_note']}", 11, "normal"),
+    ]
+    if analysis['badges']:
+        lines.append(("Badges: " + ", ".join(_plain(badge) for badge in analysis['badges']), 11, "normal"))
+    lines.append(("", 8, "normal"))
+    lines.append(("Subject Marks", 13, "bold"))
+    lines += [(f"{subject}: {mark}/100   (potential {analysis['improvement_potential'][subject]})", 11, "normal")
+              for subject, mark in student['marks'].items()]
+    lines.append(("", 8, "normal"))
+    lines.append(("Recommendations", 13, "bold"))
+    for subject, recommendation in analysis['recommendations'].items():
+        for line in textwrap.wrap(f"{subject}: {_plain(recommendation)}", 90):
+            lines.append((line, 10, "normal"))
+    if student.get('teacher_remarks'):
+        lines.append(("", 8, "normal"))
+        lines.append(("Teacher's Remarks", 13, "bold"))
+        for paragraph in student['teacher_remarks'].splitlines():
+            lines += [(line, 10, "normal") for line in textwrap.wrap(paragraph, 90) or [""]]
+
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        # Long remarks continue on further pages rather than running off the first
+        page = None
+        for text, size, weight in lines:
+            step = size / 11.69 / 72 * 1.6
+            if page is None or y - step < 0.05:
+                if page is not None:
+                    pdf.savefig(page)
+                    page.clear()
+                page = Figure(figsize=(8.27, 11.69))
+                y = 0.95
+            page.text(0.08, y, text, fontsize=size, fontweight=weight, va="top")
+            y -= step
+        pdf.savefig(page)
+        page.clear()
+        for fig in (subject_bar_chart(student, analysis, settings["passing_percentage"]),
+                    radar_chart(student, analysis),
+                    potential_chart(student, analysis)):
+            pdf.savefig(fig)
+            fig.clear()
+    return buffer.getvalue()
+
+
+# ---- batch export -------------------------------------------------------
+
+_worker_css = ""
+
+
+def _init_worker(css):
+    global _worker_css
+    _worker_css = css
+
+
+def card_filename(student, fmt):
+    safe_name = re.sub(r"[^\w\-]+", "_", student['name']).strip("_") or "student"
+    safe_roll = re.sub(r"[^\w\-]+", "_", str(student['roll_no']))
+    return f"{safe_roll}_{safe_name}.{fmt}"
+
+
+def render_card(student, analysis, settings, fmt):
+    """Render one report card; returns ``(filename, bytes)``"""
+    if fmt == "pdf":
+        data = card_pdf(student, analysis, settings)
+    else:
+        data = card_document(student, analysis, settings, _worker_css).encode("utf-8")
+    return card_filename(student, fmt), data
+
+
+def export_cards(cards, destination, settings, fmt="html", css="", max_workers=None, progress=None, total=None):
+    """Render ``(student, analysis)`` pairs in a process pool into a ZIP file
+
+    At most a few tasks per worker are in flight, and each finished card is
+    written to ``destination`` (a path or binary file object) in input order
+    before more work is submitted, so memory stays flat however many
+    students are exported. Students whose roll number and name give the
+    same file name are told apart by their position in ``cards``. Returns
+    the number of cards written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported report card format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    max_workers = max_workers or multiprocessing.cpu_count()
+    window = max_workers * 4
+    compression = zipfile.ZIP_STORED if fmt == "pdf" else zipfile.ZIP_DEFLATED
+    written = 0
+
+    # Spawned workers import only reportcard, never the Streamlit script,
+    # and avoid forking a multi-threaded server process.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers, mp_context=context, initializer=_init_worker, initargs=(css,)) as pool, \
+            zipfile.ZipFile(destination, "w", compression=compression) as archive:
+        pending = deque()
+        filenames = set()
+
+        def drain(limit):
+            nonlocal written
+            while len(pending) > limit:
+                index, future = pending.popleft()
+                filename, data = future.result()
+                while filename in filenames:
+                    stem, extension = os.path.splitext(filename)
+                    filename = f"{stem}_{index}{extension}"
+                filenames.add(filename)
+                archive.writestr(filename, data)
+                written += 1
+                if progress:
+                    progress(written, total)
+
+        for index, (student, analysis) in enumerate(cards):
+            pending.append((index, pool.submit(render_card, student, analysis, settings, fmt)))
+            drain(window)
+        drain(0)
+    return written
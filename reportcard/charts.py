@@ -0,0 +1,250 @@
+"""Report card charts rendered to image bytes, with an LRU byte-budget cache"""
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, as_completed
+
+import numpy as np
+from matplotlib.figure import Figure
+
+# Same output st.pyplot produces by default
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def subject_bar_chart(student, analysis, passing_percentage):
+    """Subject-wise marks with average and passing lines"""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    subjects = list(student["marks"].keys())
+    marks = list(student["marks"].values())
+    colors = ['#22c55e' if mark >= analysis['avg_marks'] else '#ef4444' for mark in marks]
+    bars = ax.bar(subjects, marks, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+    ax.axhline(y=analysis['avg_marks'], color='#3b82f6', linestyle='--', linewidth=2,
+               label=f'Average: {analysis["avg_marks"]:.1f}')
+    ax.axhline(y=passing_percentage, color='#f59e0b', linestyle=':', linewidth=2,
+               label=f'Passing: {passing_percentage}')
+
+    ax.set_xlabel("Subjects", fontsize=12, fontweight='bold')
+    ax.set_ylabel("Marks", fontsize=12, fontweight='bold')
+    ax.set_title(f"{student['name']}'s Marks Distribution", fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right')
+    ax.grid(axis="y", linestyle="--", alpha=0.3)
+    ax.set_ylim(0, 110)
+    fig.tight_layout()
+    return fig
+
+
+def radar_chart(student, analysis):
+    """Polar plot of every subject against the student's average"""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots(subplot_kw=dict(projection='polar'))
+
+    subjects_list = list(student['marks'].keys())
+    angles = np.linspace(0, 2 * np.pi, len(subjects_list), endpoint=False).tolist()
+    marks_values = [student['marks'][subject] for subject in subjects_list]
+    marks_values += marks_values[:1]
+    angles += angles[:1]
+
+    ax.plot(angles, marks_values, 'o-', linewidth=3, color='#667eea', markersize=8)
+    ax.fill(angles, marks_values, alpha=0.3, color='#764ba2')
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(subjects_list, fontsize=10, fontweight='bold')
+    ax.set_ylim(0, 100)
+    ax.set_title(f"{student['name']}'s Performance Radar",
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(True, linestyle='--', alpha=0.7)
+
+    # Add average circle
+    avg_circle = [analysis['avg_marks']] * (len(angles))
+    ax.plot(angles, avg_circle, linestyle='--', color='#3b82f6', linewidth=2, label='Average')
+    ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
+
+    fig.tight_layout()
+    return fig
+
+
+def potential_chart(student, analysis):
+    """Grouped bars of current marks against predicted potential"""
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    subjects = list(student['marks'].keys())
+    current = [student['marks'][subject] for subject in subjects]
+    potential = [analysis['improvement_potential'][subject] for subject in subjects]
+    x = np.arange(len(subjects))
+    width = 0.35
+
+    bars1 = ax.bar(x - width/2, current, width, label='Current Marks',
+                   color='#3b82f6', alpha=0.8, edgecolor='black', linewidth=1.5)
+    bars2 = ax.bar(x + width/2, potential, width, label='Predicted Potential',
+                   color='#10b981', alpha=0.8, edgecolor='black', linewidth=1.5)
+
+    # Add value labels on bars
+    for bar in bars1 + bars2:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(subjects, fontsize=10, fontweight='bold')
+    ax.set_ylabel("Marks", fontsize=12, fontweight='bold')
+    ax.set_title(f"{student['name']}'s Improvement Potential", fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right')
+    ax.grid(axis="y", linestyle="--", alpha=0.3)
+    ax.set_ylim(0, 110)
+    fig.tight_layout()
+    return fig
+
+
+def render(fig, fmt="png", dpi=None):
+    """Serialise a figure to PNG or SVG bytes and release it"""
+    buffer = io.BytesIO()
+    options = dict(SAVEFIG_OPTIONS, dpi=dpi) if dpi else SAVEFIG_OPTIONS
+    try:
+        fig.savefig(buffer, format=fmt, **options)
+    finally:
+        # Figures are built on matplotlib.figure.Figure, never registered
+        # with pyplot, so clearing drops every artist right away.
+        fig.clear()
+    return buffer.getvalue()
+
+
+def student_key(student, class_settings):
+    """Cache key for a student's charts: roll_no, marks hash and thresholds"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(student["name"].encode())
+    for subject, mark in student["marks"].items():
+        digest.update(f"\x00{subject}\x01{mark}".encode())
+    thresholds = (class_settings["passing_percentage"], class_settings["excellence_threshold"])
+    return student["roll_no"], digest.hexdigest(), thresholds
+
+
+class FigureCache:
+    """Thread-safe LRU cache of rendered chart bytes bounded by total size"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_render(self, key, build, fmt="png"):
+        """Return cached bytes for ``key`` or render ``build()`` and cache it"""
+        data = self.lookup(key, fmt)
+        if data is None:
+            data = render(build(), fmt)
+            self.store(key, data, fmt)
+        return data
+
+    def lookup(self, key, fmt="png"):
+        """Cached bytes for ``key``, or None (counted as a miss)"""
+        key = (key, fmt)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        return None
+
+    def store(self, key, data, fmt="png"):
+        """Cache rendered bytes for ``key``"""
+        key = (key, fmt)
+        with self._lock:
+            if key not in self._entries and len(data) <= self.max_bytes:
+                self._entries[key] = data
+                self.bytes += len(data)
+                self._evict()
+
+    def resize(self, max_bytes):
+        """Change the byte budget, evicting as needed"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            _, data = self._entries.popitem(last=False)
+            self.bytes -= len(data)
+
+
+class ChartJobs:
+    """One script run's charts, rendered on a shared thread pool
+
+    ``submit`` returns at once with a Future: already resolved when the
+    chart is cached, otherwise rendering on ``executor`` and then cached.
+    ``wait`` hands each chart to ``show(target, data)`` in completion
+    order, so the page fills in chart by chart while the rest of it is
+    already on screen. ``cancel`` drops charts that have not started and
+    makes started ones skip serialising. ``wait`` calls it on the way out;
+    callers should also call it if the run is interrupted before ``wait``
+    (the viewer moving to another student), so the old student's charts
+    stop rendering either way.
+    """
+
+    def __init__(self, cache, executor):
+        self.cache = cache
+        self.executor = executor
+        self.seconds = {}
+        self._jobs = []
+        self._cancelled = threading.Event()
+
+    def submit(self, name, key, build, target, fmt="png"):
+        data = self.cache.lookup(key, fmt)
+        if data is not None:
+            future = Future()
+            future.set_result(data)
+        else:
+            future = self.executor.submit(self._render, name, key, build, fmt)
+        self._jobs.append((future, target))
+        return future
+
+    def _render(self, name, key, build, fmt):
+        started = time.perf_counter()
+        if self._cancelled.is_set():
+            raise CancelledError()
+        fig = build()
+        if self._cancelled.is_set():
+            fig.clear()
+            raise CancelledError()
+        data = render(fig, fmt)
+        self.cache.store(key, data, fmt)
+        self.seconds[name] = time.perf_counter() - started
+        return data
+
+    def wait(self, show):
+        """Show every chart as it completes, then cancel anything left"""
+        targets = dict(self._jobs)
+        try:
+            for future in as_completed(targets):
+                if self._cancelled.is_set():
+                    break
+                show(targets[future], future.result())
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        self._cancelled.set()
+        for future, _ in self._jobs:
+            future.cancel()
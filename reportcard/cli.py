@@ -0,0 +1,246 @@
+"""Command-line batch grading: files in, one graded NDJSON report per student out
+
+    python -m reportcard marks/ graded.ndjson.gz --compression gzip --workers 8
+
+Each output line is the report dict the app stores, plus its
+``analysis`` (generate_performance_analysis) and ``passed`` /
+``excellent`` flags for the class thresholds.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from reportcard.analysis import analyze_batch
+from reportcard.grading import DEFAULT_GRADE_SCALE, format_grade_scale, grading_scheme, parse_grade_scale
+from reportcard.profiling import peak_rss_bytes
+from reportcard.store import CONDUCT_OPTIONS
+
+STAGES = ("read", "analyze", "encode", "write")
+
+
+class GradingRun:
+    """Counters and per-stage seconds for one batch run
+
+    ``analyze`` and ``encode`` run in the workers, so their seconds are
+    summed CPU-side and can exceed the wall-clock time.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.rows_read = 0
+        self.graded = 0
+        self.rejected = []
+        self.rejected_count = 0
+        self.passed = 0
+        self.excellent = 0
+        self.grades = {}
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.seconds = 0.0
+
+    @property
+    def students_per_second(self):
+        return self.graded / self.seconds if self.seconds else 0.0
+
+
+def grade_chunk(subjects, marks, columns, grade_scale, passing, excellence):
+    """Analyse and encode one validated chunk; runs in a worker process
+
+    Returns ``(ndjson_bytes, passed, excellent, analyze_seconds, encode_seconds)``.
+    """
+    from reportcard.export import json_encoder
+
+    started = time.perf_counter()
+    scheme = grading_scheme(grade_scale, passing)
+    percentages = np.asarray(columns["percentage"], dtype=np.float64)
+    batch = analyze_batch(marks, subjects, percentages, scheme)
+    analyses = list(batch.students())
+    analyzed = time.perf_counter()
+
+    encode = json_encoder()
+    count = len(percentages)
+    grades = scheme.grade.labels
+    total_marks = np.broadcast_to(columns["total_marks"], count).tolist()
+    max_possible = np.broadcast_to(columns["max_possible"], count).tolist()
+    attendance = np.asarray(columns["attendance"]).astype(np.int64).tolist()
+    conduct = np.asarray(columns["conduct"]).astype(np.int64).tolist()
+    dates = np.asarray(columns["assessment_date"], dtype="datetime64[D]").astype(str).tolist()
+    timestamps = np.datetime_as_string(
+        np.broadcast_to(np.asarray(columns["timestamp"], dtype="datetime64[s]"), count), unit="s"
+    ).tolist()
+    codes = np.asarray(columns["grade"]).tolist()
+    passed = percentages >= passing
+    excellent = percentages >= excellence
+
+    lines = []
+    for j, analysis in enumerate(analyses):
+        grade, grade_color = grades[codes[j]]
+        analysis["avg_marks"] = float(analysis["avg_marks"])
+        analysis["std_dev"] = float(analysis["std_dev"])
+        lines.append(encode({
+            "name": columns["name"][j],
+            "roll_no": columns["roll_no"][j],
+            "marks": dict(zip(subjects, marks[j].tolist())),
+            "total_marks": total_marks[j],
+            "max_possible": max_possible[j],
+            "percentage": percentages[j].item(),
+            "grade": grade,
+            "grade_color": grade_color,
+            "assessment_date": dates[j],
+            "attendance": attendance[j],
+            "conduct": CONDUCT_OPTIONS[conduct[j]],
+            "teacher_remarks": columns["teacher_remarks"][j],
+            "timestamp": timestamps[j].replace("T", " "),
+            "analysis": analysis,
+            "passed": bool(passed[j]),
+            "excellent": bool(excellent[j]),
+        }))
+    data = b"\n".join(lines) + b"\n" if lines else b""
+    return data, int(passed.sum()), int(excellent.sum()), analyzed - started, time.perf_counter() - analyzed
+
+
+def input_files(path):
+    """``path`` itself, or every supported file under a directory, sorted"""
+    from reportcard.ingest import FORMATS
+
+    if not os.path.isdir(path):
+        return [path]
+    files = [
+        name for name in glob.glob(os.path.join(path, "**", "*"), recursive=True)
+        if os.path.splitext(name)[1].lower() in FORMATS
+    ]
+    return sorted(files)
+
+
+def peak_memory_mib():
+    """``(this process, largest worker)`` peak RSS in MiB, or None where unsupported"""
+    return tuple(None if peak is None else peak / 2**20
+                 for peak in (peak_rss_bytes(), peak_rss_bytes(children=True)))
+
+
+def grade_files(paths, destination, grade_scale=DEFAULT_GRADE_SCALE, passing=40, excellence=85,
+                max_workers=None, chunksize=5000, compression=None, progress=None):
+    """Grade every row of ``paths`` into ``destination`` and return a GradingRun
+
+    Chunks are read and validated here, analysed and encoded in a spawned
+    process pool, and written in input order with at most a few chunks
+    per worker in flight, so memory stays flat however large the input.
+    """
+    from reportcard.export import open_output
+    from reportcard.ingest import ImportReport, iter_prepared
+
+    grade_scale = tuple(grade_scale)
+    scheme = grading_scheme(grade_scale, passing)
+    max_workers = max_workers or multiprocessing.cpu_count()
+    window = max_workers * 4
+    run = GradingRun()
+    started = time.perf_counter()
+
+    context = multiprocessing.get_context("spawn")
+    output = open_output(destination, compression)
+    try:
+        with ProcessPoolExecutor(max_workers, mp_context=context) as pool:
+            pending = deque()
+
+            def drain(limit):
+                while len(pending) > limit:
+                    data, passed, excellent, analyze_seconds, encode_seconds = pending.popleft().result()
+                    tick = time.perf_counter()
+                    output.write(data)
+                    run.stages["write"] += time.perf_counter() - tick
+                    run.stages["analyze"] += analyze_seconds
+                    run.stages["encode"] += encode_seconds
+                    run.passed += passed
+                    run.excellent += excellent
+                    if progress:
+                        progress(run)
+
+            for path in paths:
+                report = ImportReport()
+                chunks = iter_prepared(path, chunksize=chunksize, scheme=scheme, report=report)
+                while True:
+                    tick = time.perf_counter()
+                    chunk = next(chunks, None)
+                    run.stages["read"] += time.perf_counter() - tick
+                    if chunk is None:
+                        break
+                    subjects, marks, columns = chunk
+                    run.graded += len(marks)
+                    for code, count in zip(*np.unique(columns["grade"], return_counts=True)):
+                        grade = scheme.grade.labels[code][0]
+                        run.grades[grade] = run.grades.get(grade, 0) + int(count)
+                    pending.append(pool.submit(grade_chunk, subjects, marks, columns, grade_scale, passing, excellence))
+                    drain(window)
+                run.files += 1
+                run.rows_read += report.rows_read
+                run.rejected_count += report.rejected_count
+                run.rejected.extend((path, row, reason) for row, reason in report.rejected)
+            drain(0)
+    finally:
+        if output is not destination:
+            output.close()
+    run.seconds = time.perf_counter() - started
+    return run
+
+
+def print_summary(run, scheme, out=sys.stdout):
+    parent_mib, worker_mib = peak_memory_mib()
+    print(f"Graded {run.graded:,} of {run.rows_read:,} rows from {run.files:,} file(s) "
+          f"in {run.seconds:,.2f} s ({run.students_per_second:,.0f} students/sec)", file=out)
+    if run.rejected_count:
+        print(f"Rejected {run.rejected_count:,} rows", file=out)
+    print(f"Passed {run.passed:,}, excellent {run.excellent:,}", file=out)
+    print("\nGrade distribution:", file=out)
+    order = scheme.grade_names() + [grade for grade in run.grades if grade not in scheme.grade_names()]
+    for grade in order:
+        print(f"  {grade:<8}{run.grades.get(grade, 0):>12,}", file=out)
+    print("\nStage timings (analyze/encode summed over workers):", file=out)
+    for stage in STAGES:
+        print(f"  {stage:<8}{run.stages[stage]:>10,.2f} s", file=out)
+    if parent_mib is not None:
+        print(f"\nPeak memory: {parent_mib:,.0f} MiB main process, {worker_mib:,.0f} MiB largest worker", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reportcard", description="Grade student marks files in bulk")
+    parser.add_argument("input", help="CSV, Excel or Parquet file, or a directory of them")
+    parser.add_argument("output", help="NDJSON file to write")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default=None)
+    parser.add_argument("--passing", type=float, default=40, help="passing percentage")
+    parser.add_argument("--excellence", type=float, default=85, help="excellence threshold")
+    parser.add_argument("--grading-scale", default=format_grade_scale(DEFAULT_GRADE_SCALE),
+                        help="GRADE:MINIMUM pairs, best first")
+    parser.add_argument("--rejects", default=None, help="write rejected rows to this CSV file")
+    args = parser.parse_args(argv)
+
+    try:
+        grade_scale = parse_grade_scale(args.grading_scale)
+    except ValueError as exc:
+        parser.error(f"--grading-scale: {exc}")
+    paths = input_files(args.input)
+    if not paths:
+        parser.error(f"no CSV, Excel or Parquet files found in {args.input}")
+
+    try:
+        run = grade_files(paths, args.output, grade_scale, args.passing, args.excellence,
+                          max_workers=args.workers, chunksize=args.chunksize, compression=args.compression)
+    except (ValueError, ImportError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.rejects:
+        import csv
+        with open(args.rejects, "w", newline="") as rejects:
+            writer = csv.writer(rejects)
+            writer.writerow(["file", "row", "reason"])
+            writer.writerows(run.rejected)
+    print_summary(run, grading_scheme(grade_scale, args.passing))
+    return 0
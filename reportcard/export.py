@@ -0,0 +1,171 @@
+"""Streaming bulk export of student reports to NDJSON, CSV or Parquet"""
+import gzip
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from reportcard.store import CONDUCT_OPTIONS, MISSING
+
+FORMATS = ("ndjson", "csv", "parquet")
+COMPRESSIONS = (None, "gzip", "zstd")
+EXTENSIONS = {"ndjson": ".ndjson", "csv": ".csv", "parquet": ".parquet", "gzip": ".gz", "zstd": ".zst"}
+
+_CONDUCT_LABELS = np.array(CONDUCT_OPTIONS, dtype=object)
+
+
+def json_encoder():
+    """Fastest available ``obj -> bytes`` JSON encoder (orjson if installed)"""
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return orjson.dumps
+
+
+def filter_rows(store, grades=None, min_percentage=None, max_percentage=None, latest_only=True):
+    """Row ids matching the filters, computed on the store's columns"""
+    rows = store.current_rows() if latest_only else np.arange(len(store))
+    rows.sort()
+    keep = np.ones(len(rows), dtype=bool)
+    if grades:
+        codes = [code for code, (grade, _) in enumerate(store.grades) if grade in grades]
+        keep &= np.isin(store.column("grade")[rows], codes)
+    percentage = store.column("percentage")[rows]
+    if min_percentage is not None:
+        keep &= percentage >= min_percentage
+    if max_percentage is not None:
+        keep &= percentage <= max_percentage
+    return rows[keep]
+
+
+def _chunks(rows, chunk_size):
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+def iter_ndjson(store, rows, chunk_size=2000, encoder=None):
+    """Yield NDJSON bytes, one chunk of ``chunk_size`` reports at a time
+
+    Each line has the same fields as export_report_data, without the
+    pretty-printing.
+    """
+    encoder = encoder or json_encoder()
+    for chunk in _chunks(rows, chunk_size):
+        yield b"".join(encoder(store.get(i)) + b"\n" for i in chunk.tolist())
+
+
+def frame_chunk(store, rows, subjects):
+    """One chunk of reports as a wide DataFrame, built straight from the columns"""
+    frame = pd.DataFrame({
+        "name": [store.column("name")[i] for i in rows.tolist()],
+        "roll_no": [store.column("roll_no")[i] for i in rows.tolist()],
+    })
+    for subject in subjects:
+        marks = store.subject_column(subject)[rows]
+        frame[subject] = pd.Series(marks, dtype="Int16").mask(marks == MISSING)
+    grade = store.column("grade")[rows]
+    grade_labels = np.array([label for label, _ in store.grades], dtype=object)
+    grade_colors = np.array([color for _, color in store.grades], dtype=object)
+    frame["total_marks"] = store.column("total_marks")[rows]
+    frame["max_possible"] = store.column("max_possible")[rows]
+    frame["percentage"] = store.column("percentage")[rows]
+    frame["grade"] = grade_labels[grade]
+    frame["grade_color"] = grade_colors[grade]
+    frame["assessment_date"] = store.column("assessment_date")[rows].astype(str)
+    frame["attendance"] = store.column("attendance")[rows]
+    frame["conduct"] = _CONDUCT_LABELS[store.column("conduct")[rows]]
+    frame["teacher_remarks"] = [store.column("teacher_remarks")[i] for i in rows.tolist()]
+    frame["timestamp"] = np.datetime_as_string(store.column("timestamp")[rows], unit="s")
+    frame["timestamp"] = frame["timestamp"].str.replace("T", " ", regex=False)
+    return frame
+
+
+def _subjects_in(store, rows):
+    """Subjects assessed for at least one of ``rows``, in first-seen order"""
+    return [subject for subject in store.subjects if (store.subject_column(subject)[rows] != MISSING).any()]
+
+
+def iter_csv(store, rows, chunk_size=5000):
+    """Yield CSV bytes, header first, one chunk at a time"""
+    subjects = _subjects_in(store, rows)
+    header = True
+    for chunk in _chunks(rows, chunk_size):
+        buffer = io.StringIO()
+        frame_chunk(store, chunk, subjects).to_csv(buffer, index=False, header=header)
+        header = False
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_parquet(store, rows, destination, chunk_size=20000):
+    """Write reports to Parquet one row group per chunk"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from exc
+
+    subjects = _subjects_in(store, rows)
+    writer = None
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            table = pa.Table.from_pandas(frame_chunk(store, chunk, subjects), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(destination, table.schema, compression="zstd")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def open_output(destination, compression=None):
+    """Binary writer for ``destination``, optionally gzip/zstd compressed"""
+    if compression is None:
+        return open(destination, "wb") if isinstance(destination, str) else destination
+    if compression == "gzip":
+        return gzip.open(destination, "wb", compresslevel=6) if isinstance(destination, str) \
+            else gzip.GzipFile(fileobj=destination, mode="wb", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError("zstd compression requires zstandard (pip install zstandard)") from exc
+        raw = open(destination, "wb") if isinstance(destination, str) else destination
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=isinstance(destination, str))
+    raise ValueError(f"Unsupported compression '{compression}'")
+
+
+def export_students(store, destination, fmt="ndjson", rows=None, compression=None, chunk_size=None):
+    """Stream ``rows`` (default: latest report per roll_no) to ``destination``
+
+    ``destination`` is a path or a binary file object. Parquet applies its
+    own internal compression and ignores ``compression``. Returns the number
+    of reports written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    if rows is None:
+        rows = filter_rows(store)
+    rows = np.asarray(rows, dtype=np.int64)
+
+    if fmt == "parquet":
+        write_parquet(store, rows, destination, **({"chunk_size": chunk_size} if chunk_size else {}))
+        return len(rows)
+
+    chunks = iter_ndjson if fmt == "ndjson" else iter_csv
+    output = open_output(destination, compression)
+    try:
+        for data in chunks(store, rows, **({"chunk_size": chunk_size} if chunk_size else {})):
+            output.write(data)
+    finally:
+        if output is not destination:
+            output.close()
+    return len(rows)
+
+
+def export_filename(fmt, compression=None):
+    name = "students" + EXTENSIONS[fmt]
+    if compression and fmt != "parquet":
+        name += EXTENSIONS[compression]
+    return name
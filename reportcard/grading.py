@@ -0,0 +1,255 @@
+"""Table-driven grading: every threshold ladder as a precomputed lookup"""
+import math
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+# Threshold tables: ascending lower bounds, one label row per band.
+# Band i covers bins[i-1] <= value < bins[i], which is exactly what the
+# original `>=` if/elif ladders did from the top down.
+CATEGORY_BINS = [40, 50, 60, 75, 85]
+CATEGORIES = [
+    ("🚨 Critical", "Immediate intervention required. Let's work together on a recovery plan.", "🆘"),
+    ("⚠️ Needs Improvement", "Requires focused effort. Don't lose hope, improvement is possible!", "📖"),
+    ("📚 Satisfactory", "Satisfactory results. More dedication needed for improvement.", "💪"),
+    ("👍 Good", "Good performance. Focus on consistency for even better results.", "📈"),
+    ("⭐ Excellent", "Excellent work! Keep maintaining this momentum.", "🎯"),
+    ("🏆 Exceptional", "Outstanding performance! You're among the top performers.", "🌟"),
+]
+
+MEDAL_BINS = [70, 80, 90]
+MEDALS = [None, "🥉 Bronze Performer", "🥈 Silver Achiever", "🥇 Gold Medalist"]
+
+RECOMMENDATION_BINS = [40, 50, 60, 70, 80, 90]
+RECOMMENDATIONS = [
+    "🆘 Urgent intervention needed. One-on-one coaching recommended.",
+    "🚨 Critical! Immediate focus required with teacher support.",
+    "⚠️ Needs attention. Consider group study or tutoring.",
+    "📖 Decent foundation. Practice 45 mins daily for improvement.",
+    "✍️ Good work! Focus on mastering complex concepts.",
+    "📚 Excellent! Aim for perfection with targeted practice.",
+    "🎓 Outstanding! Consider advanced topics or mentoring peers.",
+]
+
+# Consistency bands are upper bounds on the standard deviation
+CONSISTENCY_BINS = [8, 15]
+CONSISTENCY = [
+    ("Highly consistent across all subjects", "#22c55e"),
+    ("Moderate variation in performance", "#f59e0b"),
+    ("High variation - balance needed", "#ef4444"),
+]
+
+GRADE_BINS = [40, 50, 60, 70, 80, 90]
+GRADES = [
+    ("F", "#991b1b"),
+    ("D", "#ef4444"),
+    ("C", "#f97316"),
+    ("B", "#f59e0b"),
+    ("B+", "#eab308"),
+    ("A", "#84cc16"),
+    ("A+", "#22c55e"),
+]
+
+# Default scale as the settings hold it: (grade, minimum percentage), best first
+DEFAULT_GRADE_SCALE = tuple(
+    (grade, bound) for (grade, _), bound in zip(reversed(GRADES), [*reversed(GRADE_BINS), 0])
+)
+# Custom scales take their colours from here, best grade first: passing
+# grades are spread over the passing colours, failing grades all get the
+# failing colour
+GRADE_COLORS = [color for _, color in reversed(GRADES)]
+PASSING_COLORS = GRADE_COLORS[:-1]
+FAILING_COLOR = GRADE_COLORS[-1]
+DEFAULT_PASSING = GRADE_BINS[0]
+
+POTENTIAL_BINS = [50, 70, 85]
+POTENTIAL_GAIN = np.array([20, 15, 10, 5])
+POTENTIAL_CAP = np.array([75, 85, 95, 100])
+
+PROGRESS_BINS = [50, 60, 70, 85]
+PROGRESS_COLORS = ["#ef4444", "#f97316", "#f59e0b", "#84cc16", "#22c55e"]
+
+# Percentage lookups have one slot per 0.01 from 0 to 100.01
+STEPS = 10001
+_EDGES = np.arange(STEPS + 1) / 100
+
+
+class ThresholdTable:
+    """One threshold ladder precomputed as lookup arrays
+
+    ``codes`` gives the same band index as ``np.digitize(values, bins)``.
+    Integer marks 0-100 index a 101-slot table directly. Percentages index
+    a table with one slot per 0.01; the slot is then checked against the
+    exact slot edges, so float rounding in ``value * 100`` never moves a
+    value across a threshold. Bins that are not multiples of 0.01, and
+    values outside 0-100, fall back to a binary search. NaN falls in the
+    lowest band.
+    """
+
+    def __init__(self, bins, labels):
+        if len(labels) != len(bins) + 1:
+            raise ValueError(f"{len(bins)} bins need {len(bins) + 1} labels, got {len(labels)}")
+        self.bins = tuple(bins)
+        self.labels = list(labels)
+        self._marks = np.digitize(np.arange(101), self.bins).astype(np.intp)
+        self._mark_list = self._marks.tolist()
+        self._on_grid = all(round(b * 100) / 100 == b for b in self.bins)
+        self._percent = np.digitize(_EDGES[:STEPS], self.bins).astype(np.intp)
+        self._percent_list = self._percent.tolist()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def code(self, value):
+        """Band index of one mark or percentage"""
+        if isinstance(value, (int, np.integer)) and 0 <= value <= 100:
+            return self._mark_list[value]
+        if self._on_grid and 0 <= value <= 100:
+            k = math.floor(value * 100)
+            if value < _EDGES[k]:
+                k -= 1
+            elif value >= _EDGES[k + 1]:
+                k += 1
+            return self._percent_list[k]
+        if value != value:
+            return 0
+        return bisect_right(self.bins, value)
+
+    def codes(self, values):
+        """Band index of every element of ``values``"""
+        values = np.asarray(values)
+        if values.dtype.kind in "iub":
+            if values.size == 0 or (values.min() >= 0 and values.max() <= 100):
+                return self._marks[values]
+        elif self._on_grid and values.size and values.min() >= 0 and values.max() <= 100:
+            k = np.floor(values * 100).astype(np.intp)
+            k -= values < _EDGES[k]
+            k += values >= _EDGES[k + 1]
+            return self._percent[k]
+        codes = np.digitize(values, self.bins)
+        if values.dtype.kind == "f":
+            codes[np.isnan(values)] = 0
+        return codes
+
+    def label(self, value):
+        """Label of the band ``value`` falls in"""
+        return self.labels[self.code(value)]
+
+
+def parse_grade_scale(text):
+    """Parse ``"A+:90, A:80, ..., F:0"`` into a validated grade scale"""
+    scale = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        grade, sep, bound = item.rpartition(":")
+        grade = grade.strip()
+        if not sep or not grade:
+            raise ValueError(f"'{item.strip()}' is not in GRADE:MINIMUM form")
+        try:
+            bound = float(bound)
+        except ValueError:
+            raise ValueError(f"'{bound.strip()}' is not a number") from None
+        scale.append((grade, int(bound) if bound.is_integer() else bound))
+    return validate_grade_scale(scale)
+
+
+def validate_grade_scale(scale):
+    """Check a ``(grade, minimum)`` scale and return it as a tuple"""
+    scale = tuple((grade, bound) for grade, bound in scale)
+    if not scale:
+        raise ValueError("A grading scale needs at least one grade")
+    grades = [grade for grade, _ in scale]
+    if len(set(grades)) != len(grades):
+        raise ValueError("Grade names must be unique")
+    bounds = [bound for _, bound in scale]
+    if any(not 0 <= bound <= 100 for bound in bounds):
+        raise ValueError("Grade minimums must be between 0 and 100")
+    if any(high <= low for high, low in zip(bounds, bounds[1:])):
+        raise ValueError("List grades from best to worst with strictly decreasing minimums")
+    return scale
+
+
+def grade_colors(scale, passing=DEFAULT_PASSING):
+    """Colour of each grade of a validated scale, best first
+
+    Grades whose minimum is at least ``passing`` take evenly spaced
+    passing colours, best grade greenest; the rest take the failing
+    colour. The default scale keeps its own colours.
+    """
+    passed = sum(bound >= passing for _, bound in scale)
+    if passed == 1:
+        colors = PASSING_COLORS[:1]
+    else:
+        colors = [PASSING_COLORS[round(i * (len(PASSING_COLORS) - 1) / (passed - 1))] for i in range(passed)]
+    return colors + [FAILING_COLOR] * (len(scale) - passed)
+
+
+def format_grade_scale(scale):
+    return ", ".join(f"{grade}:{bound}" for grade, bound in scale)
+
+
+class GradingScheme:
+    """Every classification the report card makes, as lookup tables
+
+    Only the letter-grade scale is configurable per class; the lowest
+    grade catches everything below the next one up, like the ``else`` of
+    the original ladder. A grade is coloured as a pass when its minimum
+    is at least ``passing``.
+    """
+
+    def __init__(self, grade_scale=DEFAULT_GRADE_SCALE, passing=DEFAULT_PASSING):
+        self.grade_scale = validate_grade_scale(grade_scale)
+        self.passing = passing
+        best_first = list(zip(self.grade_names(), grade_colors(self.grade_scale, passing)))
+        self.grade = ThresholdTable([bound for _, bound in reversed(self.grade_scale[:-1])], best_first[::-1])
+        self.category = ThresholdTable(CATEGORY_BINS, CATEGORIES)
+        self.medal = ThresholdTable(MEDAL_BINS, MEDALS)
+        self.consistency = ThresholdTable(CONSISTENCY_BINS, CONSISTENCY)
+        self.recommendation = ThresholdTable(RECOMMENDATION_BINS, RECOMMENDATIONS)
+        self.potential = ThresholdTable(POTENTIAL_BINS, list(zip(POTENTIAL_GAIN.tolist(), POTENTIAL_CAP.tolist())))
+        self.progress = ThresholdTable(PROGRESS_BINS, PROGRESS_COLORS)
+
+        # Predicted marks for every possible integer mark
+        marks = np.arange(101)
+        band = self.potential.codes(marks)
+        self._potential_marks = np.minimum(marks + POTENTIAL_GAIN[band], POTENTIAL_CAP[band])
+
+    def grade_of(self, percentage):
+        """``(grade, colour)`` for an overall percentage"""
+        return self.grade.label(percentage)
+
+    def grade_names(self):
+        """Grade names, best first"""
+        return [grade for grade, _ in self.grade_scale]
+
+    def progress_color(self, mark):
+        """Colour of a subject progress bar"""
+        return self.progress.label(mark)
+
+    def improvement_potential(self, marks):
+        """Predicted next-assessment marks for every cell of a marks matrix"""
+        marks = np.asarray(marks)
+        if marks.dtype.kind in "iu" and (marks.size == 0 or (marks.min() >= 0 and marks.max() <= 100)):
+            return self._potential_marks[marks]
+        band = self.potential.codes(marks)
+        return np.minimum(marks + POTENTIAL_GAIN[band], POTENTIAL_CAP[band])
+
+
+@lru_cache(maxsize=16)
+def _scheme(grade_scale, passing):
+    return GradingScheme(grade_scale, passing)
+
+
+def grading_scheme(grade_scale=None, passing=DEFAULT_PASSING):
+    """Shared GradingScheme for ``grade_scale`` (default scale if None)
+
+    Schemes are memoized by scale and passing percentage, so the tables
+    are built once per pair and a class-settings change simply selects
+    (or builds) another one.
+    """
+    return _scheme(validate_grade_scale(grade_scale or DEFAULT_GRADE_SCALE), passing)
+
+
+DEFAULT_SCHEME = grading_scheme()
@@ -0,0 +1,239 @@
+"""Chunked bulk import of student marks from CSV, Excel or Parquet files"""
+import os
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from reportcard.grading import DEFAULT_SCHEME
+from reportcard.store import CONDUCT_OPTIONS
+
+# Columns with a fixed meaning; every other column is treated as a subject
+REQUIRED_FIELDS = ("name", "roll_no")
+OPTIONAL_FIELDS = ("assessment_date", "attendance", "conduct", "teacher_remarks")
+
+# Defaults mirror the sidebar form
+DEFAULT_ATTENDANCE = 85
+DEFAULT_CONDUCT = "Good"
+
+FORMATS = {
+    ".csv": "csv",
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+# Rejected rows beyond this many are counted but not kept
+MAX_REJECTIONS_KEPT = 1000
+
+_CONDUCT_CODES = {conduct: code for code, conduct in enumerate(CONDUCT_OPTIONS)}
+
+
+class ImportReport:
+    """Outcome of one bulk import"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rejected_count = 0
+        self.rejected = []
+        self.subjects = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def reject(self, row, reason):
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REJECTIONS_KEPT:
+            self.rejected.append((row, reason))
+
+
+def detect_format(filename):
+    """Guess the file format from its extension"""
+    ext = os.path.splitext(str(filename))[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type '{ext}'. Use CSV, Excel (.xlsx) or Parquet.")
+    return FORMATS[ext]
+
+
+def _normalize(column):
+    """Canonical name for fixed fields; subject headers keep their spelling"""
+    column = str(column).strip()
+    field = column.lower().replace(" ", "_")
+    return field if field in REQUIRED_FIELDS + OPTIONAL_FIELDS else column
+
+
+def _csv_chunks(source, chunksize):
+    yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+
+def _excel_chunks(source, chunksize):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ImportError("Excel import requires openpyxl (pip install openpyxl)") from exc
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) for cell in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(["" if cell is None else str(cell) for cell in row])
+            if len(chunk) == chunksize:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def _parquet_chunks(source, chunksize):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet import requires pyarrow (pip install pyarrow)") from exc
+
+    # Nulls become blanks like empty CSV cells (pandas 3 keeps them as NaN
+    # through astype(str), older versions spell them out)
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+        yield batch.to_pandas().astype(str).replace({"None": "", "nan": "", "NaT": ""}).fillna("")
+
+
+_READERS = {
+    "csv": _csv_chunks,
+    "excel": _excel_chunks,
+    "parquet": _parquet_chunks,
+}
+
+
+def iter_chunks(source, fmt, chunksize=5000):
+    """Yield string DataFrames of at most ``chunksize`` rows with normalized headers"""
+    for chunk in _READERS[fmt](source, chunksize):
+        chunk.columns = [_normalize(column) for column in chunk.columns]
+        yield chunk
+
+
+def _prepare_chunk(chunk, subjects, first_row, report, now, scheme):
+    """Validate one chunk and turn it into columns for StudentStore.extend"""
+    rows = np.arange(first_row, first_row + len(chunk))
+    names = chunk["name"].str.strip()
+    rolls = chunk["roll_no"].str.strip()
+
+    marks = chunk[subjects].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    marks_valid = np.isfinite(marks) & (marks >= 0) & (marks <= 100) & (marks == np.round(marks))
+
+    if "attendance" in chunk:
+        raw = chunk["attendance"].str.strip()
+        attendance = pd.to_numeric(raw.where(raw != "", str(DEFAULT_ATTENDANCE)), errors="coerce").to_numpy()
+    else:
+        attendance = np.full(len(chunk), DEFAULT_ATTENDANCE, dtype=np.float64)
+
+    if "conduct" in chunk:
+        raw = chunk["conduct"].str.strip()
+        conduct = raw.where(raw != "", DEFAULT_CONDUCT).map(_CONDUCT_CODES).to_numpy(dtype=np.float64)
+    else:
+        conduct = np.full(len(chunk), _CONDUCT_CODES[DEFAULT_CONDUCT], dtype=np.float64)
+
+    # Blank dates default to today; the rest are parsed value by value, as
+    # one file may mix "03/02/2024", ISO dates and Excel datetimes
+    dates = np.full(len(chunk), np.datetime64(now.date(), "D"))
+    if "assessment_date" in chunk:
+        raw = chunk["assessment_date"].str.strip()
+        given = (raw != "").to_numpy()
+        if given.any():
+            parsed = pd.to_datetime(raw[given], format="mixed", errors="coerce")
+            dates[given] = parsed.to_numpy().astype("datetime64[D]")
+
+    # First failing check wins as the rejection reason
+    checks = [
+        ((names == "").to_numpy(), "missing name"),
+        ((rolls == "").to_numpy(), "missing roll_no"),
+        (~marks_valid.all(axis=1), "marks must be whole numbers from 0 to 100"),
+        (~(np.isfinite(attendance) & (attendance >= 0) & (attendance <= 100)), "attendance must be 0-100"),
+        (np.isnan(conduct), f"conduct must be one of {', '.join(CONDUCT_OPTIONS)}"),
+        (np.isnat(dates), "invalid assessment_date"),
+    ]
+    reasons = np.select([bad for bad, _ in checks], [reason for _, reason in checks], default="")
+    ok = reasons == ""
+    for row, reason in zip(rows[~ok].tolist(), reasons[~ok].tolist()):
+        report.reject(row, reason)
+
+    # Same arithmetic as the Generate Report button and calculate_grade
+    marks = marks[ok].astype(np.int16)
+    total_marks = marks.sum(axis=1, dtype=np.int64)
+    max_possible = len(subjects) * 100
+    percentage = (total_marks / max_possible) * 100
+
+    remarks = chunk["teacher_remarks"] if "teacher_remarks" in chunk else pd.Series("", index=chunk.index)
+    columns = {
+        "name": names[ok].tolist(),
+        "roll_no": rolls[ok].tolist(),
+        "teacher_remarks": remarks[ok].tolist(),
+        "total_marks": total_marks,
+        "max_possible": max_possible,
+        "percentage": percentage,
+        "grade": scheme.grade.codes(percentage),
+        "attendance": attendance[ok],
+        "conduct": conduct[ok],
+        "assessment_date": dates[ok],
+        "timestamp": np.datetime64(now.replace(microsecond=0), "s"),
+    }
+    return marks, columns
+
+
+def iter_prepared(source, fmt=None, chunksize=5000, scheme=DEFAULT_SCHEME, report=None):
+    """Yield validated ``(subjects, marks, columns)`` chunks of ``source``
+
+    Each chunk is ready for ``StudentStore.extend`` (grades are codes into
+    ``scheme.grade.labels``). Row counts, rejections and the subject list
+    are recorded on ``report``.
+    """
+    if fmt is None:
+        fmt = detect_format(getattr(source, "name", source))
+    report = report if report is not None else ImportReport()
+    now = datetime.now()
+
+    for chunk in iter_chunks(source, fmt, chunksize):
+        if not report.subjects:
+            missing = [field for field in REQUIRED_FIELDS if field not in chunk]
+            if missing:
+                raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+            fixed = set(REQUIRED_FIELDS) | set(OPTIONAL_FIELDS)
+            report.subjects = [column for column in chunk.columns if column not in fixed]
+            if not report.subjects:
+                raise ValueError("No subject columns found")
+
+        first_row = report.rows_read + 1
+        report.rows_read += len(chunk)
+        marks, columns = _prepare_chunk(chunk, report.subjects, first_row, report, now, scheme)
+        report.rows_imported += len(marks)
+        yield report.subjects, marks, columns
+
+
+def import_students(source, store, fmt=None, chunksize=5000, scheme=DEFAULT_SCHEME, lock=None, on_extend=None):
+    """Stream ``source`` into ``store`` chunk by chunk and return an ImportReport
+
+    ``source`` may be a path or a file-like object; pass ``fmt`` ("csv",
+    "excel" or "parquet") when it cannot be inferred from a file name.
+    Grades are assigned with ``scheme`` (a GradingScheme).
+
+    For a shared store pass its ReadWriteLock as ``lock``: chunks are parsed
+    outside it and only added under ``lock.write()``, where
+    ``on_extend(rows)`` is also called with each chunk's new row ids.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    for subjects, marks, columns in iter_prepared(source, fmt, chunksize, scheme, report):
+        with lock.write() if lock else nullcontext():
+            rows = store.extend(subjects, marks, columns, grades=scheme.grade.labels)
+            if on_extend:
+                on_extend(rows)
+    report.seconds = time.perf_counter() - started
+    return report
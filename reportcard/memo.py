@@ -0,0 +1,70 @@
+"""Content-addressed memo cache for results derived from one student report"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# Report fields that never change what is shown for the report
+_IGNORED_FIELDS = ("timestamp",)
+
+
+def content_key(student, class_settings):
+    """Digest of everything a student's derived views depend on
+
+    Two reports with the same marks, details and class settings get the
+    same key whoever filed them and whenever, so their cached analysis and
+    HTML are shared.
+    """
+    fields = {name: value for name, value in student.items() if name not in _IGNORED_FIELDS}
+    payload = json.dumps([fields, class_settings], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class MemoCache:
+    """Thread-safe LRU of computed values keyed by ``(content_key, part)``
+
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, part, compute):
+        """Return the cached ``part`` for ``key`` or store ``compute()``"""
+        key = (key, part)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
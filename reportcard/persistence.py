@@ -0,0 +1,137 @@
+"""SQLite-backed persistent report history"""
+import json
+import sqlite3
+import threading
+
+DEFAULT_PATH = "reports.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    roll_no TEXT NOT NULL,
+    name TEXT NOT NULL,
+    assessment_date TEXT NOT NULL,
+    report TEXT NOT NULL,
+    class_name TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS reports_roll_no ON reports (roll_no);
+"""
+
+# Databases created before reports were filed per class
+_CLASS_INDEX = "CREATE INDEX IF NOT EXISTS reports_class ON reports (class_name, id)"
+
+
+def _row(student, class_name):
+    report = json.dumps(student, separators=(",", ":"), ensure_ascii=False)
+    return student["roll_no"], student["name"], student["assessment_date"], report, class_name
+
+
+def _class_filter(class_name):
+    """WHERE-clause fragment and parameters restricting to one class (or none)"""
+    if class_name is None:
+        return "", ()
+    return " AND class_name = ?", (class_name,)
+
+
+class ReportDB:
+    """Append-mostly store of generated reports, one JSON document per row
+
+    A single connection is shared by every thread (Streamlit runs each
+    session in its own thread), serialised with a lock. Reports are read
+    back with keyset pagination on the rowid so loading page N never has
+    to skip over the N-1 pages before it.
+
+    Every report is filed under a class name; reads take ``class_name``
+    to page through one class on the (class_name, id) index, or None for
+    all classes. Reports saved before classes existed are filed under
+    ``default_class``.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, default_class=""):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(reports)")]
+        if "class_name" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE reports ADD COLUMN class_name TEXT NOT NULL DEFAULT ''")
+                self._conn.execute("UPDATE reports SET class_name = ?", (default_class,))
+        self._conn.execute(_CLASS_INDEX)
+
+    def save(self, student, class_name=""):
+        """Persist one report and return its id"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO reports (roll_no, name, assessment_date, report, class_name) VALUES (?, ?, ?, ?, ?)",
+                _row(student, class_name),
+            )
+            return cursor.lastrowid
+
+    def save_many(self, students, class_name=""):
+        """Persist many reports in a single transaction and return their ids
+
+        Ids are read back row by row, as another process writing to the same
+        file may interleave its own ids with these.
+        """
+        with self._lock, self._conn:
+            return [
+                self._conn.execute(
+                    "INSERT INTO reports (roll_no, name, assessment_date, report, class_name) VALUES (?, ?, ?, ?, ?)",
+                    _row(student, class_name),
+                ).lastrowid
+                for student in students
+            ]
+
+    def class_names(self):
+        """Every class with saved reports, sorted"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT class_name FROM reports ORDER BY class_name").fetchall()
+        return [class_name for class_name, in rows]
+
+    def count(self, class_name=None):
+        where, params = _class_filter(class_name)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM reports WHERE 1{where}", params).fetchone()[0]
+
+    def last_id(self, class_name=None):
+        where, params = _class_filter(class_name)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COALESCE(MAX(id), 0) FROM reports WHERE 1{where}", params
+            ).fetchone()[0]
+
+    def page(self, after_id=0, limit=5000, class_name=None):
+        """Up to ``limit`` reports with id > ``after_id`` as ``(last_id, [(id, report)])``"""
+        where, params = _class_filter(class_name)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, report FROM reports WHERE id > ?{where} ORDER BY id LIMIT ?",
+                (after_id, *params, limit),
+            ).fetchall()
+        if not rows:
+            return after_id, []
+        return rows[-1][0], [(report_id, json.loads(report)) for report_id, report in rows]
+
+    def iter_pages(self, after_id=0, limit=5000, class_name=None):
+        """Yield every remaining page after ``after_id``"""
+        while True:
+            after_id, reports = self.page(after_id, limit, class_name)
+            if not reports:
+                return
+            yield after_id, reports
+
+    def history(self, roll_no, class_name=None):
+        """All saved reports for one roll number, oldest first"""
+        where, params = _class_filter(class_name)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT report FROM reports WHERE roll_no = ?{where} ORDER BY id", (roll_no, *params)
+            ).fetchall()
+        return [json.loads(report) for report, in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
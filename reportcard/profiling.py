@@ -0,0 +1,136 @@
+"""Opt-in per-rerun instrumentation: stage timings, cache counters, RSS"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+
+def peak_rss_bytes(children=False):
+    """Peak resident set size in bytes of this process, or of its largest child; None where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def rss_bytes():
+    """``(current, peak)`` resident set size in bytes; None where unavailable"""
+    current = None
+    try:
+        with open("/proc/self/statm") as statm:
+            current = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    return current, peak_rss_bytes()
+
+
+class Profiler:
+    """Collects named stage timings for one run and snapshots them
+
+    Call ``start_run`` at the top of each rerun, wrap work in
+    ``with profiler.stage(name)``, and ``snapshot`` at the end. Caches
+    registered with ``watch`` report their lifetime hit/miss counters and
+    the hits and misses of this run alone (for a FigureCache, misses are
+    figures rendered). When disabled, ``stage`` is a no-op context.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self._caches = {}
+        self._baseline = {}
+        self._started = 0.0
+
+    def watch(self, name, cache):
+        """Report ``cache.hits``/``cache.misses`` under ``name``"""
+        self._caches[name] = cache
+        self._baseline.setdefault(name, (cache.hits, cache.misses))
+
+    def start_run(self, enabled):
+        self.enabled = enabled
+        self.stages = {}
+        self._baseline = {name: (cache.hits, cache.misses) for name, cache in self._caches.items()}
+        self._started = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager adding the time spent inside it to stage ``name``"""
+        return self._timed(name) if self.enabled else nullcontext()
+
+    def record(self, name, seconds):
+        """Add time measured elsewhere, e.g. on a worker thread, to stage ``name``"""
+        if self.enabled:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def _timed(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def snapshot(self):
+        """Everything measured so far in this run, as plain data"""
+        caches = {}
+        for name, cache in self._caches.items():
+            hits, misses = self._baseline.get(name, (0, 0))
+            caches[name] = {
+                "entries": len(cache),
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "run_hits": cache.hits - hits,
+                "run_misses": cache.misses - misses,
+            }
+        current, peak = rss_bytes()
+        return {
+            "time": time.time(),
+            "total_seconds": time.perf_counter() - self._started,
+            "stages": dict(self.stages),
+            "caches": caches,
+            "rss_bytes": current,
+            "peak_rss_bytes": peak,
+        }
+
+
+def to_json_line(snapshot):
+    return json.dumps(snapshot, separators=(",", ":")) + "\n"
+
+
+def to_prometheus(snapshot, prefix="reportcard"):
+    """Snapshot in the Prometheus text exposition format"""
+    lines = [
+        f"# TYPE {prefix}_rerun_seconds gauge",
+        f"{prefix}_rerun_seconds {snapshot['total_seconds']:.6f}",
+        f"# TYPE {prefix}_stage_seconds gauge",
+    ]
+    lines += [f'{prefix}_stage_seconds{{stage="{stage}"}} {seconds:.6f}'
+              for stage, seconds in snapshot["stages"].items()]
+    for counter in ("hits", "misses"):
+        lines.append(f"# TYPE {prefix}_cache_{counter}_total counter")
+        lines += [f'{prefix}_cache_{counter}_total{{cache="{name}"}} {stats[counter]}'
+                  for name, stats in snapshot["caches"].items()]
+    lines.append(f"# TYPE {prefix}_cache_entries gauge")
+    lines += [f'{prefix}_cache_entries{{cache="{name}"}} {stats["entries"]}'
+              for name, stats in snapshot["caches"].items()]
+    for metric in ("rss_bytes", "peak_rss_bytes"):
+        if snapshot[metric] is not None:
+            lines += [f"# TYPE {prefix}_{metric} gauge", f"{prefix}_{metric} {snapshot[metric]}"]
+    return "\n".join(lines) + "\n"
+
+
+def append_json_log(path, snapshot):
+    """Append one JSON line per run"""
+    with open(path, "a") as log:
+        log.write(to_json_line(snapshot))
+
+
+def write_prometheus(path, snapshot):
+    """Replace ``path`` atomically, for a node_exporter textfile collector"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as metrics:
+        metrics.write(to_prometheus(snapshot))
+    os.replace(tmp, path)
@@ -0,0 +1,205 @@
+"""Incrementally maintained ranking indexes"""
+from bisect import bisect_left, bisect_right, insort
+
+from reportcard.analysis import ALL_ROUNDER_BADGE, CONSISTENCY_BADGE, PERFECT_BADGE
+from reportcard.grading import MEDALS
+
+# Every badge generate_performance_analysis can award, in display order
+ALL_BADGES = [medal for medal in reversed(MEDALS) if medal] + [CONSISTENCY_BADGE, PERFECT_BADGE, ALL_ROUNDER_BADGE]
+
+
+class SortedRanking:
+    """Scores kept in rank order with bisect insertion
+
+    Entries are ``(-score, roll_no)`` tuples in a sorted list, so the top-k
+    is a slice and a competition rank is one bisect. A parallel sorted list
+    of distinct scores gives dense ranks the same way. Bulk loads go through
+    ``add_many``/``remove_many``, which do one O(n) merge or filter instead
+    of an O(n) list shift per student.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._scores = {}
+        self._distinct = []
+        self._distinct_counts = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, roll_no):
+        return roll_no in self._scores
+
+    def add(self, roll_no, score):
+        """Insert or re-score ``roll_no``"""
+        if roll_no in self._scores:
+            self.remove(roll_no)
+        self._scores[roll_no] = score
+        insort(self._keys, (-score, roll_no))
+        count = self._distinct_counts.get(-score, 0)
+        if count == 0:
+            insort(self._distinct, -score)
+        self._distinct_counts[-score] = count + 1
+
+    def remove(self, roll_no):
+        score = self._scores.pop(roll_no, None)
+        if score is None:
+            return
+        del self._keys[bisect_left(self._keys, (-score, roll_no))]
+        count = self._distinct_counts[-score] - 1
+        if count == 0:
+            del self._distinct_counts[-score]
+            del self._distinct[bisect_left(self._distinct, -score)]
+        else:
+            self._distinct_counts[-score] = count
+
+    def add_many(self, items):
+        """Insert ``(roll_no, score)`` pairs (later pairs win) in one merge"""
+        latest = dict(items)
+        self.remove_many([roll_no for roll_no in latest if roll_no in self._scores])
+        counts = self._distinct_counts
+        for roll_no, score in latest.items():
+            self._scores[roll_no] = score
+            counts[-score] = counts.get(-score, 0) + 1
+        self._keys.extend((-score, roll_no) for roll_no, score in latest.items())
+        self._keys.sort()
+        self._distinct = sorted(counts)
+
+    def remove_many(self, roll_nos):
+        """Remove many entries with a single pass over the index"""
+        stale = set()
+        for roll_no in roll_nos:
+            score = self._scores.pop(roll_no, None)
+            if score is not None:
+                stale.add((-score, roll_no))
+                self._distinct_counts[-score] -= 1
+        if not stale:
+            return
+        self._keys = [key for key in self._keys if key not in stale]
+        for neg, _ in stale:
+            if self._distinct_counts.get(neg) == 0:
+                del self._distinct_counts[neg]
+        self._distinct = sorted(self._distinct_counts)
+
+    def score(self, roll_no):
+        return self._scores.get(roll_no)
+
+    def competition_rank(self, score):
+        """1 + number of entries scoring strictly higher (1, 2, 2, 4)"""
+        return bisect_left(self._keys, (-score,)) + 1
+
+    def dense_rank(self, score):
+        """1 + number of distinct higher scores (1, 2, 2, 3)"""
+        return bisect_left(self._distinct, -score) + 1
+
+    def rank_of(self, roll_no, dense=False):
+        score = self._scores.get(roll_no)
+        if score is None:
+            return None
+        return self.dense_rank(score) if dense else self.competition_rank(score)
+
+    def span(self, low=None, high=None):
+        """``(start, stop)`` positions of the entries scoring low..high inclusive
+
+        An empty range (``low`` above ``high``) gives ``start == stop``.
+        """
+        start = 0 if high is None else bisect_left(self._keys, -high, key=lambda key: key[0])
+        stop = len(self._keys) if low is None else bisect_right(self._keys, -low, key=lambda key: key[0])
+        return start, max(start, stop)
+
+    def rolls(self, start=0, stop=None):
+        """Iterate roll numbers at rank positions start..stop, best first"""
+        keys = self._keys
+        stop = len(keys) if stop is None else min(stop, len(keys))
+        return (keys[i][1] for i in range(start, stop))
+
+    def top(self, k, offset=0):
+        """``(competition_rank, dense_rank, roll_no, score)`` for ranks offset..offset+k"""
+        return [
+            (self.competition_rank(-neg), self.dense_rank(-neg), roll_no, -neg)
+            for neg, roll_no in self._keys[offset:offset + k]
+        ]
+
+
+class Rankings:
+    """Overall, per-subject and badge rankings over the latest report per roll_no"""
+
+    def __init__(self):
+        self.overall = SortedRanking()
+        self.subjects = {}
+        self.badge_counts = SortedRanking()
+        self.badge_holders = {badge: SortedRanking() for badge in ALL_BADGES}
+        self._entries = {}
+
+    def __len__(self):
+        return len(self.overall)
+
+    def add(self, roll_no, percentage, marks, badges):
+        """Index a student's latest report, replacing any earlier one"""
+        self.remove(roll_no)
+        self._entries[roll_no] = (tuple(marks), badges)
+        self.overall.add(roll_no, percentage)
+        for subject, mark in marks.items():
+            ranking = self.subjects.get(subject)
+            if ranking is None:
+                ranking = self.subjects[subject] = SortedRanking()
+            ranking.add(roll_no, mark)
+        self.badge_counts.add(roll_no, len(badges))
+        for badge in badges:
+            self.badge_holders[badge].add(roll_no, percentage)
+
+    def remove(self, roll_no):
+        entry = self._entries.pop(roll_no, None)
+        if entry is None:
+            return
+        subjects, badges = entry
+        self.overall.remove(roll_no)
+        for subject in subjects:
+            self.subjects[subject].remove(roll_no)
+        self.badge_counts.remove(roll_no)
+        for badge in badges:
+            self.badge_holders[badge].remove(roll_no)
+
+    def add_many(self, entries):
+        """Bulk version of ``add`` for ``(roll_no, percentage, marks, badges)`` tuples"""
+        latest = {roll_no: (percentage, marks, badges) for roll_no, percentage, marks, badges in entries}
+        self.remove_many([roll_no for roll_no in latest if roll_no in self._entries])
+
+        subjects, holders = {}, {}
+        for roll_no, (percentage, marks, badges) in latest.items():
+            self._entries[roll_no] = (tuple(marks), badges)
+            for subject, mark in marks.items():
+                subjects.setdefault(subject, []).append((roll_no, mark))
+            for badge in badges:
+                holders.setdefault(badge, []).append((roll_no, percentage))
+
+        self.overall.add_many((roll_no, entry[0]) for roll_no, entry in latest.items())
+        for subject, items in subjects.items():
+            ranking = self.subjects.get(subject)
+            if ranking is None:
+                ranking = self.subjects[subject] = SortedRanking()
+            ranking.add_many(items)
+        self.badge_counts.add_many((roll_no, len(entry[2])) for roll_no, entry in latest.items())
+        for badge, items in holders.items():
+            self.badge_holders[badge].add_many(items)
+
+    def remove_many(self, roll_nos):
+        subjects, holders = {}, {}
+        for roll_no in roll_nos:
+            entry = self._entries.pop(roll_no, None)
+            if entry is None:
+                continue
+            for subject in entry[0]:
+                subjects.setdefault(subject, []).append(roll_no)
+            for badge in entry[1]:
+                holders.setdefault(badge, []).append(roll_no)
+        self.overall.remove_many(roll_nos)
+        self.badge_counts.remove_many(roll_nos)
+        for subject, rolls in subjects.items():
+            self.subjects[subject].remove_many(rolls)
+        for badge, rolls in holders.items():
+            self.badge_holders[badge].remove_many(rolls)
+
+    def badge_summary(self):
+        """Number of holders per badge"""
+        return {badge: len(holders) for badge, holders in self.badge_holders.items()}
@@ -0,0 +1,56 @@
+"""Per-student report API: build, grade, analyse and export one report dict"""
+import json
+from datetime import datetime
+
+from reportcard.analysis import analyze_batch, improvement_potential
+from reportcard.grading import DEFAULT_SCHEME
+
+
+def calculate_grade(percentage, scheme=DEFAULT_SCHEME):
+    """Calculate letter grade based on percentage"""
+    return scheme.grade_of(percentage)
+
+
+def generate_performance_analysis(student_data, scheme=DEFAULT_SCHEME):
+    """Generate intelligent insights and recommendations based on student performance"""
+    marks = student_data['marks']
+    batch = analyze_batch([list(marks.values())], marks.keys(), [student_data['percentage']], scheme)
+    return batch.student(0)
+
+
+def calculate_improvement_potential(marks, avg_marks=None, scheme=DEFAULT_SCHEME):
+    """Calculate potential for improvement in next assessment"""
+    return dict(zip(marks.keys(), improvement_potential(list(marks.values()), scheme).tolist()))
+
+
+def export_report_data(student):
+    """Export student report as JSON"""
+    return json.dumps(student, indent=2)
+
+
+def build_report(name, roll_no, marks, assessment_date, attendance=85, conduct="Good",
+                 teacher_remarks="", max_possible=None, scheme=DEFAULT_SCHEME, timestamp=None):
+    """The report dict the Generate Report button stores
+
+    ``max_possible`` defaults to 100 per subject in ``marks``.
+    """
+    total_marks = sum(marks.values())
+    if max_possible is None:
+        max_possible = len(marks) * 100
+    percentage = (total_marks / max_possible) * 100
+    grade, grade_color = calculate_grade(percentage, scheme)
+    return {
+        "name": name,
+        "roll_no": roll_no,
+        "marks": marks,
+        "total_marks": total_marks,
+        "max_possible": max_possible,
+        "percentage": percentage,
+        "grade": grade,
+        "grade_color": grade_color,
+        "assessment_date": str(assessment_date),
+        "attendance": attendance,
+        "conduct": conduct,
+        "teacher_remarks": teacher_remarks,
+        "timestamp": (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
+    }
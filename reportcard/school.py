@@ -0,0 +1,150 @@
+"""Students partitioned by class/section, one store per class"""
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from reportcard.aggregates import ClassAggregates
+from reportcard.grading import DEFAULT_GRADE_SCALE
+from reportcard.store import StudentStore
+
+DEFAULT_CLASS = "Class 10-A"
+
+
+def default_settings(class_name=DEFAULT_CLASS):
+    """Settings a new class starts with"""
+    return {
+        "passing_percentage": 40,
+        "excellence_threshold": 85,
+        "class_name": class_name,
+        "grading_scale": DEFAULT_GRADE_SCALE
+    }
+
+
+class ReadWriteLock:
+    """Any number of readers or a single writer
+
+    Writers are preferred: once one is waiting no new reader gets in, so a
+    steady stream of reruns cannot starve an append. Not reentrant; never
+    take ``read`` while already holding this lock.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class ClassSection:
+    """One class: its settings, its StudentStore and how much history it has loaded
+
+    ``saved_ids`` and ``history_cursor`` track which saved reports are
+    already in ``store``, so paging in history never duplicates a report
+    generated since. ``loaded`` stays False until the first page of
+    history has been read.
+
+    A section may be shared by every session in the process: mutate
+    ``store`` (and the history bookkeeping) only under ``lock.write()``
+    and read it under ``lock.read()``. ``store.version`` tells a session
+    whether anything changed since it last looked.
+    """
+
+    def __init__(self, name, settings=None):
+        self.name = name
+        self.settings = settings or default_settings(name)
+        self.store = StudentStore()
+        self.saved_ids = set()
+        self.history_cursor = 0
+        self.loaded = False
+        self.lock = ReadWriteLock()
+
+    def __len__(self):
+        return len(self.store)
+
+
+class School:
+    """Every known class, each sharded into its own store
+
+    Classes are created empty and cheap; a caller loads a class's history
+    only when it is selected. ``rollup`` merges the per-class running
+    aggregates (O(classes x subjects x 101)) rather than rescanning any
+    student, so it only covers classes whose history is loaded.
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def names(self):
+        """Class names, sorted"""
+        return sorted(self.sections)
+
+    def section(self, name):
+        """The ClassSection called ``name``, created empty if new"""
+        section = self.sections.get(name)
+        if section is None:
+            with self._lock:
+                section = self.sections.setdefault(name, ClassSection(name))
+        return section
+
+    def loaded(self):
+        """Sections whose history is loaded, in name order"""
+        return [self.sections[name] for name in self.names() if self.sections[name].loaded]
+
+    def rollup(self, passing, excellence):
+        """``(class_rows, combined, grades)`` across every loaded class
+
+        ``class_rows`` holds one overall_summary row per class with students,
+        ``combined`` is a ClassAggregates merged from all of them and
+        ``grades`` the ``(grade, colour)`` pairs its grade codes index.
+        Classes are read one at a time in name order, each under its own
+        read lock only; call this without holding any section's lock.
+        """
+        combined = ClassAggregates()
+        grade_index = {}
+        rows = []
+        for section in self.loaded():
+            store = section.store
+            with section.lock.read():
+                if not len(store.aggregates):
+                    continue
+                rows.append({"Class": section.name, **store.aggregates.overall_summary(passing, excellence)})
+                codes = [grade_index.setdefault(grade, len(grade_index)) for grade in store.grades]
+                combined.merge(store.aggregates, np.array(codes, dtype=np.int64))
+        return rows, combined, list(grade_index)
@@ -0,0 +1,156 @@
+"""Indexed student search: inverted indexes plus percentage range queries"""
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+
+PAGE_SIZE = 25
+
+
+class SearchIndex:
+    """Roll numbers indexed by grade, performance category, badge and weak subject
+
+    Each index maps a value to the set of roll numbers whose latest report
+    has it, so "grade D or F and weak in Physics" is a union and an
+    intersection of small sets. Names are kept in a casefolded sorted list
+    for prefix search. Maintained like Rankings: a new report for a roll
+    number replaces its old entries.
+    """
+
+    def __init__(self):
+        self.grades = {}
+        self.categories = {}
+        self.badges = {}
+        self.weak_subjects = {}
+        self._names = []
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _index(self, roll_no, entry):
+        self._entries[roll_no] = entry
+        _, grade, category, badges, weak_subjects = entry
+        self.grades.setdefault(grade, set()).add(roll_no)
+        self.categories.setdefault(category, set()).add(roll_no)
+        for badge in badges:
+            self.badges.setdefault(badge, set()).add(roll_no)
+        for subject in weak_subjects:
+            self.weak_subjects.setdefault(subject, set()).add(roll_no)
+
+    def _unindex(self, roll_no):
+        entry = self._entries.pop(roll_no, None)
+        if entry is None:
+            return None
+        name, grade, category, badges, weak_subjects = entry
+        self.grades[grade].discard(roll_no)
+        self.categories[category].discard(roll_no)
+        for badge in badges:
+            self.badges[badge].discard(roll_no)
+        for subject in weak_subjects:
+            self.weak_subjects[subject].discard(roll_no)
+        return name
+
+    def add(self, roll_no, name, grade, category, badges, weak_subjects):
+        """Index a student's latest report, replacing any earlier one"""
+        self.remove(roll_no)
+        self._index(roll_no, (name, grade, category, tuple(badges), tuple(weak_subjects)))
+        insort(self._names, (name.casefold(), roll_no))
+
+    def remove(self, roll_no):
+        name = self._unindex(roll_no)
+        if name is not None:
+            del self._names[bisect_left(self._names, (name.casefold(), roll_no))]
+
+    def add_many(self, entries):
+        """Bulk ``add`` of ``(roll_no, name, grade, category, badges, weak_subjects)`` tuples"""
+        latest = {entry[0]: entry[1:] for entry in entries}
+        self.remove_many([roll_no for roll_no in latest if roll_no in self._entries])
+        for roll_no, (name, grade, category, badges, weak_subjects) in latest.items():
+            self._index(roll_no, (name, grade, category, tuple(badges), tuple(weak_subjects)))
+        self._names.extend((entry[0].casefold(), roll_no) for roll_no, entry in latest.items())
+        self._names.sort()
+
+    def remove_many(self, roll_nos):
+        """Remove many entries with a single pass over the name list"""
+        stale = set()
+        for roll_no in roll_nos:
+            name = self._unindex(roll_no)
+            if name is not None:
+                stale.add((name.casefold(), roll_no))
+        if stale:
+            self._names = [key for key in self._names if key not in stale]
+
+    def matching(self, grades=(), categories=(), badges=(), weak_in=()):
+        """Roll numbers matching every given filter, or None if none is given
+
+        Values within one filter are alternatives (grade D *or* F); the
+        filters themselves must all hold.
+        """
+        result = None
+        for index, values in ((self.grades, grades), (self.categories, categories),
+                              (self.badges, badges), (self.weak_subjects, weak_in)):
+            if not values:
+                continue
+            found = set().union(*(index.get(value, ()) for value in values))
+            result = found if result is None else result & found
+            if not result:
+                break
+        return result
+
+    def find_text(self, text):
+        """Roll numbers whose name starts with ``text`` (any case) or whose roll number is ``text``"""
+        prefix = text.strip().casefold()
+        found = set()
+        for name, roll_no in islice(self._names, bisect_left(self._names, (prefix,)), None):
+            if not name.startswith(prefix):
+                break
+            found.add(roll_no)
+        if text.strip() in self._entries:
+            found.add(text.strip())
+        return found
+
+
+def search(store, text="", grades=(), categories=(), badges=(), weak_in=(),
+           min_percentage=None, max_percentage=None, page=0, page_size=PAGE_SIZE):
+    """``(total, roll_nos)``: one page of matching students, best percentage first
+
+    The percentage range is a bisect span of the store's overall ranking.
+    With no other filter the page is sliced straight out of that span. A
+    small filtered set has its page selected with a heap; a large one is
+    matched while walking the span in rank order, stopping once the page
+    is full.
+    """
+    ranking = store.rankings.overall
+    start, stop = ranking.span(min_percentage, max_percentage)
+    candidates = store.search.matching(grades, categories, badges, weak_in)
+    if text.strip():
+        named = store.search.find_text(text)
+        candidates = named if candidates is None else candidates & named
+
+    offset = page * page_size
+    if candidates is None:
+        return stop - start, list(ranking.rolls(start + offset, min(start + offset + page_size, stop)))
+
+    low = -float("inf") if min_percentage is None else min_percentage
+    high = float("inf") if max_percentage is None else max_percentage
+    if stop - start == len(ranking):
+        in_range = candidates
+    else:
+        in_range = [roll_no for roll_no in candidates if low <= ranking.score(roll_no) <= high]
+    # Selecting the page from k candidates beats walking the span once k is
+    # a small fraction of it
+    if len(in_range) * 4 < stop - start:
+        score = ranking.score
+        matches = heapq.nsmallest(offset + page_size, ((-score(roll_no), roll_no) for roll_no in in_range))
+        return len(in_range), [roll_no for _, roll_no in matches[offset:]]
+    matches = []
+    for roll_no in ranking.rolls(start, stop):
+        if roll_no in candidates:
+            matches.append(roll_no)
+            if len(matches) == offset + page_size:
+                break
+    return len(in_range), matches[offset:]
+
+
+def page_count(total, page_size=PAGE_SIZE):
+    return max(1, -(-total // page_size))
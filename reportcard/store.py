@@ -0,0 +1,432 @@
+"""Columnar in-memory student store"""
+from itertools import compress, groupby
+
+import numpy as np
+
+from reportcard.aggregates import ClassAggregates
+from reportcard.analysis import analyze_batch
+from reportcard.grading import GRADES
+from reportcard.rankings import Rankings
+from reportcard.report import export_report_data
+from reportcard.search import SearchIndex
+from reportcard.trends import TrendIndex
+
+CONDUCT_OPTIONS = ["Poor", "Fair", "Good", "Very Good", "Excellent"]
+
+# Marks cell for a subject the student was not assessed in
+MISSING = -1
+
+_CONDUCT_CODES = {conduct: code for code, conduct in enumerate(CONDUCT_OPTIONS)}
+
+# Fixed-width per-student columns and their dtypes
+_COLUMNS = {
+    "total_marks": np.int32,
+    "max_possible": np.int32,
+    "percentage": np.float64,
+    "attendance": np.int16,
+    "grade": np.uint8,
+    "conduct": np.uint8,
+    "layout": np.int32,
+    "assessment_date": "datetime64[D]",
+    "timestamp": "datetime64[s]",
+}
+
+# Free-text per-student columns, kept as plain Python lists
+_TEXT_COLUMNS = ("name", "roll_no", "teacher_remarks")
+
+# Shortest run of same-layout reports worth a columnar extend
+_MIN_EXTEND_RUN = 64
+
+
+class StudentStore:
+    """Students stored column-wise instead of as a list of dicts
+
+    Marks live in a single (students x subjects) int16 matrix whose columns
+    are the interned subject names seen so far; cells a student was not
+    assessed in hold ``MISSING``. Grade and conduct are stored as small
+    integer codes, dates as datetime64, and each student's subject order is
+    kept as an interned "layout" so ``get`` rebuilds the original dict.
+    Grade codes index ``grades``, the ``(grade, colour)`` pairs seen so far
+    (the default scale first), so reports graded on custom scales keep
+    their own labels.
+
+    Rows are indexed by ``roll_no`` (newest report wins) and by name (all
+    rows sharing that name), so lookups never scan the store. A report only
+    supersedes one whose ``timestamp`` is no later than its own, so older
+    history paged in after a newer report is kept for trends but never
+    becomes the student's current report.
+
+    ``aggregates`` holds running class statistics over the current report
+    of every roll number: a new report adds its row and un-counts the report
+    it supersedes, so the Class Analytics tab never rescans the store.
+    ``rankings`` is maintained the same way with bisect insertion,
+    ``search`` indexes current reports by grade, category, badge and weak
+    subject, and ``trends`` indexes every assessment (superseded or not)
+    by date.
+
+    ``version`` increases with every append, extend and clear, so views
+    derived from the store can be reused until it changes.
+    """
+
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._capacity = capacity
+        self.subjects = []
+        self._subject_index = {}
+        self._layouts = []
+        self._layout_index = {}
+        self.grades = list(GRADES)
+        self._grade_index = {grade: code for code, grade in enumerate(self.grades)}
+        self._marks = np.full((capacity, 0), MISSING, dtype=np.int16)
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self._text = {name: [] for name in _TEXT_COLUMNS}
+        self._roll_index = {}
+        self._name_index = {}
+        self.aggregates = ClassAggregates()
+        self.rankings = Rankings()
+        self.search = SearchIndex()
+        self.trends = TrendIndex()
+        self.version = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self.get(i)
+
+    # ---- growth helpers -------------------------------------------------
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        capacity = max(size, self._capacity * 2)
+        marks = np.full((capacity, self._marks.shape[1]), MISSING, dtype=np.int16)
+        marks[:self._size] = self._marks[:self._size]
+        self._marks = marks
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _subject_id(self, subject):
+        code = self._subject_index.get(subject)
+        if code is None:
+            code = len(self.subjects)
+            self.subjects.append(subject)
+            self._subject_index[subject] = code
+            column = np.full((self._capacity, 1), MISSING, dtype=np.int16)
+            self._marks = np.hstack([self._marks, column])
+        return code
+
+    def _layout_id(self, subjects):
+        layout = tuple(self._subject_id(subject) for subject in subjects)
+        code = self._layout_index.get(layout)
+        if code is None:
+            code = len(self._layouts)
+            self._layouts.append(layout)
+            self._layout_index[layout] = code
+        return code
+
+    def _grade_code(self, grade):
+        code = self._grade_index.get(grade)
+        if code is None:
+            code = len(self.grades)
+            self.grades.append(grade)
+            self._grade_index[grade] = code
+        return code
+
+    # ---- mutation -------------------------------------------------------
+
+    def append(self, student):
+        """Add one student report dict and return its row id"""
+        i = self._size
+        self._reserve(i + 1)
+
+        marks = student["marks"]
+        layout = self._layout_id(marks.keys())
+        self._marks[i, list(self._layouts[layout])] = list(marks.values())
+
+        columns = self._columns
+        columns["layout"][i] = layout
+        columns["total_marks"][i] = student["total_marks"]
+        columns["max_possible"][i] = student["max_possible"]
+        columns["percentage"][i] = student["percentage"]
+        columns["attendance"][i] = student["attendance"]
+        columns["grade"][i] = self._grade_code((student["grade"], student["grade_color"]))
+        columns["conduct"][i] = _CONDUCT_CODES[student["conduct"]]
+        columns["assessment_date"][i] = np.datetime64(student["assessment_date"], "D")
+        columns["timestamp"][i] = np.datetime64(student["timestamp"].replace(" ", "T"), "s")
+        for name in _TEXT_COLUMNS:
+            self._text[name].append(student[name])
+        self._name_index.setdefault(student["name"], []).append(i)
+        self.trends.add(student["roll_no"], columns["assessment_date"][i], i, marks, student["percentage"])
+
+        superseded = self._roll_index.get(student["roll_no"])
+        if superseded is None or not self._is_older(i, superseded):
+            self._roll_index[student["roll_no"]] = i
+            self.aggregates.add(*self._aggregate_row(i))
+            if superseded is not None:
+                self.aggregates.remove(*self._aggregate_row(superseded))
+            batch = analyze_batch([list(marks.values())], marks.keys(), [student["percentage"]])
+            badges = batch.badges(0)
+            self.rankings.add(student["roll_no"], student["percentage"], marks, badges)
+            self.search.add(
+                student["roll_no"], student["name"], student["grade"],
+                batch.scheme.category.labels[batch.category[0]][0], badges,
+                list(compress(marks, batch.weaknesses[0].tolist())),
+            )
+
+        self._size = i + 1
+        self.version += 1
+        return i
+
+    def extend(self, subjects, marks, columns, grades=GRADES):
+        """Bulk-append rows that share one subject layout
+
+        ``marks`` is a (rows x subjects) matrix and ``columns`` maps every
+        per-student field to a sequence of the same length. Unlike ``append``
+        the grade and conduct columns are given as integer codes into
+        ``grades`` and ``CONDUCT_OPTIONS``, and dates as datetime64 values.
+        """
+        marks = np.asarray(marks)
+        count = marks.shape[0]
+        if count == 0:
+            return range(self._size, self._size)
+        start = self._size
+        stop = start + count
+        self._reserve(stop)
+
+        layout = self._layout_id(subjects)
+        self._marks[start:stop, list(self._layouts[layout])] = marks
+        self._columns["layout"][start:stop] = layout
+        for name in _COLUMNS:
+            if name not in ("layout", "grade"):
+                self._columns[name][start:stop] = columns[name]
+        codes = np.array([self._grade_code(tuple(grade)) for grade in grades], dtype=np.uint8)
+        self._columns["grade"][start:stop] = codes[np.asarray(columns["grade"])]
+        for name in _TEXT_COLUMNS:
+            self._text[name].extend(columns[name])
+
+        # Rows that become current, and the earlier rows they supersede
+        superseded = []
+        for i, (name, roll_no) in enumerate(zip(columns["name"], columns["roll_no"]), start):
+            self._name_index.setdefault(name, []).append(i)
+            previous = self._roll_index.get(roll_no)
+            if previous is not None and self._is_older(i, previous):
+                continue
+            if previous is not None and previous < start:
+                superseded.append(previous)
+            self._roll_index[roll_no] = i
+        rolls = columns["roll_no"]
+        current = np.array([self._roll_index[roll_no] == i for i, roll_no in enumerate(rolls, start)], dtype=bool)
+        kept = np.flatnonzero(current)
+
+        percentages = self._columns["percentage"][start:stop][kept]
+        grade_codes = self._columns["grade"][start:stop][kept]
+        current_marks = marks[kept]
+        self.aggregates.add_batch(subjects, current_marks, percentages, grade_codes)
+        for i in superseded:
+            self.aggregates.remove(*self._aggregate_row(i))
+
+        current_rolls = [rolls[j] for j in kept.tolist()]
+        names = [columns["name"][j] for j in kept.tolist()]
+        batch = analyze_batch(current_marks, subjects, percentages)
+        badges = [batch.badges(j) for j in range(len(kept))]
+        self.rankings.add_many(
+            (roll_no, percentage, dict(zip(subjects, row)), badges[j])
+            for j, (roll_no, percentage, row) in enumerate(zip(current_rolls, percentages.tolist(), current_marks.tolist()))
+        )
+        categories = batch.scheme.category.labels
+        self.search.add_many(
+            (roll_no, name, self.grades[grade][0], categories[category][0], badges[j],
+             list(compress(subjects, weak_row)))
+            for j, (roll_no, name, grade, category, weak_row) in enumerate(zip(
+                current_rolls, names, grade_codes.tolist(),
+                batch.category.tolist(), batch.weaknesses.tolist(),
+            ))
+        )
+        self.trends.add_many(
+            rolls, self._columns["assessment_date"][start:stop],
+            range(start, stop), subjects, marks, self._columns["percentage"][start:stop],
+        )
+
+        self._size = stop
+        self.version += 1
+        return range(start, stop)
+
+    def extend_reports(self, reports):
+        """Bulk ``append`` of report dicts through ``extend``
+
+        Consecutive reports with the same subject layout go in as one
+        ``extend`` call, so the order is kept and ties between reports with
+        the same timestamp still go to the later one. Runs shorter than ``_MIN_EXTEND_RUN`` are
+        appended one by one, as a batch's fixed cost would outweigh them.
+        Returns the number of reports added.
+        """
+        added = 0
+        for subjects, run in groupby(reports, key=lambda report: tuple(report["marks"])):
+            run = list(run)
+            added += len(run)
+            if len(run) < _MIN_EXTEND_RUN:
+                for report in run:
+                    self.append(report)
+                continue
+            grades = list(dict.fromkeys((report["grade"], report["grade_color"]) for report in run))
+            grade_codes = {grade: code for code, grade in enumerate(grades)}
+            columns = {name: [report[name] for report in run] for name in _TEXT_COLUMNS}
+            for name in ("total_marks", "max_possible", "percentage", "attendance"):
+                columns[name] = np.array([report[name] for report in run])
+            columns["grade"] = np.array([grade_codes[(report["grade"], report["grade_color"])] for report in run])
+            columns["conduct"] = np.array([_CONDUCT_CODES[report["conduct"]] for report in run])
+            columns["assessment_date"] = np.array([report["assessment_date"] for report in run], dtype="datetime64[D]")
+            columns["timestamp"] = np.array([report["timestamp"].replace(" ", "T") for report in run], dtype="datetime64[s]")
+            marks = np.array([list(report["marks"].values()) for report in run], dtype=np.int16)
+            self.extend(list(subjects), marks, columns, grades)
+        return added
+
+    def clear(self):
+        """Drop every student but keep the interned subjects"""
+        self._size = 0
+        self._marks[:] = MISSING
+        for name in _TEXT_COLUMNS:
+            self._text[name] = []
+        self._roll_index.clear()
+        self._name_index.clear()
+        self.aggregates = ClassAggregates()
+        self.rankings = Rankings()
+        self.search = SearchIndex()
+        self.trends = TrendIndex()
+        self.version += 1
+
+    def _is_older(self, i, j):
+        """Whether row ``i`` was reported strictly before row ``j``"""
+        timestamps = self._columns["timestamp"]
+        return timestamps[i] < timestamps[j]
+
+    def _aggregate_row(self, i):
+        layout = self._layouts[self._columns["layout"][i]]
+        subjects = [self.subjects[code] for code in layout]
+        marks = self._marks[i, list(layout)].tolist()
+        return subjects, marks, self._columns["percentage"][i].item(), self._columns["grade"][i]
+
+    # ---- access ---------------------------------------------------------
+
+    def find(self, roll_no):
+        """Row id of the current (newest) report for ``roll_no``, or None"""
+        return self._roll_index.get(roll_no)
+
+    def find_by_name(self, name):
+        """Row ids of every report filed under ``name``"""
+        return list(self._name_index.get(name, ()))
+
+    def current_rows(self):
+        """Row ids of the current report for every roll number"""
+        return np.fromiter(self._roll_index.values(), dtype=np.int64, count=len(self._roll_index))
+
+    def roll_numbers(self):
+        """Indexed roll numbers in first-seen order"""
+        return list(self._roll_index)
+
+    def column(self, name):
+        """Read-only view of one per-student column"""
+        if name in self._text:
+            return self._text[name]
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def subject_column(self, subject):
+        """Marks for one subject across all students (``MISSING`` where absent)"""
+        view = self._marks[:self._size, self._subject_index[subject]]
+        view.flags.writeable = False
+        return view
+
+    def subjects_of(self, i):
+        """Subject names of student ``i`` in their original order"""
+        return [self.subjects[code] for code in self._layouts[self._columns["layout"][i]]]
+
+    def marks_of(self, i):
+        """Marks dict of student ``i``"""
+        layout = self._layouts[self._columns["layout"][i]]
+        values = self._marks[i, list(layout)].tolist()
+        return {self.subjects[code]: value for code, value in zip(layout, values)}
+
+    def get(self, i):
+        """Materialise student ``i`` as the classic report dict"""
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        columns = self._columns
+        grade, grade_color = self.grades[columns["grade"][i]]
+        timestamp = np.datetime_as_string(columns["timestamp"][i], unit="s")
+        return {
+            "name": self._text["name"][i],
+            "roll_no": self._text["roll_no"][i],
+            "marks": self.marks_of(i),
+            "total_marks": columns["total_marks"][i].item(),
+            "max_possible": columns["max_possible"][i].item(),
+            "percentage": columns["percentage"][i].item(),
+            "grade": grade,
+            "grade_color": grade_color,
+            "assessment_date": str(columns["assessment_date"][i]),
+            "attendance": columns["attendance"][i].item(),
+            "conduct": CONDUCT_OPTIONS[columns["conduct"][i]],
+            "teacher_remarks": self._text["teacher_remarks"][i],
+            "timestamp": timestamp.replace("T", " "),
+        }
+
+    def reports(self, rows=None):
+        """Yield ``(report, analysis)`` dict pairs, analysed a layout at a time"""
+        for row_ids, batch in self.analyze(rows):
+            for j, i in enumerate(row_ids.tolist()):
+                yield self.get(i), batch.student(j)
+
+    def snapshot(self):
+        """A private copy of every row, for reading without the class lock
+
+        Copies the columns, marks, interned tables and roll-number index
+        (O(rows), a few milliseconds at 100k students) so long exports can
+        run while other sessions append to or clear this store. The running
+        aggregates, rankings and search/trend indexes are left empty.
+        """
+        copy = StudentStore(capacity=max(self._size, 1))
+        size = self._size
+        copy._size = size
+        copy.subjects = list(self.subjects)
+        copy._subject_index = dict(self._subject_index)
+        copy._layouts = list(self._layouts)
+        copy._layout_index = dict(self._layout_index)
+        copy.grades = list(self.grades)
+        copy._grade_index = dict(self._grade_index)
+        copy._marks = self._marks[:size].copy()
+        copy._columns = {name: column[:size].copy() for name, column in self._columns.items()}
+        copy._text = {name: list(values[:size]) for name, values in self._text.items()}
+        copy._roll_index = dict(self._roll_index)
+        copy.version = self.version
+        return copy
+
+    def to_json(self, i):
+        """Student ``i`` as export_report_data formats it"""
+        return export_report_data(self.get(i))
+
+    def groups(self, rows=None):
+        """Yield ``(subjects, row_ids, marks_matrix)`` for each subject layout in use
+
+        Pass ``rows`` to restrict the groups to those row ids.
+        """
+        layouts = self._columns["layout"][:self._size]
+        selected = np.ones(self._size, dtype=bool)
+        if rows is not None:
+            selected[:] = False
+            selected[rows] = True
+        for code, layout in enumerate(self._layouts):
+            rows = np.flatnonzero((layouts == code) & selected)
+            if len(rows):
+                yield [self.subjects[c] for c in layout], rows, self._marks[np.ix_(rows, layout)]
+
+    def analyze(self, rows=None):
+        """Run the batch analysis per layout, yielding ``(row_ids, BatchAnalysis)``"""
+        percentages = self._columns["percentage"][:self._size]
+        for subjects, rows, marks in self.groups(rows):
+            yield rows, analyze_batch(marks, subjects, percentages[rows])
@@ -0,0 +1,90 @@
+"""Time-indexed assessment history for trend views"""
+from bisect import insort
+
+import numpy as np
+
+
+def moving_average(values, window):
+    """Trailing moving average (shorter windows at the start of the series)"""
+    import pandas as pd
+    return pd.Series(values, dtype=np.float64).rolling(window, min_periods=1).mean().to_numpy()
+
+
+class TrendIndex:
+    """Assessments indexed by (roll_no, assessment_date) and by month
+
+    ``student_rows`` returns one student's assessments in date order from a
+    per-student sorted list, and ``monthly_means`` reads per-month running
+    sums, so neither question scans the whole history.
+    """
+
+    def __init__(self):
+        self._by_student = {}
+        self._by_key = {}
+        self._monthly = {}
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def _month(self, month):
+        bucket = self._monthly.get(month)
+        if bucket is None:
+            bucket = self._monthly[month] = {"__overall__": [0.0, 0]}
+        return bucket
+
+    def add(self, roll_no, assessment_date, row, marks, percentage):
+        """Index one assessment; ``assessment_date`` is a datetime64[D]"""
+        day = np.datetime64(assessment_date, "D")
+        insort(self._by_student.setdefault(roll_no, []), (day, row))
+        self._by_key[(roll_no, day)] = row
+
+        bucket = self._month(day.astype("datetime64[M]"))
+        for subject, mark in marks.items():
+            totals = bucket.setdefault(subject, [0.0, 0])
+            totals[0] += mark
+            totals[1] += 1
+        bucket["__overall__"][0] += percentage
+        bucket["__overall__"][1] += 1
+
+    def add_many(self, roll_nos, assessment_dates, rows, subjects, marks, percentages):
+        """Index many assessments sharing one subject layout"""
+        days = np.asarray(assessment_dates, dtype="datetime64[D]")
+        for roll_no, day, row in zip(roll_nos, days, rows):
+            insort(self._by_student.setdefault(roll_no, []), (day, row))
+            self._by_key[(roll_no, day)] = row
+
+        # Per-month sums for the whole chunk in one grouped pass
+        import pandas as pd
+        frame = pd.DataFrame(np.asarray(marks), columns=list(subjects))
+        frame["__overall__"] = percentages
+        grouped = frame.groupby(days.astype("datetime64[M]"))
+        sums, counts = grouped.sum(), grouped.count()
+        for month in sums.index:
+            bucket = self._month(np.datetime64(month, "M"))
+            for column in sums.columns:
+                totals = bucket.setdefault(column, [0.0, 0])
+                totals[0] += sums.at[month, column]
+                totals[1] += int(counts.at[month, column])
+
+    def find(self, roll_no, assessment_date):
+        """Row id of the latest assessment for this student on that date"""
+        return self._by_key.get((roll_no, np.datetime64(assessment_date, "D")))
+
+    def student_rows(self, roll_no):
+        """Row ids of every assessment for ``roll_no``, oldest first"""
+        return [row for _, row in self._by_student.get(roll_no, ())]
+
+    def monthly_means(self):
+        """DataFrame of mean marks per subject (and overall %) indexed by month"""
+        import pandas as pd
+        data = {
+            pd.Timestamp(month): {
+                ("Overall %" if column == "__overall__" else column): total / count
+                for column, (total, count) in bucket.items() if count
+            }
+            for month, bucket in sorted(self._monthly.items())
+        }
+        frame = pd.DataFrame.from_dict(data, orient="index")
+        if "Overall %" in frame:
+            frame = frame[[column for column in frame.columns if column != "Overall %"] + ["Overall %"]]
+        return frame
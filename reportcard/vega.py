@@ -0,0 +1,102 @@
+"""Vega-Lite specs for the report card charts, rendered in the browser
+
+Each builder mirrors one matplotlib chart in reportcard.charts but returns
+a small JSON-able dict (data inline), so the server does no rasterising
+and sends a few hundred bytes instead of a PNG.
+"""
+
+MARKS_SCALE = {"domain": [0, 110]}
+
+
+def _subject_axis(title=None):
+    return {"field": "subject", "type": "nominal", "sort": None, "title": title,
+            "axis": {"labelAngle": 0, "labelFontWeight": "bold"}}
+
+
+def _marks_axis(field="marks"):
+    return {"field": field, "type": "quantitative", "scale": MARKS_SCALE, "title": "Marks"}
+
+
+def subject_bar_spec(student, analysis, passing_percentage):
+    """Subject-wise marks with average and passing lines"""
+    avg = round(float(analysis["avg_marks"]), 2)
+    x, y = _subject_axis("Subjects"), _marks_axis()
+    return {
+        "title": {"text": f"{student['name']}'s Marks Distribution",
+                  "subtitle": f"Average: {avg:.1f} · Passing: {passing_percentage}"},
+        "data": {"values": [{"subject": subject, "marks": mark} for subject, mark in student["marks"].items()]},
+        "layer": [
+            {
+                "mark": {"type": "bar", "opacity": 0.8, "stroke": "black", "strokeWidth": 1.5},
+                "encoding": {
+                    "x": x, "y": y,
+                    "color": {"condition": {"test": f"datum.marks >= {avg}", "value": "#22c55e"}, "value": "#ef4444"},
+                },
+            },
+            {"mark": {"type": "text", "dy": -8, "fontWeight": "bold"},
+             "encoding": {"x": x, "y": y, "text": {"field": "marks"}}},
+            {"mark": {"type": "rule", "color": "#3b82f6", "strokeDash": [6, 4], "strokeWidth": 2},
+             "encoding": {"y": {"datum": avg}}},
+            {"mark": {"type": "rule", "color": "#f59e0b", "strokeDash": [2, 2], "strokeWidth": 2},
+             "encoding": {"y": {"datum": passing_percentage}}},
+        ],
+    }
+
+
+def radar_spec(student, analysis):
+    """Polar (rose) chart: one equal wedge per subject, radius = marks
+
+    Vega-Lite has no radar mark; the dashed ring is the student's average.
+    """
+    avg = round(float(analysis["avg_marks"]), 2)
+    theta = {"field": "slot", "type": "quantitative", "stack": True}
+    radius = {"type": "quantitative", "scale": {"domain": [0, 100], "zero": True, "range": [0, 110]}}
+    return {
+        "title": {"text": f"{student['name']}'s Performance Radar", "subtitle": f"Average: {avg:.1f}"},
+        "data": {"values": [{"subject": subject, "marks": mark, "slot": 1} for subject, mark in student["marks"].items()]},
+        "layer": [
+            {
+                "mark": {"type": "arc", "stroke": "#667eea", "strokeWidth": 2, "fill": "#764ba2", "fillOpacity": 0.3},
+                "encoding": {"theta": theta, "radius": dict(radius, field="marks"),
+                             "tooltip": [{"field": "subject"}, {"field": "marks"}]},
+            },
+            {
+                "mark": {"type": "arc", "filled": False, "stroke": "#3b82f6", "strokeDash": [6, 4], "strokeWidth": 2},
+                "encoding": {"theta": theta, "radius": dict(radius, datum=avg)},
+            },
+            {
+                "mark": {"type": "text", "radiusOffset": 14, "fontWeight": "bold"},
+                "encoding": {"theta": theta, "radius": dict(radius, datum=100), "text": {"field": "subject"}},
+            },
+        ],
+        "view": {"stroke": None},
+    }
+
+
+def potential_spec(student, analysis):
+    """Grouped bars of current marks against predicted potential"""
+    potential = analysis["improvement_potential"]
+    values = []
+    for subject, mark in student["marks"].items():
+        values.append({"subject": subject, "series": "Current Marks", "marks": mark})
+        values.append({"subject": subject, "series": "Predicted Potential", "marks": potential[subject]})
+    x, y = _subject_axis(), _marks_axis()
+    x_offset = {"field": "series", "sort": None}
+    return {
+        "title": f"{student['name']}'s Improvement Potential",
+        "data": {"values": values},
+        "layer": [
+            {
+                "mark": {"type": "bar", "opacity": 0.8, "stroke": "black", "strokeWidth": 1.5},
+                "encoding": {
+                    "x": x, "y": y, "xOffset": x_offset,
+                    "color": {"field": "series", "type": "nominal", "title": None,
+                              "scale": {"domain": ["Current Marks", "Predicted Potential"],
+                                        "range": ["#3b82f6", "#10b981"]},
+                              "legend": {"orient": "top-right"}},
+                },
+            },
+            {"mark": {"type": "text", "dy": -8, "fontWeight": "bold"},
+             "encoding": {"x": x, "y": y, "xOffset": x_offset, "text": {"field": "marks"}}},
+        ],
+    }
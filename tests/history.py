@@ -0,0 +1,89 @@
+"""Random report histories and the brute-force answers a store must match
+
+A history is a list of operations on a StudentStore: single appends,
+batches through ``extend_reports`` (long same-layout runs take the
+columnar ``extend`` path, short ones fall back to ``append``) and clears.
+Timestamps are drawn from a small pool, so newer, older and equally new
+reports for a roll number all occur.
+"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from reportcard import build_report
+from reportcard.grading import grading_scheme
+from reportcard.store import CONDUCT_OPTIONS, StudentStore
+
+LAYOUTS = [
+    ("Math", "Physics", "Urdu", "English", "Computer"),
+    ("Math", "Urdu", "Biology"),
+    ("Art",),
+]
+CUSTOM_SCALE = (("Pass", 50), ("Fail", 0))
+TIMESTAMPS = [datetime(2024, 1, 1, 9, 0, 0) + timedelta(hours=hours) for hours in range(8)]
+
+
+def random_report(rng, rolls=40, layout=None):
+    roll = rng.randrange(rolls)
+    layout = layout or rng.choice(LAYOUTS)
+    # Marks cluster on a few values so scores tie in the rankings
+    marks = {subject: rng.choice([0, 35, 40, 50, 64, 65, 80, 90, 100, rng.randint(0, 100)]) for subject in layout}
+    scheme = grading_scheme(CUSTOM_SCALE if rng.random() < 0.1 else None)
+    return build_report(
+        f"Student {roll % 25}", str(roll), marks,
+        f"2024-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}",
+        attendance=rng.randint(0, 100), conduct=rng.choice(CONDUCT_OPTIONS),
+        teacher_remarks=rng.choice(["", "Keep it up"]),
+        scheme=scheme, timestamp=rng.choice(TIMESTAMPS),
+    )
+
+
+def random_history(seed, steps=40):
+    """A reproducible list of ``(operation, reports)`` pairs"""
+    rng = random.Random(seed)
+    history = []
+    for _ in range(steps):
+        pick = rng.random()
+        if pick < 0.5:
+            history.append(("append", [random_report(rng)]))
+        elif pick < 0.7:
+            layout = rng.choice(LAYOUTS)
+            history.append(("extend", [random_report(rng, layout=layout) for _ in range(rng.randint(64, 150))]))
+        elif pick < 0.95:
+            history.append(("extend", [random_report(rng) for _ in range(rng.randint(1, 20))]))
+        else:
+            history.append(("clear", []))
+    return history
+
+
+def play(history, store=None):
+    """Apply ``history`` to a store; returns it and the reports it holds in row order"""
+    store = store if store is not None else StudentStore()
+    held = []
+    for operation, reports in history:
+        if operation == "append":
+            store.append(reports[0])
+        elif operation == "extend":
+            store.extend_reports(reports)
+        else:
+            store.clear()
+            held = []
+        held.extend(reports)
+    return store, held
+
+
+def current_reports(held):
+    """``{roll_no: (row, report)}``: the newest report per roll, ties going to the later row"""
+    current = {}
+    for row, report in enumerate(held):
+        roll = report["roll_no"]
+        if roll not in current or report["timestamp"] >= current[roll][1]["timestamp"]:
+            current[roll] = (row, report)
+    return current
+
+
+def grade_counts(current):
+    return Counter(report["grade"] for _, report in current.values())
+
+
+SEEDS = range(8)
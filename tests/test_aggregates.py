@@ -0,0 +1,135 @@
+"""ClassAggregates and RunningStats against numpy recomputes over random histories
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+from collections import Counter
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.aggregates import PERCENTILES, RunningStats
+from reportcard.grading import grading_scheme
+from reportcard.school import School
+
+from history import SEEDS, current_reports, grade_counts, play, random_history
+
+# Whole-number thresholds: rates over the whole-percent histogram are exact
+PASSING, EXCELLENCE = 40, 85
+
+
+def expected_summary(values, buckets=None):
+    """The summary row a _Series over ``values`` should produce
+
+    Percentiles come from ``buckets``, the values floored to whole percents
+    as the histogram stores them.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    buckets = values if buckets is None else np.asarray(buckets, dtype=np.float64)
+    row = {"Students": len(values), "Mean": values.mean(), "Std Dev": values.std()}
+    for p in PERCENTILES:
+        row["Median" if p == 50 else f"P{p}"] = np.percentile(buckets, p)
+    row["Pass Rate %"] = np.mean(values >= PASSING) * 100
+    row["Excellence Rate %"] = np.mean(values >= EXCELLENCE) * 100
+    return row
+
+
+def assert_summary(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, abs=1e-9), key
+
+
+def subject_marks(reports):
+    marks = {}
+    for report in reports:
+        for subject, mark in report["marks"].items():
+            marks.setdefault(subject, []).append(mark)
+    return marks
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_summaries_match_a_recompute_over_current_reports(seed):
+    store, held = play(random_history(seed))
+    current = [report for _, report in current_reports(held).values()]
+    aggregates = store.aggregates
+    assert len(aggregates) == len(current)
+    if not current:
+        assert aggregates.subject_summary(PASSING, EXCELLENCE) == []
+        return
+
+    rows = {row.pop("Subject"): row for row in aggregates.subject_summary(PASSING, EXCELLENCE)}
+    marks = subject_marks(current)
+    assert rows.keys() == marks.keys()
+    for subject, values in marks.items():
+        assert_summary(rows[subject], expected_summary(values))
+
+    percentages = [report["percentage"] for report in current]
+    assert_summary(aggregates.overall_summary(PASSING, EXCELLENCE),
+                   expected_summary(percentages, np.floor(percentages)))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_grade_distribution_counts_current_grades(seed):
+    store, held = play(random_history(seed))
+    order = grading_scheme().grade_names()
+    distribution = store.aggregates.grade_distribution(store.grades, order)
+    assert {grade: count for grade, count in distribution.items() if count} == grade_counts(current_reports(held))
+    # Grades in ``order`` are listed first even where nobody has them
+    assert list(distribution)[:len(order)] == order
+
+
+def test_rollup_merges_classes_that_interned_grades_differently():
+    school = School()
+    currents = []
+    for seed, name in zip(SEEDS, ["10-A", "10-B", "10-C"]):
+        section = school.section(name)
+        section.loaded = True
+        _, held = play(random_history(seed), section.store)
+        currents.append([report for _, report in current_reports(held).values()])
+    reports = [report for current in currents for report in current]
+
+    rows, combined, grades = school.rollup(PASSING, EXCELLENCE)
+    assert [row["Students"] for row in rows] == [len(current) for current in currents if current]
+    percentages = [report["percentage"] for report in reports]
+    assert_summary(combined.overall_summary(PASSING, EXCELLENCE),
+                   expected_summary(percentages, np.floor(percentages)))
+    distribution = combined.grade_distribution(grades, order=[])
+    assert distribution == Counter(report["grade"] for report in reports)
+
+
+def test_running_stats_follow_numpy_through_adds_removes_and_merges():
+    rng = random.Random(3)
+    stats, values = RunningStats(), []
+    for _ in range(2000):
+        pick = rng.random()
+        if values and pick < 0.3:
+            stats.remove(values.pop(rng.randrange(len(values))))
+        elif pick < 0.9:
+            values.append(rng.uniform(0, 100))
+            stats.add(values[-1])
+        else:
+            batch = [rng.uniform(0, 100) for _ in range(rng.randint(0, 30))]
+            if rng.random() < 0.5:
+                stats.add_many(batch)
+            else:
+                other = RunningStats()
+                other.add_many(batch)
+                stats.merge(other)
+            values.extend(batch)
+        assert stats.count == len(values)
+        if values:
+            assert stats.mean == pytest.approx(np.mean(values), abs=1e-6)
+            assert stats.std == pytest.approx(np.std(values), abs=1e-6)
+
+
+def test_removing_the_last_value_resets_running_stats():
+    stats = RunningStats()
+    stats.add_many([10, 20])
+    stats.remove(10)
+    stats.remove(20)
+    assert (stats.count, stats.mean, stats.std) == (0, 0.0, 0.0)
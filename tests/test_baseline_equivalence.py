@@ -0,0 +1,222 @@
+"""The table-driven grading and analysis must match the original if/elif ladders
+
+The ladders below are copied from the app before reportcard existed and
+are the reference: every result, including the float statistics, must be
+identical, not merely close.
+
+    python -m pytest tests
+"""
+import math
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard import calculate_grade, calculate_improvement_potential, generate_performance_analysis
+from reportcard.grading import DEFAULT_SCHEME
+
+THRESHOLDS = (40, 50, 60, 70, 75, 80, 85, 90)
+
+
+def baseline_analysis(student_data):
+    marks = student_data['marks']
+    percentage = student_data['percentage']
+
+    marks_list = list(marks.values())
+    avg_marks = np.mean(marks_list)
+    std_dev = np.std(marks_list)
+    max_mark = max(marks_list)
+    min_mark = min(marks_list)
+
+    strengths = {subject: mark for subject, mark in marks.items() if mark >= avg_marks + std_dev/2}
+    weaknesses = {subject: mark for subject, mark in marks.items() if mark < avg_marks - std_dev/2}
+    consistent = {subject: mark for subject, mark in marks.items()
+                  if subject not in strengths and subject not in weaknesses}
+
+    if percentage >= 85:
+        performance_category = "🏆 Exceptional"
+        overall_comment = "Outstanding performance! You're among the top performers."
+        emoji = "🌟"
+    elif percentage >= 75:
+        performance_category = "⭐ Excellent"
+        overall_comment = "Excellent work! Keep maintaining this momentum."
+        emoji = "🎯"
+    elif percentage >= 60:
+        performance_category = "👍 Good"
+        overall_comment = "Good performance. Focus on consistency for even better results."
+        emoji = "📈"
+    elif percentage >= 50:
+        performance_category = "📚 Satisfactory"
+        overall_comment = "Satisfactory results. More dedication needed for improvement."
+        emoji = "💪"
+    elif percentage >= 40:
+        performance_category = "⚠️ Needs Improvement"
+        overall_comment = "Requires focused effort. Don't lose hope, improvement is possible!"
+        emoji = "📖"
+    else:
+        performance_category = "🚨 Critical"
+        overall_comment = "Immediate intervention required. Let's work together on a recovery plan."
+        emoji = "🆘"
+
+    badges = []
+    if percentage >= 90:
+        badges.append("🥇 Gold Medalist")
+    elif percentage >= 80:
+        badges.append("🥈 Silver Achiever")
+    elif percentage >= 70:
+        badges.append("🥉 Bronze Performer")
+    if std_dev < 8:
+        badges.append("⚖️ Consistency Champion")
+    if max_mark == 100:
+        badges.append("💯 Perfect Score")
+    if all(mark >= 75 for mark in marks_list):
+        badges.append("🌟 All-Rounder")
+
+    recommendations = {}
+    for subject, mark in marks.items():
+        if mark >= 90:
+            recommendations[subject] = "🎓 Outstanding! Consider advanced topics or mentoring peers."
+        elif mark >= 80:
+            recommendations[subject] = "📚 Excellent! Aim for perfection with targeted practice."
+        elif mark >= 70:
+            recommendations[subject] = "✍️ Good work! Focus on mastering complex concepts."
+        elif mark >= 60:
+            recommendations[subject] = "📖 Decent foundation. Practice 45 mins daily for improvement."
+        elif mark >= 50:
+            recommendations[subject] = "⚠️ Needs attention. Consider group study or tutoring."
+        elif mark >= 40:
+            recommendations[subject] = "🚨 Critical! Immediate focus required with teacher support."
+        else:
+            recommendations[subject] = "🆘 Urgent intervention needed. One-on-one coaching recommended."
+
+    if std_dev < 8:
+        consistency_note = "Highly consistent across all subjects"
+        consistency_color = "#22c55e"
+    elif std_dev < 15:
+        consistency_note = "Moderate variation in performance"
+        consistency_color = "#f59e0b"
+    else:
+        consistency_note = "High variation - balance needed"
+        consistency_color = "#ef4444"
+
+    improvement_potential = baseline_improvement_potential(marks, avg_marks)
+
+    return {
+        "performance_category": performance_category,
+        "overall_comment": overall_comment,
+        "emoji": emoji,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "consistent": consistent,
+        "recommendations": recommendations,
+        "consistency_note": consistency_note,
+        "consistency_color": consistency_color,
+        "avg_marks": avg_marks,
+        "std_dev": std_dev,
+        "max_mark": max_mark,
+        "min_mark": min_mark,
+        "badges": badges,
+        "improvement_potential": improvement_potential
+    }
+
+
+def baseline_improvement_potential(marks, avg_marks):
+    potential = {}
+    for subject, mark in marks.items():
+        if mark < 50:
+            potential[subject] = min(mark + 20, 75)
+        elif mark < 70:
+            potential[subject] = min(mark + 15, 85)
+        elif mark < 85:
+            potential[subject] = min(mark + 10, 95)
+        else:
+            potential[subject] = min(mark + 5, 100)
+    return potential
+
+
+def baseline_grade(percentage):
+    if percentage >= 90:
+        return "A+", "#22c55e"
+    elif percentage >= 80:
+        return "A", "#84cc16"
+    elif percentage >= 70:
+        return "B+", "#eab308"
+    elif percentage >= 60:
+        return "B", "#f59e0b"
+    elif percentage >= 50:
+        return "C", "#f97316"
+    elif percentage >= 40:
+        return "D", "#ef4444"
+    else:
+        return "F", "#991b1b"
+
+
+def edge_percentages():
+    """Each threshold, the floats either side of it and 0.01 steps around it"""
+    values = [-1.0, 0.0, 100.0, 101.0, 39.999, 39.9999999999, 89.99, 89.999999999999]
+    for threshold in THRESHOLDS:
+        values += [threshold, math.nextafter(threshold, -math.inf), math.nextafter(threshold, math.inf),
+                   round(threshold - 0.01, 2), round(threshold + 0.01, 2)]
+    return values
+
+
+def random_percentages(count=20000, seed=0):
+    rng = random.Random(seed)
+    return [rng.uniform(0, 100) for _ in range(count // 2)] + \
+           [round(rng.uniform(0, 100), 2) for _ in range(count // 2)]
+
+
+def random_students(count=2000, seed=0):
+    rng = random.Random(seed)
+    subjects = ["Math", "Physics", "Urdu", "English", "Computer", "Chemistry", "Biology", "Art"]
+    for _ in range(count):
+        picked = subjects[:rng.randint(1, len(subjects))]
+        marks = {subject: rng.choice([rng.randint(0, 100), 100, 75, 50, 40]) for subject in picked}
+        yield {"marks": marks, "percentage": sum(marks.values()) / len(marks)}
+
+
+def assert_same(actual, expected):
+    """Equal values and the same key order in every dict"""
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == value, key
+        if isinstance(value, dict):
+            assert list(actual[key]) == list(value), key
+
+
+@pytest.mark.parametrize("percentage", edge_percentages())
+def test_grade_edges(percentage):
+    assert calculate_grade(percentage) == baseline_grade(percentage)
+
+
+def test_grade_random():
+    percentages = random_percentages()
+    assert [calculate_grade(p) for p in percentages] == [baseline_grade(p) for p in percentages]
+
+
+def test_grade_codes_match_ladder():
+    percentages = edge_percentages() + random_percentages()
+    codes = DEFAULT_SCHEME.grade.codes(np.array(percentages))
+    assert [DEFAULT_SCHEME.grade.labels[code] for code in codes.tolist()] == \
+           [baseline_grade(p) for p in percentages]
+
+
+def test_improvement_potential_every_mark():
+    marks = {f"Subject {mark}": mark for mark in range(101)}
+    assert calculate_improvement_potential(marks) == baseline_improvement_potential(marks, None)
+
+
+@pytest.mark.parametrize("percentage", edge_percentages())
+def test_analysis_edges(percentage):
+    student = {"marks": {"Math": 100, "Physics": 75, "Urdu": 40, "English": 39, "Computer": 90},
+               "percentage": percentage}
+    assert_same(generate_performance_analysis(student), baseline_analysis(student))
+
+
+def test_analysis_random():
+    for student in random_students():
+        assert_same(generate_performance_analysis(student), baseline_analysis(student))
@@ -0,0 +1,40 @@
+"""Report card PDFs with long remarks and ZIP export file names
+
+    python -m pytest tests
+"""
+import io
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard import build_report, generate_performance_analysis
+from reportcard.cards import card_pdf, export_cards
+from reportcard.school import default_settings
+
+
+def card(name, roll_no, remarks=""):
+    report = build_report(name, roll_no, {"Math": 55, "Urdu": 72}, "2024-03-01", teacher_remarks=remarks)
+    return report, generate_performance_analysis(report)
+
+
+def page_count(pdf):
+    return pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+
+
+def test_long_remarks_continue_on_further_pages():
+    short = page_count(card_pdf(*card("Ali", "1", "Works hard."), default_settings()))
+    assert short == 4
+    remarks = "Needs steady practice at home. " * 400 + "\n\nA second paragraph."
+    assert page_count(card_pdf(*card("Ali", "1", remarks), default_settings())) > short
+
+
+def test_zip_entries_stay_unique_when_names_collide():
+    cards = [card("Ali Khan", "7"), card("Ali  Khan!", "7"), card("Sara", "8"), card("Ali Khan", "7"),
+             card("Ali Khan_1", "7")]
+    buffer = io.BytesIO()
+    assert export_cards(cards, buffer, default_settings(), "html", max_workers=1) == len(cards)
+    names = zipfile.ZipFile(buffer).namelist()
+    assert names == ["7_Ali_Khan.html", "7_Ali_Khan_1.html", "8_Sara.html", "7_Ali_Khan_3.html",
+                     "7_Ali_Khan_1_4.html"]
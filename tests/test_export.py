@@ -0,0 +1,143 @@
+"""Streaming NDJSON/CSV/Parquet export against the reports each row holds
+
+    python -m pytest tests
+"""
+import gzip
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.export import export_filename, export_students, filter_rows, iter_ndjson
+
+from history import SEEDS, current_reports, play, random_history
+
+NUMERIC = {"total_marks", "max_possible", "percentage", "attendance"}
+
+
+def expected_rows(held, rows, subjects):
+    """What a CSV/Parquet row should hold for each of ``rows``"""
+    expected = []
+    for row in rows:
+        report = dict(held[row])
+        marks = report.pop("marks")
+        expected.append({
+            "name": report.pop("name"), "roll_no": report.pop("roll_no"),
+            **{subject: marks.get(subject) for subject in subjects},
+            **report,
+        })
+    return expected
+
+
+def normalized(records, subjects):
+    """Table cells as Python values: numbers as floats and blank marks as None"""
+    rows = []
+    for record in records:
+        row = {}
+        for column, value in record.items():
+            if value is None or value is pd.NA or value == "" and column in subjects:
+                value = None
+            elif column in NUMERIC or column in subjects:
+                value = float(value)
+            row[column] = value
+        rows.append(row)
+    return rows
+
+
+def subjects_of(store, held, rows):
+    """Subjects assessed in ``rows``, in the order the store first saw them"""
+    assessed = {subject for row in rows for subject in held[row]["marks"]}
+    return [subject for subject in store.subjects if subject in assessed]
+
+
+@pytest.fixture(params=SEEDS[:4])
+def played(request):
+    return play(random_history(request.param))
+
+
+@pytest.mark.parametrize("latest_only", [True, False])
+def test_filter_rows_matches_a_brute_force_filter(played, latest_only):
+    store, held = played
+    current = {row for row, _ in current_reports(held).values()}
+    for grades, low, high in [(None, None, None), (["A", "B"], None, None), (["F", "Fail"], 10, 60),
+                              (None, 40, None), (None, None, 33.3), (["A+"], 90, 80)]:
+        expected = [
+            row for row, report in enumerate(held)
+            if (not latest_only or row in current)
+            and (not grades or report["grade"] in grades)
+            and (low is None or report["percentage"] >= low)
+            and (high is None or report["percentage"] <= high)
+        ]
+        assert filter_rows(store, grades, low, high, latest_only).tolist() == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, None])
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_ndjson_lines_are_the_stored_reports(played, chunk_size, compression):
+    if compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+    store, held = played
+    rows = filter_rows(store, latest_only=False)
+    buffer = io.BytesIO()
+    assert export_students(store, buffer, "ndjson", rows, compression, chunk_size) == len(held)
+
+    data = buffer.getvalue()
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    elif compression == "zstd":
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    assert [json.loads(line) for line in data.splitlines()] == held
+
+
+def test_ndjson_chunks_hold_at_most_chunk_size_reports(played):
+    store, held = played
+    chunks = list(iter_ndjson(store, filter_rows(store, latest_only=False), chunk_size=7))
+    assert len(chunks) == -(-len(held) // 7)
+    assert all(chunk.count(b"\n") <= 7 for chunk in chunks)
+
+
+@pytest.mark.parametrize("chunk_size", [3, None])
+def test_csv_round_trips_the_latest_reports(played, tmp_path, chunk_size):
+    store, held = played
+    rows = filter_rows(store).tolist()
+    path = str(tmp_path / export_filename("csv", "gzip"))
+    assert export_students(store, path, "csv", compression="gzip", chunk_size=chunk_size) == len(rows)
+
+    subjects = subjects_of(store, held, rows)
+    if not rows:
+        assert gzip.open(path).read() == b""
+        return
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    assert list(frame.columns[2:2 + len(subjects)]) == subjects
+    assert normalized(frame.to_dict("records"), subjects) == normalized(expected_rows(held, rows, subjects), subjects)
+
+
+@pytest.mark.parametrize("chunk_size", [5, None])
+def test_parquet_round_trips_any_rows(played, tmp_path, chunk_size):
+    pq = pytest.importorskip("pyarrow.parquet")
+    store, held = played
+    rows = np.arange(len(held))[::2]
+    path = str(tmp_path / export_filename("parquet"))
+    assert export_students(store, path, "parquet", rows, chunk_size=chunk_size) == len(rows)
+    if not len(rows):
+        return
+
+    subjects = subjects_of(store, held, rows.tolist())
+    assert pq.ParquetFile(path).num_row_groups == -(-len(rows) // (chunk_size or 20000))
+    frame = pd.read_parquet(path).astype(object)
+    assert normalized(frame.to_dict("records"), subjects) == \
+        normalized(expected_rows(held, rows.tolist(), subjects), subjects)
+
+
+def test_unknown_format_and_compression_are_rejected(played):
+    store, _ = played
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        export_students(store, io.BytesIO(), "xml")
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        export_students(store, io.BytesIO(), "csv", compression="bz2")
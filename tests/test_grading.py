@@ -0,0 +1,54 @@
+"""Custom grading scales: colours from the passing mark and NaN percentages
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.grading import (
+    DEFAULT_GRADE_SCALE, FAILING_COLOR, GRADES, PASSING_COLORS, ThresholdTable, grade_colors, grading_scheme,
+)
+
+
+def test_default_scale_keeps_its_colours():
+    scheme = grading_scheme()
+    assert scheme.grade.labels == GRADES
+    assert grading_scheme(DEFAULT_GRADE_SCALE, 40) is scheme
+
+
+@pytest.mark.parametrize("scale, passing, expected", [
+    # Two grades: pass and fail, never the colours of A+ and A
+    ((("Pass", 50), ("Fail", 0)), 50, [PASSING_COLORS[0], FAILING_COLOR]),
+    ((("Pass", 50), ("Fail", 0)), 40, [PASSING_COLORS[0], FAILING_COLOR]),
+    ((("Distinction", 75), ("Merit", 60), ("Pass", 40), ("E", 20), ("F", 0)), 40,
+     [PASSING_COLORS[0], PASSING_COLORS[2], PASSING_COLORS[-1], FAILING_COLOR, FAILING_COLOR]),
+    ((("Distinction", 75), ("Merit", 60), ("Pass", 40), ("E", 20), ("F", 0)), 60,
+     [PASSING_COLORS[0], PASSING_COLORS[-1], FAILING_COLOR, FAILING_COLOR, FAILING_COLOR]),
+    ((("Everyone", 0),), 0, [PASSING_COLORS[0]]),
+    ((("Hard", 90), ("Fail", 0)), 95, [FAILING_COLOR, FAILING_COLOR]),
+])
+def test_custom_colours_follow_the_passing_mark(scale, passing, expected):
+    assert grade_colors(scale, passing) == expected
+    scheme = grading_scheme(scale, passing)
+    assert [color for _, color in reversed(scheme.grade.labels)] == expected
+    assert scheme.grade_of(0.0) == (scale[-1][0], expected[-1])
+
+
+def test_nan_percentage_gets_the_lowest_grade():
+    for scheme in (grading_scheme(), grading_scheme((("Pass", 50), ("Fail", 0)), 50)):
+        lowest = scheme.grade.labels[0]
+        assert scheme.grade_of(float("nan")) == lowest
+        assert scheme.grade_of(np.float64("nan")) == lowest
+        codes = scheme.grade.codes(np.array([np.nan, 100.0, np.nan, 0.0]))
+        assert codes.tolist() == [0, len(scheme.grade) - 1, 0, 0]
+
+
+def test_nan_falls_in_the_lowest_band_off_the_percent_grid():
+    table = ThresholdTable([33.333, 66.667], ["low", "mid", "high"])
+    assert table.label(float("nan")) == "low"
+    assert table.codes(np.array([np.nan, 50.0, 70.0])).tolist() == [0, 1, 2]
@@ -0,0 +1,89 @@
+"""Bulk import: assessment dates in mixed formats and blanks
+
+    python -m pytest tests
+"""
+import io
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.ingest import import_students
+from reportcard.store import StudentStore
+
+TODAY = str(date.today())
+
+
+def imported_dates(source, fmt):
+    store = StudentStore()
+    report = import_students(source, store, fmt=fmt)
+    assert report.rejected == []
+    return [student["assessment_date"] for student in store]
+
+
+def test_csv_mixed_and_blank_dates():
+    csv = io.StringIO(
+        "name,roll_no,assessment_date,Math\n"
+        "A,1,03/02/2024,50\n"
+        "B,2,,60\n"
+        "C,3,2024-02-03,70\n"
+        "D,4,2024/02/03,80\n"
+    )
+    assert imported_dates(csv, "csv") == ["2024-03-02", TODAY, "2024-02-03", "2024-02-03"]
+
+
+def test_csv_non_iso_date_after_iso_date():
+    csv = io.StringIO("name,roll_no,assessment_date,Math\nA,1,2024-02-03,50\nB,2,2024/02/04,60\n")
+    assert imported_dates(csv, "csv") == ["2024-02-03", "2024-02-04"]
+
+
+def test_csv_invalid_date_is_still_rejected():
+    csv = io.StringIO("name,roll_no,assessment_date,Math\nA,1,2024-02-03,50\nB,2,not a date,60\n")
+    store = StudentStore()
+    report = import_students(csv, store, fmt="csv")
+    assert report.rejected == [(2, "invalid assessment_date")]
+    assert len(store) == 1
+
+
+def test_excel_blank_date_cell_next_to_datetimes(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "roll_no", "assessment_date", "Math"])
+    sheet.append(["A", "1", datetime(2024, 2, 3), 50])
+    sheet.append(["B", "2", None, 60])
+    sheet.append(["C", "3", datetime(2024, 5, 6, 10, 30), 70])
+    path = tmp_path / "marks.xlsx"
+    workbook.save(path)
+    assert imported_dates(str(path), "excel") == ["2024-02-03", TODAY, "2024-05-06"]
+
+
+def test_parquet_date_column_with_nulls(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({
+        "name": ["A", "B", "C"],
+        "roll_no": ["1", "2", "3"],
+        "assessment_date": pa.array([date(2024, 2, 3), None, date(2024, 5, 6)]),
+        "Math": [50, 60, 70],
+    })
+    path = tmp_path / "marks.parquet"
+    pq.write_table(table, path)
+    assert imported_dates(str(path), "parquet") == ["2024-02-03", TODAY, "2024-05-06"]
+
+
+def test_parquet_string_dates_in_mixed_formats(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({
+        "name": ["A", "B", "C"],
+        "roll_no": ["1", "2", "3"],
+        "assessment_date": ["03/02/2024", None, "2024-02-03"],
+        "Math": [50, 60, 70],
+    })
+    path = tmp_path / "marks.parquet"
+    pq.write_table(table, path)
+    assert imported_dates(str(path), "parquet") == ["2024-03-02", TODAY, "2024-02-03"]
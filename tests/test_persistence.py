@@ -0,0 +1,117 @@
+"""ReportDB: keyset pagination, per-class filtering and the class_name migration
+
+    python -m pytest tests
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.persistence import ReportDB
+
+from history import random_report
+
+
+@pytest.fixture
+def reports():
+    import random
+    rng = random.Random(0)
+    return [random_report(rng) for _ in range(230)]
+
+
+@pytest.fixture
+def db(tmp_path, reports):
+    db = ReportDB(str(tmp_path / "reports.db"))
+    for i, report in enumerate(reports):
+        db.save(report, "A" if i % 3 else "B")
+    yield db
+    db.close()
+
+
+def class_reports(reports, class_name):
+    return [(i + 1, report) for i, report in enumerate(reports) if class_name is None or ("A" if i % 3 else "B") == class_name]
+
+
+@pytest.mark.parametrize("class_name", [None, "A", "B"])
+@pytest.mark.parametrize("limit", [1, 7, 50, 1000])
+def test_pages_cover_every_report_once_in_id_order(db, reports, class_name, limit):
+    pages = list(db.iter_pages(0, limit, class_name))
+    assert all(0 < len(page) <= limit for _, page in pages)
+    assert [cursor for cursor, _ in pages] == [page[-1][0] for _, page in pages]
+    assert [item for _, page in pages for item in page] == class_reports(reports, class_name)
+
+
+def test_cursor_resumes_after_the_last_id_seen(db, reports):
+    cursor, first = db.page(0, 40, "A")
+    cursor, second = db.page(cursor, 40, "A")
+    assert first + second == class_reports(reports, "A")[:80]
+    assert db.page(db.last_id("A"), 40, "A") == (db.last_id("A"), [])
+
+
+def test_reports_saved_after_a_cursor_are_paged_in_later(db, reports):
+    *_, (cursor, _) = db.iter_pages(0, 50, "B")
+    new_id = db.save(reports[0], "B")
+    assert list(db.iter_pages(cursor, 50, "B")) == [(new_id, [(new_id, reports[0])])]
+
+
+def test_counts_classes_and_history(db, reports):
+    assert db.count() == len(reports)
+    assert db.count("A") + db.count("B") == len(reports)
+    assert db.class_names() == ["A", "B"]
+    assert db.last_id() == len(reports)
+    assert db.last_id("no such class") == 0
+    roll = reports[5]["roll_no"]
+    assert db.history(roll) == [report for report in reports if report["roll_no"] == roll]
+
+
+def test_save_many_returns_the_ids_it_inserted(db, reports):
+    ids = list(db.save_many(reports[:25], "C"))
+    assert [item for _, page in db.iter_pages(0, 100, "C") for item in page] == list(zip(ids, reports[:25]))
+
+
+def test_databases_from_before_classes_are_migrated(tmp_path, reports):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE reports (id INTEGER PRIMARY KEY, roll_no TEXT NOT NULL, name TEXT NOT NULL, "
+                     "assessment_date TEXT NOT NULL, report TEXT NOT NULL)")
+        conn.executemany("INSERT INTO reports (roll_no, name, assessment_date, report) VALUES (?, ?, ?, ?)",
+                         [(r["roll_no"], r["name"], r["assessment_date"], json.dumps(r)) for r in reports[:10]])
+    conn.close()
+
+    db = ReportDB(path, default_class="Class 10-A")
+    assert db.class_names() == ["Class 10-A"]
+    assert [report for _, page in db.iter_pages(0, 3, "Class 10-A") for _, report in page] == reports[:10]
+    db.save(reports[10], "Class 10-B")
+    db.close()
+
+    # Reopening an already migrated database changes nothing
+    db = ReportDB(path, default_class="Other")
+    assert db.class_names() == ["Class 10-A", "Class 10-B"]
+    db.close()
+
+
+def test_save_many_ids_stay_right_with_another_writer(tmp_path, reports):
+    path = str(tmp_path / "shared.db")
+    writers = [ReportDB(path) for _ in range(2)]
+    ids = {}
+
+    def write(db, class_name):
+        ids[class_name] = []
+        for start in range(0, 200, 20):
+            ids[class_name] += db.save_many(reports[start:start + 20], class_name)
+    threads = [threading.Thread(target=write, args=(db, class_name)) for db, class_name in zip(writers, "XY")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for class_name in "XY":
+        stored = [item for _, page in writers[0].iter_pages(0, 100, class_name) for item in page]
+        assert stored == list(zip(ids[class_name], reports[:200]))
+    for db in writers:
+        db.close()
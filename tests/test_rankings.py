@@ -0,0 +1,97 @@
+"""SortedRanking and Rankings against brute-force sorts over random histories
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard import generate_performance_analysis
+from reportcard.rankings import ALL_BADGES, SortedRanking
+
+from history import SEEDS, current_reports, play, random_history
+
+
+def ranked(scores):
+    """``(competition_rank, dense_rank, roll_no, score)`` for a dict of scores, best first"""
+    distinct = sorted(set(scores.values()), reverse=True)
+    order = sorted(scores, key=lambda roll_no: (-scores[roll_no], roll_no))
+    return [
+        (1 + sum(other > scores[roll_no] for other in scores.values()),
+         1 + distinct.index(scores[roll_no]), roll_no, scores[roll_no])
+        for roll_no in order
+    ]
+
+
+def assert_ranking(ranking, scores):
+    expected = ranked(scores)
+    assert len(ranking) == len(scores)
+    assert ranking.top(len(scores) + 5) == expected
+    assert ranking.top(3, offset=2) == expected[2:5]
+    assert list(ranking.rolls()) == [roll_no for _, _, roll_no, _ in expected]
+    for competition, dense, roll_no, score in expected:
+        assert roll_no in ranking and ranking.score(roll_no) == score
+        assert (ranking.rank_of(roll_no), ranking.rank_of(roll_no, dense=True)) == (competition, dense)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sorted_ranking_follows_a_dict_of_scores(seed):
+    rng = random.Random(seed)
+    # Few distinct scores, so ties are common
+    values = [0, 12.5, 40, 40.0, 66.67, 85, 100]
+    ranking, scores = SortedRanking(), {}
+    for _ in range(300):
+        pick = rng.random()
+        if pick < 0.4:
+            roll_no, score = str(rng.randrange(30)), rng.choice(values)
+            ranking.add(roll_no, score)
+            scores[roll_no] = score
+        elif pick < 0.6:
+            roll_no = str(rng.randrange(35))
+            ranking.remove(roll_no)
+            scores.pop(roll_no, None)
+        elif pick < 0.8:
+            items = [(str(rng.randrange(30)), rng.choice(values)) for _ in range(rng.randint(0, 20))]
+            ranking.add_many(items)
+            scores.update(items)
+        else:
+            rolls = [str(rng.randrange(35)) for _ in range(rng.randint(0, 10))]
+            ranking.remove_many(rolls)
+            for roll_no in rolls:
+                scores.pop(roll_no, None)
+        assert_ranking(ranking, scores)
+
+    assert ranking.rank_of("no such roll") is None
+    for low, high in [(None, None), (40, None), (None, 40), (12.5, 85), (50, 60), (60, 50), (101, None)]:
+        start, stop = ranking.span(low, high)
+        in_range = [roll_no for _, _, roll_no, score in ranked(scores)
+                    if (low is None or score >= low) and (high is None or score <= high)]
+        assert list(ranking.rolls(start, stop)) == in_range
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rankings_match_the_current_reports(seed):
+    store, held = play(random_history(seed))
+    current = [report for _, report in current_reports(held).values()]
+    rankings = store.rankings
+    assert_ranking(rankings.overall, {report["roll_no"]: report["percentage"] for report in current})
+
+    subjects = {}
+    for report in current:
+        for subject, mark in report["marks"].items():
+            subjects.setdefault(subject, {})[report["roll_no"]] = mark
+    assert {subject: len(ranking) for subject, ranking in rankings.subjects.items() if len(ranking)} == \
+        {subject: len(scores) for subject, scores in subjects.items()}
+    for subject, scores in subjects.items():
+        assert_ranking(rankings.subjects[subject], scores)
+
+    badges = {report["roll_no"]: generate_performance_analysis(report)["badges"] for report in current}
+    assert_ranking(rankings.badge_counts, {roll_no: len(held_badges) for roll_no, held_badges in badges.items()})
+    for badge in ALL_BADGES:
+        assert_ranking(rankings.badge_holders[badge], {
+            report["roll_no"]: report["percentage"] for report in current if badge in badges[report["roll_no"]]
+        })
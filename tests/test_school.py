@@ -0,0 +1,112 @@
+"""ReadWriteLock exclusion and writer preference
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.school import ReadWriteLock
+
+# Long enough for a thread that should block to have got in if it could
+SETTLE = 0.2
+TIMEOUT = 5
+
+
+def hold(lock, mode, events, name, release):
+    """Thread body: take ``lock`` in ``mode``, log it and hold until ``release`` is set"""
+    with getattr(lock, mode)():
+        events.append(f"{name} in")
+        release.wait(TIMEOUT)
+        events.append(f"{name} out")
+
+
+def start(lock, mode, events, name):
+    release = threading.Event()
+    thread = threading.Thread(target=hold, args=(lock, mode, events, name, release), daemon=True)
+    thread.start()
+    return thread, release
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_readers_share_the_lock():
+    lock, events = ReadWriteLock(), []
+    threads = [start(lock, "read", events, f"r{i}") for i in range(3)]
+    wait_for(lambda: len(events) == 3)
+    for _, release in threads:
+        release.set()
+    for thread, _ in threads:
+        thread.join(TIMEOUT)
+    assert sorted(events) == ["r0 in", "r0 out", "r1 in", "r1 out", "r2 in", "r2 out"]
+
+
+def test_writer_excludes_readers_and_other_writers():
+    lock, events = ReadWriteLock(), []
+    writer, release_writer = start(lock, "write", events, "w1")
+    wait_for(lambda: events == ["w1 in"])
+    others = [start(lock, "read", events, "r"), start(lock, "write", events, "w2")]
+    time.sleep(SETTLE)
+    assert events == ["w1 in"]
+
+    release_writer.set()
+    writer.join(TIMEOUT)
+    for _, release in others:
+        release.set()
+    for thread, _ in others:
+        thread.join(TIMEOUT)
+    assert events[:2] == ["w1 in", "w1 out"]
+    # Whichever got in next held the lock alone
+    assert events[2][0] == events[3][0]
+
+
+def test_waiting_writer_goes_before_new_readers():
+    lock, events = ReadWriteLock(), []
+    first, release_first = start(lock, "read", events, "r1")
+    wait_for(lambda: events == ["r1 in"])
+    writer, release_writer = start(lock, "write", events, "w")
+    wait_for(lambda: lock._writers_waiting == 1)
+
+    # A reader arriving while the writer waits must queue behind it
+    second, release_second = start(lock, "read", events, "r2")
+    time.sleep(SETTLE)
+    assert events == ["r1 in"]
+
+    release_first.set()
+    wait_for(lambda: events == ["r1 in", "r1 out", "w in"])
+    time.sleep(SETTLE)
+    assert events == ["r1 in", "r1 out", "w in"]
+
+    release_writer.set()
+    wait_for(lambda: events[-1] == "r2 in")
+    release_second.set()
+    for thread in (first, writer, second):
+        thread.join(TIMEOUT)
+    assert events == ["r1 in", "r1 out", "w in", "w out", "r2 in", "r2 out"]
+
+
+def test_lock_is_released_when_the_body_raises():
+    lock = ReadWriteLock()
+    for mode in ("read", "write"):
+        try:
+            with getattr(lock, mode)():
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    acquired = threading.Event()
+
+    def write():
+        with lock.write():
+            acquired.set()
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    assert acquired.wait(TIMEOUT)
+    thread.join(TIMEOUT)
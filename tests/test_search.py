@@ -0,0 +1,101 @@
+"""SearchIndex and search() against brute-force filters over random histories
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard import generate_performance_analysis
+from reportcard.rankings import ALL_BADGES
+from reportcard.search import page_count, search
+
+from history import SEEDS, current_reports, play, random_history
+
+
+def described(current):
+    """``{roll_no: (report, analysis)}`` for the current reports"""
+    return {roll_no: (report, generate_performance_analysis(report)) for roll_no, (_, report) in current.items()}
+
+
+def inverted(students, values):
+    index = {}
+    for roll_no, (report, analysis) in students.items():
+        for value in values(report, analysis):
+            index.setdefault(value, set()).add(roll_no)
+    return index
+
+
+def non_empty(index):
+    return {value: rolls for value, rolls in index.items() if rolls}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_indexes_match_the_current_reports(seed):
+    store, held = play(random_history(seed))
+    students = described(current_reports(held))
+    index = store.search
+    assert len(index) == len(students)
+    assert non_empty(index.grades) == inverted(students, lambda report, _: [report["grade"]])
+    assert non_empty(index.categories) == inverted(students, lambda _, analysis: [analysis["performance_category"]])
+    assert non_empty(index.badges) == inverted(students, lambda _, analysis: analysis["badges"])
+    assert non_empty(index.weak_subjects) == inverted(students, lambda _, analysis: analysis["weaknesses"])
+
+    for text in ["", "student", "STUDENT 1", " Student 2 ", "Stu", "x", "7", "Student 10"]:
+        expected = {roll_no for roll_no, (report, _) in students.items()
+                    if report["name"].casefold().startswith(text.strip().casefold()) or roll_no == text.strip()}
+        assert index.find_text(text) == expected, text
+
+
+def expected_search(students, text="", grades=(), categories=(), badges=(), weak_in=(),
+                    min_percentage=None, max_percentage=None, page=0, page_size=25):
+    prefix = text.strip().casefold()
+    matches = [
+        (-report["percentage"], roll_no) for roll_no, (report, analysis) in students.items()
+        if (not prefix or report["name"].casefold().startswith(prefix) or roll_no == text.strip())
+        and (not grades or report["grade"] in grades)
+        and (not categories or analysis["performance_category"] in categories)
+        and (not badges or set(badges) & set(analysis["badges"]))
+        and (not weak_in or set(weak_in) & set(analysis["weaknesses"]))
+        and (min_percentage is None or report["percentage"] >= min_percentage)
+        and (max_percentage is None or report["percentage"] <= max_percentage)
+    ]
+    matches.sort()
+    return len(matches), [roll_no for _, roll_no in matches[page * page_size:(page + 1) * page_size]]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_search_pages_match_a_brute_force_filter(seed):
+    store, held = play(random_history(seed))
+    students = described(current_reports(held))
+    categories = sorted({analysis["performance_category"] for _, analysis in students.values()})
+    rng = random.Random(seed)
+    for _ in range(200):
+        query = {}
+        if rng.random() < 0.3:
+            query["text"] = rng.choice(["Student 1", "student", "3", "nobody"])
+        if rng.random() < 0.4:
+            query["grades"] = rng.sample(["A+", "A", "B", "C", "D", "F", "Pass"], rng.randint(1, 3))
+        if categories and rng.random() < 0.3:
+            query["categories"] = rng.sample(categories, 1)
+        if rng.random() < 0.3:
+            query["badges"] = rng.sample(ALL_BADGES, rng.randint(1, 2))
+        if rng.random() < 0.3:
+            query["weak_in"] = rng.sample(["Math", "Urdu", "Physics", "Art"], rng.randint(1, 2))
+        if rng.random() < 0.5:
+            query["min_percentage"] = rng.choice([0, 33.33, 40, 60])
+        if rng.random() < 0.5:
+            query["max_percentage"] = rng.choice([50, 64.5, 90, 100])
+        query["page"] = rng.randint(0, 2)
+        query["page_size"] = rng.choice([1, 5, 25])
+
+        total, rolls = search(store, **query)
+        assert (total, rolls) == expected_search(students, **query), query
+
+
+def test_page_count_rounds_up_and_never_returns_zero():
+    assert [page_count(total, 25) for total in (0, 1, 25, 26, 50)] == [1, 1, 1, 2, 2]
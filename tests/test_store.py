@@ -0,0 +1,89 @@
+"""StudentStore rows and indexes against a brute-force replay of random histories
+
+    python -m pytest tests
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard import build_report
+from reportcard.persistence import ReportDB
+from reportcard.store import StudentStore
+
+from history import SEEDS, current_reports, play, random_history
+
+SUBJECTS = ("Math", "Physics", "Urdu")
+
+
+def report(roll_no, mark, when, name=None):
+    return build_report(name or f"Student {roll_no}", roll_no, {subject: mark for subject in SUBJECTS},
+                        "2024-03-01", timestamp=when)
+
+
+def test_history_page_never_supersedes_a_newer_report(tmp_path):
+    db = ReportDB(str(tmp_path / "reports.db"))
+    old = datetime(2024, 1, 1, 9, 0, 0)
+    db.save_many([report(str(roll), 50, old) for roll in range(100)] + [report("1", 10, old)])
+
+    store = StudentStore()
+    cursor, first_page = db.page(0, 50)
+    store.extend_reports(report for _, report in first_page)
+    store.append(report("1", 99, datetime(2024, 6, 1, 9, 0, 0)))
+    for cursor, page in db.iter_pages(cursor, 50):
+        store.extend_reports(report for _, report in page)
+
+    current = store.get(store.find("1"))
+    assert current["marks"]["Math"] == 99
+    assert store.rankings.overall.score("1") == 99
+    assert len(store.aggregates) == 100
+    assert store.aggregates.overall.stats.mean == sum([50] * 99 + [99]) / 100
+    # The older reports still count as assessments for trends
+    assert [store.get(row)["marks"]["Math"] for row in store.trends.student_rows("1")] == [50, 99, 10]
+
+
+def test_older_report_appended_later_is_not_current():
+    store = StudentStore()
+    store.append(report("7", 80, datetime(2024, 5, 1)))
+    store.append(report("7", 20, datetime(2024, 4, 1)))
+    assert store.get(store.find("7"))["marks"]["Math"] == 80
+    assert store.search.find_text("7") == {"7"}
+    assert store.rankings.overall.score("7") == 80
+    assert store.aggregates.overall.stats.count == 1
+
+
+def test_reports_with_equal_timestamps_go_to_the_later_one():
+    when = datetime(2024, 5, 1)
+    store = StudentStore()
+    store.extend_reports([report("3", 40, when)] * 70 + [report("3", 60, when)] * 70)
+    store.append(report("3", 90, when))
+    assert store.get(store.find("3"))["marks"]["Math"] == 90
+    assert store.rankings.overall.score("3") == 90
+    assert len(store.aggregates) == 1
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rows_and_indexes_match_a_replay_of_the_history(seed):
+    store, held = play(random_history(seed))
+    assert len(store) == len(held)
+    assert [store.get(row) for row in range(len(store))] == held
+
+    current = current_reports(held)
+    assert {roll: store.find(roll) for roll in current} == {roll: row for roll, (row, _) in current.items()}
+    assert sorted(store.current_rows().tolist()) == sorted(row for row, _ in current.values())
+    for name in {report["name"] for report in held}:
+        assert store.find_by_name(name) == [row for row, report in enumerate(held) if report["name"] == name]
+    assert store.find("no such roll") is None
+
+
+@pytest.mark.parametrize("seed", SEEDS[:2])
+def test_snapshot_is_an_independent_copy(seed):
+    store, held = play(random_history(seed))
+    snapshot = store.snapshot()
+    store.append(held[-1] if held else report("1", 50, datetime(2024, 1, 1)))
+    store.clear()
+    assert [snapshot.get(row) for row in range(len(snapshot))] == held
+    assert sorted(snapshot.current_rows().tolist()) == sorted(row for row, _ in current_reports(held).values())
@@ -0,0 +1,70 @@
+"""TrendIndex against a pandas recompute over random histories
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportcard.trends import TrendIndex, moving_average
+
+from history import SEEDS, play, random_history
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_student_rows_and_lookups_cover_every_assessment(seed):
+    store, held = play(random_history(seed))
+    trends = store.trends
+    assert len(trends) == len({(report["roll_no"], report["assessment_date"]) for report in held})
+
+    for roll_no in {report["roll_no"] for report in held}:
+        rows = [row for row, report in enumerate(held) if report["roll_no"] == roll_no]
+        assert trends.student_rows(roll_no) == sorted(rows, key=lambda row: (held[row]["assessment_date"], row))
+        for row in rows:
+            date = held[row]["assessment_date"]
+            latest = max(other for other in rows if held[other]["assessment_date"] == date)
+            assert trends.find(roll_no, date) == latest
+    assert trends.student_rows("no such roll") == []
+    assert trends.find("no such roll", "2024-01-01") is None
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_monthly_means_match_a_groupby(seed):
+    store, held = play(random_history(seed))
+    means = store.trends.monthly_means()
+    if not held:
+        assert means.empty
+        return
+
+    frame = pd.DataFrame([{**report["marks"], "Overall %": report["percentage"]} for report in held])
+    months = pd.to_datetime([report["assessment_date"] for report in held]).to_period("M").to_timestamp()
+    expected = frame.groupby(months).mean()
+    assert list(means.columns)[-1] == "Overall %"
+    assert sorted(means.columns) == sorted(expected.columns)
+    pd.testing.assert_frame_equal(means[expected.columns], expected, check_names=False, check_freq=False,
+                                  check_index_type=False)
+
+
+def test_add_and_add_many_index_the_same_way():
+    one, many = TrendIndex(), TrendIndex()
+    dates = np.array(["2024-01-31", "2024-02-01", "2024-01-31", "2024-02-29"], dtype="datetime64[D]")
+    marks = [[50, 60], [70, 80], [90, 100], [10, 20]]
+    for row, (roll_no, date, row_marks) in enumerate(zip("abab", dates, marks)):
+        one.add(roll_no, date, row, dict(zip(["Math", "Urdu"], row_marks)), sum(row_marks) / 2)
+    many.add_many(list("abab"), dates, range(4), ["Math", "Urdu"], marks, [sum(row) / 2 for row in marks])
+
+    for trends in (one, many):
+        assert trends.student_rows("a") == [0, 2]
+        assert trends.student_rows("b") == [1, 3]
+        assert trends.find("a", "2024-01-31") == 2
+    pd.testing.assert_frame_equal(one.monthly_means(), many.monthly_means())
+    assert one.monthly_means()["Math"].tolist() == [70.0, 40.0]
+
+
+def test_moving_average_uses_shorter_windows_at_the_start():
+    assert moving_average([10, 20, 30, 40], 3).tolist() == [10.0, 15.0, 20.0, 30.0]